@@ -0,0 +1,124 @@
+"""
+Command runner shared by the pipeline scripts
+Agent CLI commands run in-process (or as subprocesses with isolate=True).
+Concurrent runs never interleave mid-line: subprocess output is forwarded a
+line at a time, and an in-process command on a worker thread is buffered and
+written as one block when it finishes.
+"""
+
+import io
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List
+
+from src.news_agents.cli import app as cli_app
+
+CLI_CMD = ["python", "-m", "src.news_agents.cli"]
+
+print_lock = threading.Lock()
+_local = threading.local()
+
+
+class _ThreadBufferedStream:
+    """sys.stdout/sys.stderr stand-in that diverts writes of threads with a capture buffer"""
+
+    def __init__(self, stream, name):
+        self._stream = stream
+        self._name = name
+
+    def write(self, text):
+        buffers = getattr(_local, "buffers", None)
+        if buffers is not None:
+            return buffers[self._name].write(text)
+        return self._stream.write(text)
+
+    def flush(self):
+        if getattr(_local, "buffers", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+if not isinstance(sys.stdout, _ThreadBufferedStream):
+    sys.stdout = _ThreadBufferedStream(sys.stdout, "stdout")
+    sys.stderr = _ThreadBufferedStream(sys.stderr, "stderr")
+
+
+def say(*args, **kwargs):
+    """print() that does not interleave with output of concurrent runs"""
+    with print_lock:
+        print(*args, **kwargs)
+
+
+def _invoke_cli(args) -> bool:
+    print(f"\n$ {' '.join(CLI_CMD + args)}")
+    try:
+        cli_app(args, prog_name="src.news_agents.cli", standalone_mode=False)
+    except SystemExit as e:
+        if e.code:
+            print(f"❌ Error: exited with status {e.code}")
+            return False
+    except Exception as e:
+        print(f"❌ Error:\n{e}")
+        return False
+    return True
+
+
+def run_cli(args) -> bool:
+    """Invoke the agents CLI in-process instead of paying interpreter startup"""
+    # Main-thread commands run alone, so their output streams live
+    if threading.current_thread() is threading.main_thread():
+        return _invoke_cli(args)
+
+    _local.buffers = {"stdout": io.StringIO(), "stderr": io.StringIO()}
+    try:
+        return _invoke_cli(args)
+    finally:
+        buffers, _local.buffers = _local.buffers, None
+        with print_lock:
+            for name, stream in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+                stream.write(buffers[name].getvalue())
+                stream.flush()
+
+
+def _pump(stream, sink):
+    for line in stream:
+        with print_lock:
+            sink.write(line)
+            sink.flush()
+
+
+def run(cmd, isolate: bool = False) -> bool:
+    """Run a command (agent CLI commands in-process unless isolate) and return success status"""
+    cmd = [os.fspath(c) for c in cmd]
+    if not isolate and cmd[:3] == CLI_CMD:
+        return run_cli(cmd[3:])
+    say(f"\n$ {' '.join(cmd)}")
+    # Stream child output line by line instead of buffering it all
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+    err_pump = threading.Thread(target=_pump, args=(p.stderr, sys.stderr), daemon=True)
+    err_pump.start()
+    _pump(p.stdout, sys.stdout)
+    err_pump.join()
+    if p.wait() != 0:
+        say(f"❌ Error: command exited with status {p.returncode}")
+        return False
+    return True
+
+
+def run_per_sector(fn: Callable[..., Any], sectors: List[str], workers: int, *args) -> Dict[str, Any]:
+    """
+    Run fn(sector, *args) for every sector on up to `workers` threads
+    Returns the non-None results keyed by sector, in the order of `sectors`
+    regardless of completion order.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sectors)))) as pool:
+        futures = {pool.submit(fn, sector, *args): sector for sector in sectors}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return {s: results[s] for s in sectors if results.get(s) is not None}
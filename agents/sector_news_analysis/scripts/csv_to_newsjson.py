@@ -18,9 +18,19 @@ from pathlib import Path
 from typing import Dict, Any
 from datetime import datetime
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 def iso_to_datekey(iso: str) -> str:
     if not iso:
         raise ValueError("Missing datetime for date_key")
+    # Fast path: a well-formed ISO timestamp already starts with YYYY-MM-DD
+    if (len(iso) >= 10 and iso[4] == '-' and iso[7] == '-'
+            and iso[:4].isdigit() and iso[5:7].isdigit() and iso[8:10].isdigit()):
+        return iso[:10]
     if iso.endswith('Z'):
         iso = iso.replace('Z', '+00:00')
     return datetime.fromisoformat(iso).date().isoformat()
@@ -39,34 +49,55 @@ def main():
 
     rows_out = []
     with inp.open(newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        # Resolve column positions once instead of building a dict per row
+        col_idx = {name.strip(): i for i, name in enumerate(header)}
         required = {"id","sector","headline","summary","datetime","source","region"}
-        missing = required - set([c.strip() for c in reader.fieldnames or []])
+        missing = required - col_idx.keys()
         if missing:
             print(f"Error: CSV missing columns: {sorted(missing)}", file=sys.stderr)
             sys.exit(1)
 
+        i_id, i_sector = col_idx["id"], col_idx["sector"]
+        i_head, i_summ = col_idx["headline"], col_idx["summary"]
+        i_dt, i_src, i_region = col_idx["datetime"], col_idx["source"], col_idx["region"]
+        i_dk = col_idx.get("date_key")
+        width = len(header)
+        # Feeds often repeat the same timestamp; parse each distinct one once
+        dk_cache: Dict[str, str] = {}
+
         for row in reader:
-            # trim keys
-            row = {k.strip(): (v.strip() if isinstance(v, str) else v) for k,v in row.items()}
-            if not row.get("id"):
+            if len(row) < width:
+                # Short/blank lines: pad so missing cells read as empty
+                row += [""] * (width - len(row))
+            nid = row[i_id].strip()
+            if not nid:
                 # Skip empty lines
                 continue
-            dk = row.get("date_key") or iso_to_datekey(row["datetime"])
+            dt = row[i_dt].strip()
+            dk = row[i_dk].strip() if i_dk is not None else ""
+            if not dk:
+                dk = dk_cache.get(dt)
+                if dk is None:
+                    dk = dk_cache[dt] = iso_to_datekey(dt)
             rows_out.append({
-                "id": row["id"],
-                "headline": row["headline"],
-                "summary": row["summary"],
-                "datetime": row["datetime"],
-                "source": row["source"],
-                "region": row["region"],
-                "sector": row.get("sector") or None,
+                "id": nid,
+                "headline": row[i_head].strip(),
+                "summary": row[i_summ].strip(),
+                "datetime": dt,
+                "source": row[i_src].strip(),
+                "region": row[i_region].strip(),
+                "sector": row[i_sector].strip() or None,
                 "date_key": dk,
             })
 
     out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("w", encoding="utf-8") as f:
-        json.dump(rows_out, f, indent=2, ensure_ascii=False)
+    if HAS_ORJSON:
+        out.write_bytes(orjson.dumps(rows_out, option=orjson.OPT_INDENT_2))
+    else:
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(rows_out, f, indent=2, ensure_ascii=False)
     print(f"Wrote {len(rows_out)} news items → {out}")
 
 if __name__ == "__main__":
@@ -9,14 +9,39 @@ Enhanced HTML Report Generator with Jinja2 Template Integration
 import json
 import argparse
 import datetime
+import functools
 import re
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader, Template
+from markupsafe import Markup, escape
 import html
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Optional streaming parser for very large news files
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# News files above this size are stream-parsed (when ijson is installed)
+NEWS_STREAM_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+_NORM_RE = re.compile(r"[^0-9a-zA-Z]+")
+
 
 def _norm_id(s):
-    return re.sub(r"[^0-9a-zA-Z]+", "", str(s).strip().lower()) if s else ""
+    return _norm_id_str(str(s)) if s else ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _norm_id_str(s):
+    return _NORM_RE.sub("", s.strip().lower())
 
 
 def _as_list(m):
@@ -25,58 +50,108 @@ def _as_list(m):
 
 def _build_news_index(news_blob):
     """Build enhanced news index with better error handling"""
-    idx, idx_norm = {}, {}
-    for it in _as_list(news_blob):
-        nid = (it.get("id") or it.get("news_id") or "").strip()
-        if not nid:
+    return _index_news_items(_as_list(news_blob))
+
+
+def _build_news_index_stream(news_path):
+    """Build the news index while stream-parsing news_path with ijson"""
+    with open(news_path, "rb") as f:
+        head = f.read(64).lstrip()
+        f.seek(0)
+        if head.startswith(b"["):
+            return _index_news_items(ijson.items(f, "item", use_float=True))
+        if head.startswith(b"{"):
+            return _index_news_items(v for _, v in ijson.kvitems(f, "", use_float=True))
+    return {}
+
+
+def _index_news_items(items):
+    idx = {}
+    for it in items:
+        get = it.get
+        if not (nid := (get("id") or get("news_id") or "").strip()):
             continue
 
         # Enhanced news record with fallbacks
-        rec = {
+        idx[nid] = rec = {
             "id": nid,
-            "headline": it.get("headline", ""),
-            "summary": it.get("summary", ""),
-            "datetime": it.get("datetime", it.get("date", "")),
-            "source": it.get("source", ""),
-            "region": it.get("region", ""),
-            "sector": it.get("sector", ""),
-            "url": it.get("source_url", ""),
-            "tickers": it.get("tickers", []),
-            "news_type": it.get("news_type", "")
+            "headline": get("headline", ""),
+            "summary": get("summary", ""),
+            "datetime": get("datetime", get("date", "")),
+            "source": get("source", ""),
+            "region": get("region", ""),
+            "sector": get("sector", ""),
+            "url": get("source_url", ""),
+            "tickers": get("tickers", []),
+            "news_type": get("news_type", "")
         }
-        idx[nid] = rec
-        idx_norm[_norm_id(nid)] = rec
-    return idx, idx_norm
+        # Normalized alias in the same dict; an exact id always wins over an alias
+        if (norm := _norm_id(nid)) and norm != nid:
+            idx.setdefault(norm, rec)
+    return idx
+
+
+def _lookup(nid, idx):
+    return idx.get(nid) or idx.get(_norm_id(nid))
 
 
-def _lookup(nid, idx, idxn):
-    return idx.get(nid) or idx.get(str(nid).strip()) or idxn.get(_norm_id(nid))
+# HTML fragments; Markup.format escapes the interpolated values
+_RATIONALE_POINT = Markup("<li>{}</li>")
+_NEWS_NOT_FOUND_HTML = Markup('<div class="news-item"><div class="news-head">News item not found</div><div class="muted-row">Unable to retrieve news details.</div></div>')
+_NEWS_MISSING_HTML = Markup('<div class="news-item"><div class="news-head">ID: {}</div><div class="muted-row">No matching news found in index.</div></div>')
+_NEWS_SOURCE_LINK = Markup('<a href="{}" target="_blank" style="color: #3B82F6;">{}</a>')
+_NEWS_META = Markup('<div class="news-meta">Type: {} • Tickers: {}</div>')
+_NEWS_ITEM_HTML = Markup('''
+        <div class="news-item">
+            <div class="news-head">{head}</div>
+            <div class="muted-row">{dt} • {source_link} • ID: {id}</div>
+            <div class="news-summary">{summary}</div>
+            {meta}
+        </div>
+        ''')
 
 
 def _format_confidence(conf):
     """Format confidence as percentage with color coding"""
     try:
         pct = round(float(conf) * 100, 1)
-        if pct >= 70:
-            color = "#059669"  # green
-        elif pct >= 50:
-            color = "#D97706"  # orange
-        else:
-            color = "#DC2626"  # red
-        return f'<span style="color: {color}; font-weight: 600;">{pct}%</span>'
-    except:
+    except (TypeError, ValueError):
         return "—"
+    return _confidence_html(pct)
+
+
+@functools.lru_cache(maxsize=1024)
+def _confidence_html(pct):
+    if pct >= 70:
+        color = "#059669"  # green
+    elif pct >= 50:
+        color = "#D97706"  # orange
+    else:
+        color = "#DC2626"  # red
+    return Markup(f'<span style="color: {color}; font-weight: 600;">{pct}%</span>')
+
+
+_LABEL_COLORS = {
+    "UP": ("#10B981", "#ECFDF5"),
+    "DOWN": ("#EF4444", "#FEF2F2"),
+    "NO_IMPACT": ("#6B7280", "#F9FAFB")
+}
+_DEFAULT_LABEL_COLORS = ("#6B7280", "#F9FAFB")
+
+
+def _render_sector_label(label):
+    color, bg = _LABEL_COLORS.get(label, _DEFAULT_LABEL_COLORS)
+    return Markup(f'<span style="background: {bg}; color: {color}; padding: 4px 12px; border-radius: 6px; font-weight: 600; font-size: 12px;">{escape(label)}</span>')
+
+
+# Pre-rendered badges for the known decision labels
+_SECTOR_LABEL_HTML = {label: _render_sector_label(label) for label in _LABEL_COLORS}
 
 
 def _format_sector_label(label):
     """Format sector decision label with styling"""
-    label_colors = {
-        "UP": ("#10B981", "#ECFDF5"),
-        "DOWN": ("#EF4444", "#FEF2F2"),
-        "NO_IMPACT": ("#6B7280", "#F9FAFB")
-    }
-    color, bg = label_colors.get(label, ("#6B7280", "#F9FAFB"))
-    return f'<span style="background: {bg}; color: {color}; padding: 4px 12px; border-radius: 6px; font-weight: 600; font-size: 12px;">{label}</span>'
+    html_label = _SECTOR_LABEL_HTML.get(label)
+    return html_label if html_label is not None else _render_sector_label(label)
 
 
 def _format_rationale(rationale):
@@ -88,61 +163,87 @@ def _format_rationale(rationale):
     if "•" in rationale:
         points = [p.strip() for p in rationale.split("•") if p.strip()]
         if points:
-            return "<ul>" + "".join(f"<li>{html.escape(p)}</li>" for p in points) + "</ul>"
+            return Markup("<ul>{}</ul>").format(Markup("").join(_RATIONALE_POINT.format(p) for p in points))
 
-    return html.escape(str(rationale))
+    return escape(str(rationale))
 
 
-def _format_news_item(news_item, idx, idxn):
+def _format_news_item(news_item, idx):
     """Enhanced news item formatting"""
     if not news_item:
-        return '<div class="news-item"><div class="news-head">News item not found</div><div class="muted-row">Unable to retrieve news details.</div></div>'
+        return _NEWS_NOT_FOUND_HTML
 
     nid = news_item.get("id", "")
-    rec = _lookup(nid, idx, idxn)
+    rec = _lookup(nid, idx)
 
     if rec:
-        head = html.escape(rec.get("headline", ""))
-        summ = html.escape(rec.get("summary", ""))
-        dt = html.escape((rec.get("datetime") or "")[:10])
-        src = html.escape(rec.get("source", ""))
-        url = html.escape(rec.get("url", ""))
+        url = rec.get("url", "")
+        src = rec.get("source", "")
 
         # Enhanced news display
-        source_link = f'<a href="{url}" target="_blank" style="color: #3B82F6;">{src}</a>' if url else src
-
-        return f'''
-        <div class="news-item">
-            <div class="news-head">{head}</div>
-            <div class="muted-row">{dt} • {source_link} • ID: {html.escape(rec.get("id",""))}</div>
-            <div class="news-summary">{summ or "No summary available."}</div>
-            {f'<div class="news-meta">Type: {html.escape(rec.get("news_type",""))} • Tickers: {", ".join(rec.get("tickers",[]))}</div>' if rec.get("news_type") or rec.get("tickers") else ''}
-        </div>
-        '''
+        source_link = _NEWS_SOURCE_LINK.format(url, src) if url else src
+        news_type = rec.get("news_type") or ""
+        tickers = rec.get("tickers") or []
+        if news_type or tickers:
+            meta = _NEWS_META.format(news_type, ", ".join(tickers) if tickers else "")
+        else:
+            meta = ""
+
+        return _NEWS_ITEM_HTML.format(
+            head=rec.get("headline", ""),
+            dt=(rec.get("datetime") or "")[:10],
+            source_link=source_link,
+            id=rec.get("id", ""),
+            summary=rec.get("summary", "") or "No summary available.",
+            meta=meta,
+        )
     else:
-        return f'<div class="news-item"><div class="news-head">ID: {html.escape(str(nid))}</div><div class="muted-row">No matching news found in index.</div></div>'
+        return _NEWS_MISSING_HTML.format(nid)
 
 
-def generate_enhanced_report(input_path, output_path, news_path=None, title="Agent-2 Sector Decisions"):
-    """Generate enhanced HTML report using Jinja2 template"""
+@functools.lru_cache(maxsize=None)
+def _get_template():
+    """Load and compile the report template once per process"""
+    template_path = Path(__file__).parent / "templates"
+    if not template_path.exists():
+        template_path = Path("scripts/templates")
+    env = Environment(loader=FileSystemLoader(template_path), autoescape=True, auto_reload=False)
+    return env.get_template("enhanced_sector_report.html.j2")
+
 
-    # Load summary data
+def _load_inputs(input_path, news_path=None):
+    """Load the summary JSON and build the news index; None if the summary is unreadable"""
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            summary = json.load(f)
+        summary = _loads(Path(input_path).read_bytes())
     except Exception as e:
         print(f"Error loading summary data: {e}")
-        return False
+        return None
 
     # Load news data if provided
-    idx, idxn = {}, {}
+    idx = {}
     if news_path and Path(news_path).exists():
         try:
-            with open(news_path, 'r', encoding='utf-8') as f:
-                news_blob = json.load(f)
-            idx, idxn = _build_news_index(news_blob)
+            if HAS_IJSON and Path(news_path).stat().st_size > NEWS_STREAM_THRESHOLD_BYTES:
+                idx = _build_news_index_stream(news_path)
+            else:
+                news_blob = _loads(Path(news_path).read_bytes())
+                idx = _build_news_index(news_blob)
         except Exception as e:
             print(f"Warning: Could not load news data: {e}")
+    return summary, idx
+
+
+# Agent-2 decision fields; a sector with none of them set is rendered as empty
+_DECISION_FIELDS = ("label", "confidence", "weighted_mean", "consensus", "n_signals")
+
+
+def generate_enhanced_report(input_path, output_path, news_path=None, title="Agent-2 Sector Decisions"):
+    """Generate enhanced HTML report using Jinja2 template"""
+
+    loaded = _load_inputs(input_path, news_path)
+    if loaded is None:
+        return False
+    summary, idx = loaded
 
     # Prepare template data
     generated_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M UTC")
@@ -150,6 +251,16 @@ def generate_enhanced_report(input_path, output_path, news_path=None, title="Age
     # Process sectors with enhanced formatting
     processed_sectors = []
     for sector, data in (summary or {}).items():
+        # Failed/missing Agent2 runs leave nothing to format: emit a compact card
+        if not isinstance(data, dict) or all(data.get(k) is None for k in _DECISION_FIELDS):
+            processed_sectors.append({
+                'sector': sector,
+                'label': "NO_IMPACT",
+                'sector_label_html': _SECTOR_LABEL_HTML["NO_IMPACT"],
+                'empty': True,
+            })
+            continue
+
         # Enhanced data processing
         label = data.get("label", "NO_IMPACT")
         confidence = _format_confidence(data.get("confidence"))
@@ -165,14 +276,14 @@ def generate_enhanced_report(input_path, output_path, news_path=None, title="Age
         news_items = []
         for nid in top_ids:
             if nid:  # Only process non-null IDs
-                news_item_html = _format_news_item({"id": nid}, idx, idxn)
+                news_item_html = _format_news_item({"id": nid}, idx)
                 news_items.append(news_item_html)
 
         # Format sector label
         sector_label = _format_sector_label(label)
 
         processed_sectors.append({
-            'sector': html.escape(sector),
+            'sector': sector,
             'label': label,
             'sector_label_html': sector_label,
             'weighted_mean': weighted_mean,
@@ -186,26 +297,19 @@ def generate_enhanced_report(input_path, output_path, news_path=None, title="Age
         })
 
     # Load and render Jinja2 template
-    template_path = Path(__file__).parent / "templates"
-    if not template_path.exists():
-        template_path = Path("scripts/templates")
-
     try:
-        env = Environment(loader=FileSystemLoader(template_path))
-        template = env.get_template("enhanced_sector_report.html.j2")
+        template = _get_template()
 
         html_output = template.render(
             title=title,
             summary=summary,
             processed_sectors=processed_sectors,
             generated_at=generated_at,
-            news_index=idx,
-            news_index_norm=idxn
+            news_index=idx
         )
 
         # Write output
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_output)
+        Path(output_path).write_bytes(html_output.encode('utf-8'))
 
         print(f"Enhanced HTML report generated: {output_path}")
         return True
@@ -213,63 +317,16 @@ def generate_enhanced_report(input_path, output_path, news_path=None, title="Age
     except Exception as e:
         print(f"Error generating enhanced report: {e}")
         print("Falling back to basic HTML generation...")
-        return generate_basic_html(input_path, output_path, news_path, title)
-
-
-def generate_basic_html(input_path, output_path, news_path=None, title="Agent-2 Sector Decisions"):
-    """Fallback basic HTML generation (original method)"""
-
-    try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            summary = json.load(f)
-    except Exception as e:
-        print(f"Error loading summary data: {e}")
-        return False
-
-    # Load news data if provided
-    idx, idxn = {}, {}
-    if news_path and Path(news_path).exists():
-        try:
-            with open(news_path, 'r', encoding='utf-8') as f:
-                news_blob = json.load(f)
-            idx, idxn = _build_news_index(news_blob)
-        except Exception as e:
-            print(f"Warning: Could not load news data: {e}")
+        return generate_basic_html(summary, idx, output_path, title)
 
-    # Generate basic HTML (similar to original)
-    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    cards = []
-    for sector, data in (summary or {}).items():
-        label = html.escape(str(data.get("label", "NO_IMPACT")))
-        wm = round(float(data.get("weighted_mean", 0)), 3) if data.get("weighted_mean") else "—"
-        cons = f'{round(float(data.get("consensus", 0)) * 100, 1)}%' if data.get("consensus") else "—"
-        conf = _format_confidence(data.get("confidence"))
-        rat = _format_rationale(data.get("rationale", "—"))
-        ns = html.escape(str(data.get("n_signals", "—")))
-
-        top = data.get("top_signals") or []
-        chips = "".join(f'<span class="chip">{html.escape(str(x))}</span>' for x in top) or "—"
-
-        news_html = []
-        for nid in top:
-            if nid:
-                rec = _lookup(nid, idx, idxn)
-                if rec:
-                    head = html.escape(rec.get("headline", ""))
-                    summ = html.escape(rec.get("summary", ""))
-                    dt = html.escape((rec.get("datetime") or "")[:10])
-                    src = html.escape(rec.get("source", ""))
-                    news_html.append(f'<div class="news-item"><div class="news-head">{head}</div><div class="muted-row">{dt} • {src} • ID: {html.escape(rec.get("id",""))}</div><div class="news-body">{summ or "—"}</div></div>')
-                else:
-                    news_html.append(f'<div class="news-item"><div class="news-head">ID: {html.escape(str(nid))}</div><div class="muted-row">No matching news found in index.</div></div>')
-
-        news_block = f'<details><summary>News details ({len(news_html)})</summary><div class="news">{"".join(news_html)}</div></details>' if news_html else ""
-
-        cards.append(f'''
+# Fallback-report templates, filled with str.format_map per card/news item
+_BASIC_NEWS_ITEM = '<div class="news-item"><div class="news-head">{head}</div><div class="muted-row">{dt} • {src} • ID: {id}</div><div class="news-body">{summary}</div></div>'
+_BASIC_NEWS_MISSING = '<div class="news-item"><div class="news-head">ID: {id}</div><div class="muted-row">No matching news found in index.</div></div>'
+_BASIC_CARD = '''
         <div class="card">
             <div style="display:flex;justify-content:space-between;align-items:center;">
-                <h2 style="margin:0;font-size:18px;">{html.escape(sector)}</h2>
+                <h2 style="margin:0;font-size:18px;">{sector}</h2>
                 <span class="label {label}">{label}</span>
             </div>
             <div style="display:flex;gap:12px;margin-top:6px;">
@@ -284,7 +341,61 @@ def generate_basic_html(input_path, output_path, news_path=None, title="Agent-2
             </table>
             {news_block}
         </div>
-        ''')
+        '''
+
+
+def _iter_basic_news(top, idx, esc=html.escape):
+    for nid in top:
+        if nid:
+            rec = _lookup(nid, idx)
+            if rec:
+                yield _BASIC_NEWS_ITEM.format_map({
+                    "head": esc(rec.get("headline", "")),
+                    "dt": esc((rec.get("datetime") or "")[:10]),
+                    "src": esc(rec.get("source", "")),
+                    "id": esc(rec.get("id", "")),
+                    "summary": esc(rec.get("summary", "")) or "—",
+                })
+            else:
+                yield _BASIC_NEWS_MISSING.format_map({"id": esc(str(nid))})
+
+
+def _iter_cards(summary, idx):
+    """Yield one fallback-report card per sector"""
+    esc = html.escape
+    for sector, data in (summary or {}).items():
+        get = data.get
+        top = get("top_signals") or []
+        news_html = list(_iter_basic_news(top, idx, esc))
+        label = esc(str(get("label", "NO_IMPACT")))
+
+        yield _BASIC_CARD.format_map({
+            "sector": esc(sector),
+            "label": label,
+            "wm": round(float(get("weighted_mean", 0)), 3) if get("weighted_mean") else "—",
+            "cons": f'{round(float(get("consensus", 0)) * 100, 1)}%' if get("consensus") else "—",
+            "conf": _format_confidence(get("confidence")),
+            "ns": esc(str(get("n_signals", "—"))),
+            "rat": _format_rationale(get("rationale", "—")),
+            "chips": "".join(f'<span class="chip">{esc(str(x))}</span>' for x in top) or "—",
+            "news_block": f'<details><summary>News details ({len(news_html)})</summary><div class="news">{"".join(news_html)}</div></details>' if news_html else "",
+        })
+
+
+def generate_basic_html_from_paths(input_path, output_path, news_path=None, title="Agent-2 Sector Decisions"):
+    """Load summary/news files and run the fallback basic HTML generation"""
+    loaded = _load_inputs(input_path, news_path)
+    if loaded is None:
+        return False
+    summary, idx = loaded
+    return generate_basic_html(summary, idx, output_path, title)
+
+
+def generate_basic_html(summary, idx, output_path, title="Agent-2 Sector Decisions"):
+    """Fallback basic HTML generation (original method) from already-loaded data"""
+
+    # Generate basic HTML (similar to original)
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
 
     css = """
     body{font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial,sans-serif;margin:24px;color:#111827}
@@ -306,10 +417,9 @@ def generate_basic_html(input_path, output_path, news_path=None, title="Agent-2
 <html><head><meta charset="utf-8"/><meta name="viewport" content="width=device-width,initial-scale=1"/>
 <title>{html.escape(title)}</title><style>{css}</style></head>
 <body><h1>{html.escape(title)}</h1><div class="muted">Generated {now}</div>
-<div class="grid">{"".join(cards)}</div></body></html>'''
+<div class="grid">{"".join(_iter_cards(summary, idx))}</div></body></html>'''
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_out)
+    Path(output_path).write_bytes(html_out.encode('utf-8'))
 
     print(f"Basic HTML report generated: {output_path}")
     return True
@@ -326,7 +436,7 @@ def main():
     args = parser.parse_args()
 
     if args.fallback:
-        success = generate_basic_html(args.input, args.output, args.news, args.title)
+        success = generate_basic_html_from_paths(args.input, args.output, args.news, args.title)
     else:
         success = generate_enhanced_report(args.input, args.output, args.news, args.title)
 
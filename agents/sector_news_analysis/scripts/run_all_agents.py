@@ -10,20 +10,40 @@ End-to-end runner:
 
 import argparse
 import json
-import subprocess
+import os
+import sys
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.news_agents.utils import write_json
+from _cli_runner import run, run_per_sector, say
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 CACHE = Path(".cache")
 CACHE.mkdir(exist_ok=True)
 
-def run(cmd):
-    print(f"\n$ {' '.join(cmd)}")
-    p = subprocess.run(cmd, text=True, capture_output=True)
-    if p.returncode != 0:
-        print("❌ Error:\n" + p.stderr.strip())
-        return False
-    print(p.stdout.strip())
-    return True
+def _decide(sector, a1_adj, isolate=False):
+    out_dec = CACHE / f"decision_{sector.lower()}.json"
+    say(f"\n🧭 Running Agent2 for sector: {sector} ...")
+    ok = run([
+        "python","-m","src.news_agents.cli","agent2-decide",
+        "--agent1-json", a1_adj,
+        "--level","sector","--name", sector,
+        "--out", out_dec
+    ], isolate=isolate)
+    if not ok or not out_dec.exists():
+        say(f"❌ No output for {sector}")
+        return None
+    try:
+        return _loads(out_dec.read_bytes())
+    except Exception as e:
+        say(f"⚠️ Could not parse {out_dec}: {e}")
+        return None
 
 def main():
     ap = argparse.ArgumentParser()
@@ -32,62 +52,48 @@ def main():
     ap.add_argument("--sector-map", default="data/sector_map_all.json")
     ap.add_argument("--provider", default="openai", choices=["openai", "mock"])
     ap.add_argument("--market", default="IN")
+    ap.add_argument("--isolate", action="store_true", help="Run each agent step in a separate Python subprocess")
+    ap.add_argument("--workers", type=int, default=8, help="Max concurrent Agent2 sector runs")
     args = ap.parse_args()
 
     news_json = Path(args.news)
 
     if args.csv:
-        out_json = str(CACHE / "news_all.json")
+        out_json = CACHE / "news_all.json"
         print(f"\n🧩 Converting CSV → JSON ...")
         if not run(["python", "scripts/csv_to_newsjson.py", args.csv, out_json]):
             return
         print("✅ OK")
-        news_json = Path(out_json)
+        news_json = out_json
 
     # 1) Agent1
     a1_out = CACHE / "agent1_openai.json"
     if not run([
         "python","-m","src.news_agents.cli","agent1-run",
-        "--news", str(news_json),
+        "--news", news_json,
         "--sector-map", args.sector_map,
         "--market", args.market,
         "--provider", args.provider,
-        "--out", str(a1_out)
-    ]):
+        "--out", a1_out
+    ], isolate=args.isolate):
         return
 
     # 2) Aggregate
     a1_adj = CACHE / "agent1_adjusted_openai.json"
     if not run([
         "python","-m","src.news_agents.cli","agent1-aggregate",
-        "--agent1-json", str(a1_out),
-        "--out", str(a1_adj)
-    ]):
+        "--agent1-json", a1_out,
+        "--out", a1_adj
+    ], isolate=args.isolate):
         return
 
     # 3) Agent2 across sectors from the sector_map file
-    sector_map = json.load(open(args.sector_map, "r", encoding="utf-8"))
-    summary = {}
-    for sector in sector_map.keys():
-        out_dec = CACHE / f"decision_{sector.lower()}.json"
-        print(f"\n🧭 Running Agent2 for sector: {sector} ...")
-        ok = run([
-            "python","-m","src.news_agents.cli","agent2-decide",
-            "--agent1-json", str(a1_adj),
-            "--level","sector","--name", sector,
-            "--out", str(out_dec)
-        ])
-        if not ok or not out_dec.exists():
-            print(f"❌ No output for {sector}")
-            continue
-        try:
-            summary[sector] = json.load(open(out_dec, "r", encoding="utf-8"))
-        except Exception as e:
-            print(f"⚠️ Could not parse {out_dec}: {e}")
+    sector_map = _loads(Path(args.sector_map).read_bytes())
+    sectors = list(sector_map.keys())
+    summary = run_per_sector(_decide, sectors, args.workers, a1_adj, args.isolate)
 
     sum_path = CACHE / "sector_summary.json"
-    with open(sum_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    write_json(sum_path, summary)
 
     print("\n📊 Sector Sentiment Summary:")
     print(json.dumps(summary, indent=2, ensure_ascii=False))
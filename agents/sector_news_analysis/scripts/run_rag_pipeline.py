@@ -9,7 +9,6 @@ Integrated RAG Pipeline for Sector News Analysis
 
 import argparse
 import json
-import subprocess
 from pathlib import Path
 from typing import Dict, Any
 
@@ -17,22 +16,40 @@ from typing import Dict, Any
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.news_agents.rag_search import RAGNewsSearch
+from src.news_agents.rag_search import RAGNewsSearch, configure_logging
+from src.news_agents.utils import write_json
+from _cli_runner import run, run_per_sector, say
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 
 CACHE = Path(".cache")
 CACHE.mkdir(exist_ok=True)
 
+def _decide_sector(sector: str, a1_adj: Path, isolate: bool = False):
+    """Run Agent2 for one sector and return its parsed decision (or None)"""
+    out_dec = CACHE / f"decision_{sector.lower()}_rag.json"
+    say(f"🧭 Running Agent2 for sector: {sector}...")
 
-def run(cmd):
-    """Run shell command and return success status"""
-    print(f"\n$ {' '.join(cmd)}")
-    p = subprocess.run(cmd, text=True, capture_output=True)
-    if p.returncode != 0:
-        print("❌ Error:\n" + p.stderr.strip())
-        return False
-    print(p.stdout.strip())
-    return True
+    if not run([
+        "python", "-m", "src.news_agents.cli", "agent2-decide",
+        "--agent1-json", a1_adj,
+        "--level", "sector",
+        "--name", sector,
+        "--out", out_dec
+    ], isolate=isolate):
+        say(f"❌ Failed to process sector: {sector}")
+        return None
+
+    try:
+        return _loads(out_dec.read_bytes())
+    except Exception as e:
+        say(f"⚠️ Could not parse results for {sector}: {e}")
+        return None
 
 
 def run_rag_search(config_file: str = "rag_config.json") -> Dict[str, Any]:
@@ -64,7 +81,8 @@ def run_rag_search(config_file: str = "rag_config.json") -> Dict[str, Any]:
         return {"csv_file": "data/news_all_sectors_sample.csv", "json_file": ".cache/news_all.json"}
 
 
-def run_agent_analysis(csv_file: str, json_file: str, provider: str = "mock") -> bool:
+def run_agent_analysis(csv_file: str, json_file: str, provider: str = "mock", workers: int = 8,
+                       isolate: bool = False) -> bool:
     """Run Agent1 and Agent2 analysis"""
     print("🤖 Starting agent analysis...")
 
@@ -82,46 +100,27 @@ def run_agent_analysis(csv_file: str, json_file: str, provider: str = "mock") ->
         "--sector-map", "data/sector_map_all.json",
         "--market", "IN",
         "--provider", provider,
-        "--out", str(a1_out)
-    ]):
+        "--out", a1_out
+    ], isolate=isolate):
         return False
 
     # 2) Aggregate Agent1 results
     a1_adj = CACHE / "agent1_adjusted_rag.json"
     if not run([
         "python", "-m", "src.news_agents.cli", "agent1-aggregate",
-        "--agent1-json", str(a1_out),
-        "--out", str(a1_adj)
-    ]):
+        "--agent1-json", a1_out,
+        "--out", a1_adj
+    ], isolate=isolate):
         return False
 
     # 3) Agent2 analysis for all sectors
-    sector_map = json.load(open("data/sector_map_all.json", "r", encoding="utf-8"))
-    summary = {}
-
-    for sector in sector_map.keys():
-        out_dec = CACHE / f"decision_{sector.lower()}_rag.json"
-        print(f"🧭 Running Agent2 for sector: {sector}...")
-
-        if not run([
-            "python", "-m", "src.news_agents.cli", "agent2-decide",
-            "--agent1-json", str(a1_adj),
-            "--level", "sector",
-            "--name", sector,
-            "--out", str(out_dec)
-        ]):
-            print(f"❌ Failed to process sector: {sector}")
-            continue
-
-        try:
-            summary[sector] = json.load(open(out_dec, "r", encoding="utf-8"))
-        except Exception as e:
-            print(f"⚠️ Could not parse results for {sector}: {e}")
+    sector_map = _loads(Path("data/sector_map_all.json").read_bytes())
+    sectors = list(sector_map.keys())
+    summary = run_per_sector(_decide_sector, sectors, workers, a1_adj, isolate)
 
     # Save sector summary
     sum_path = CACHE / "sector_summary_rag.json"
-    with open(sum_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    write_json(sum_path, summary)
 
     print("✅ Agent analysis completed!")
     print(f"📊 Summary saved to: {sum_path}")
@@ -154,8 +153,11 @@ def main():
     parser.add_argument("--provider", default="mock", choices=["openai", "mock"], help="AI provider for agents")
     parser.add_argument("--output-report", default="reports/rag_sector_analysis_report.html", help="Output HTML report file")
     parser.add_argument("--skip-rag", action="store_true", help="Skip RAG search and use sample data")
+    parser.add_argument("--isolate", action="store_true", help="Run each agent step in a separate Python subprocess")
+    parser.add_argument("--workers", type=int, default=8, help="Max concurrent Agent2 sector runs")
 
     args = parser.parse_args()
+    configure_logging()
 
     print("🚀 Starting Integrated RAG Pipeline for Sector News Analysis")
     print("=" * 60)
@@ -171,7 +173,9 @@ def main():
     if not run_agent_analysis(
         csv_file=rag_results["csv_file"],
         json_file=rag_results["json_file"],
-        provider=args.provider
+        provider=args.provider,
+        workers=args.workers,
+        isolate=args.isolate
     ):
         print("❌ Pipeline failed at agent analysis stage")
         return
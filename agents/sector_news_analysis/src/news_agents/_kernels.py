@@ -0,0 +1,67 @@
+from __future__ import annotations
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# decide_kernel(s, conf, decay) -> (weighted_sum, total_w, pos_w, neg_w)
+# s is the effective sentiment per record; pos_w/neg_w only count when the
+# weighted mean points the same way. The sums feed hard label cutoffs, so both
+# versions add left to right (no fastmath, no BLAS/pairwise sums) and return
+# bit-identical values with or without numba.
+def _decide_python(s, conf, decay):
+    s, w = s.tolist(), [c * decay for c in conf.tolist()]
+    weighted_sum, total_w = 0.0, 0.0
+    for wi, si in zip(w, s):
+        total_w += wi
+        weighted_sum += wi * si
+    pos_w, neg_w = 0.0, 0.0
+    if total_w == 0.0: return weighted_sum, total_w, pos_w, neg_w
+    wm = weighted_sum / total_w
+    for wi, si in zip(w, s):
+        if si > 0.0 and wm > 0.0: pos_w += wi
+        elif si < 0.0 and wm < 0.0: neg_w += wi
+    return weighted_sum, total_w, pos_w, neg_w
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def decide_kernel(s, conf, decay):
+        weighted_sum, total_w = 0.0, 0.0
+        for i in range(conf.shape[0]):
+            w = conf[i] * decay
+            total_w += w
+            weighted_sum += w * s[i]
+        pos_w, neg_w = 0.0, 0.0
+        if total_w == 0.0: return weighted_sum, total_w, pos_w, neg_w
+        wm = weighted_sum / total_w
+        for i in range(conf.shape[0]):
+            if s[i] > 0.0 and wm > 0.0: pos_w += conf[i] * decay
+            elif s[i] < 0.0 and wm < 0.0: neg_w += conf[i] * decay
+        return weighted_sum, total_w, pos_w, neg_w
+else:
+    decide_kernel = _decide_python
+
+# indicator_hits(text, flat, offsets) -> uint8 presence per indicator
+# text and flat are uint8 byte arrays; indicator j is flat[offsets[j]:offsets[j + 1]].
+if HAS_NUMBA:
+    @njit(cache=True)
+    def indicator_hits(text, flat, offsets):
+        n, m = offsets.shape[0] - 1, text.shape[0]
+        out = np.zeros(n, dtype=np.uint8)
+        for j in range(n):
+            start, plen = offsets[j], offsets[j + 1] - offsets[j]
+            for p in range(m - plen + 1):
+                k = 0
+                while k < plen and text[p + k] == flat[start + k]: k += 1
+                if k == plen:
+                    out[j] = 1
+                    break
+        return out
+else:
+    def indicator_hits(text, flat, offsets):
+        data = text.tobytes()
+        return np.array([flat[offsets[j]:offsets[j + 1]].tobytes() in data
+                         for j in range(offsets.shape[0] - 1)], dtype=np.uint8)
@@ -1,44 +1,75 @@
 from __future__ import annotations
 import json
+import os
+import re
 from typing import Optional, List, Dict, Tuple
 import typer
-from rich import print
+from rich import print as rprint
 from .types import NewsItem, Agent1Record, iso_to_datekey
+from .utils import read_json, write_json
 from .agent1 import Agent1
 from .agent2 import Agent2
 
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Input lists above this size are stream-parsed (when ijson is installed)
+STREAM_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+# "(sector,YYYY-MM-DD)" keys of the --next-day mapping (parentheses optional)
+_NEXT_DAY_KEY_RE = re.compile(r"\(?\s*([^,]+?)\s*,\s*([^)]+?)\s*\)?")
+
 app = typer.Typer(help="CLI for news sentiment agents")
 
+def _iter_json_list(path: str):
+    if HAS_IJSON and os.path.getsize(path) > STREAM_THRESHOLD_BYTES:
+        with open(path, "rb") as f: yield from ijson.items(f, "item", use_float=True)
+    else:
+        yield from read_json(path)
+
 @app.command("agent1-run")
 def agent1_run(news: str = typer.Option(...), sector_map: str = typer.Option(...),
                market: str = typer.Option("IN"), provider: str = typer.Option("mock"),
-               out: str = typer.Option(".cache/agent1.json")):
-    with open(news) as f: news_items = [NewsItem(**d) for d in json.load(f)]
-    with open(sector_map) as f: sector_map_obj = json.load(f)
+               out: str = typer.Option(".cache/agent1.json"),
+               batch_size: int = typer.Option(0, help="Split news into batches of this size and query them concurrently (0 = one request)"),
+               max_concurrency: int = typer.Option(8)):
+    news_items = [NewsItem(**d) for d in _iter_json_list(news)]
+    sector_map_obj = read_json(sector_map)
     for n in news_items: n.date_key = iso_to_datekey(n.datetime)
     a1 = Agent1(provider=provider)
-    records = a1.run_llm(news_items, sector_map_obj, market)
-    with open(out,"w") as f: json.dump([r.__dict__ for r in records], f, indent=2)
-    print(f"[green]Wrote Agent-1 outputs → {out}[/green]")
+    if batch_size > 0 and len(news_items) > batch_size:
+        batches = [news_items[i:i+batch_size] for i in range(0, len(news_items), batch_size)]
+        records = a1.run_llm_many(batches, sector_map_obj, market, max_concurrency=max_concurrency)
+    else:
+        records = a1.run_llm(news_items, sector_map_obj, market)
+    write_json(out, records)
+    rprint(f"[green]Wrote Agent-1 outputs → {out}[/green]")
 
 @app.command("agent1-aggregate")
 def agent1_aggregate(agent1_json: str = typer.Option(...),
                      next_day: Optional[str] = typer.Option(None),
                      out: str = typer.Option(".cache/agent1_adjusted.json")):
-    with open(agent1_json) as f: recs = [Agent1Record(**d) for d in json.load(f)]
+    recs = [Agent1Record(**d) for d in _iter_json_list(agent1_json)]
     next_day_map: Dict[Tuple[str,str], float] = {}
     if next_day:
-        raw = json.load(open(next_day))
-        for k, v in raw.items():
-            sector, date = k.strip("()").split(",")
-            next_day_map[(sector, date)] = float(v)
+        raw = read_json(next_day)
+        if isinstance(raw, list):
+            next_day_map = {(sector, date): float(v) for sector, date, v in raw}
+        else:
+            for k, v in raw.items():
+                m = _NEXT_DAY_KEY_RE.fullmatch(k)
+                if not m: raise typer.BadParameter(f"Bad next-day key {k!r}; expected '(sector,YYYY-MM-DD)'")
+                next_day_map[(m.group(1), m.group(2))] = float(v)
     from .agent1 import Agent1 as A1
     a1 = A1()
     daywise = a1.process_batch(recs, next_day_map)
     adjusted: List[Agent1Record] = []
     for _, blob in daywise.items(): adjusted.extend(blob["records"])
-    with open(out, "w") as f: json.dump([r.__dict__ for r in adjusted], f, indent=2)
-    print(f"[green]Wrote adjusted Agent-1 records → {out}[/green]")
+    write_json(out, adjusted)
+    rprint(f"[green]Wrote adjusted Agent-1 records → {out}[/green]")
 
 @app.command("agent2-decide")
 def agent2_decide(agent1_json: str = typer.Option(...),
@@ -51,19 +82,19 @@ def agent2_decide(agent1_json: str = typer.Option(...),
                   min_consensus: float = typer.Option(0.6),
                   now_iso: Optional[str] = typer.Option(None),
                   out: str = typer.Option(".cache/decision.json")):
-    with open(agent1_json) as f: recs = [Agent1Record(**d) for d in json.load(f)]
+    recs = [Agent1Record(**d) for d in _iter_json_list(agent1_json)]
     if level == "sector":
         recs = [r for r in recs if r.sector == name]
     elif level == "tickers" and tickers:
-        set_t = set([t.strip() for t in tickers.split(",")])
-        recs = [r for r in recs if set_t.intersection(set(r.tickers))]
+        set_t = {t.strip() for t in tickers.split(",")}
+        recs = [r for r in recs if not set_t.isdisjoint(r.tickers)]
     if start_date: recs = [r for r in recs if r.date_key and r.date_key >= start_date]
     if end_date: recs = [r for r in recs if r.date_key and r.date_key <= end_date]
     a2 = Agent2()
     dec = a2.decide(recs, now_iso=now_iso, up_threshold=up_threshold, down_threshold=down_threshold, min_consensus=min_consensus)
     dec["target"] = {"level": level, "name": name, "tickers": (tickers.split(",") if tickers else [])}
-    with open(out, "w") as f: json.dump(dec, f, indent=2)
-    print(f"[green]Wrote decision → {out}[/green]")
+    write_json(out, dec)
+    rprint(f"[green]Wrote decision → {out}[/green]")
     print(json.dumps(dec, indent=2))
 
 if __name__ == "__main__":
@@ -13,14 +13,54 @@ Guidelines:
 - evidence_phrases: 1-4 key phrases from the news that support your analysis
 """
 # Load comprehensive fewshots from the merged file
+import hashlib
 import json
 import os
+import pickle
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Load the comprehensive fewshots from the data directory
 FEWSHOTS_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "fewshots", "agent1_fewshots_merged.json")
+# Pickled copies of parsed fewshots live under the project's .cache/ (never next to the package data),
+# wherever the CLI is run from
+FEWSHOTS_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "fewshots")
+
+def _fewshots_cache_path(path: str) -> str:
+    """Pickle path keyed on the source file's absolute path and mtime"""
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(FEWSHOTS_CACHE_DIR, f"{key}-{os.stat(path).st_mtime_ns}.pkl")
+
+def _load_fewshots(path: str):
+    cache_path = _fewshots_cache_path(path)
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    try:
+        os.makedirs(FEWSHOTS_CACHE_DIR, exist_ok=True)
+        # Drop pickles of earlier versions of the same source
+        prefix = os.path.basename(cache_path).split("-")[0] + "-"
+        for name in os.listdir(FEWSHOTS_CACHE_DIR):
+            if name.startswith(prefix) and name.endswith(".pkl"):
+                os.remove(os.path.join(FEWSHOTS_CACHE_DIR, name))
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+    return data
+
 try:
-    with open(FEWSHOTS_FILE, 'r', encoding='utf-8') as f:
-        AGENT1_FEWSHOTS = json.load(f)
+    AGENT1_FEWSHOTS = _load_fewshots(FEWSHOTS_FILE)
     print(f"Loaded {len(AGENT1_FEWSHOTS)} fewshot examples from {FEWSHOTS_FILE}")
 except Exception as e:
     print(f"Warning: Could not load fewshots from {FEWSHOTS_FILE}: {e}")
@@ -1,38 +1,92 @@
 from __future__ import annotations
 from typing import Dict, Any, List
-import json, os
-from dotenv import load_dotenv
-load_dotenv()
+import asyncio, copy, json, os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ENV_LOADED = False
+
+def _openai_key() -> str:
+    # .env is only needed for real API calls, so load it on first use rather than at import
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _ENV_LOADED = True
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key: raise RuntimeError("OPENAI_API_KEY not set")
+    return api_key
+
+# (id(few_shots), system_prompt) -> (few_shots, serialized system + few-shot messages)
+_FEWSHOT_PREFIX_CACHE: Dict[tuple, tuple] = {}
+
+def _dumps(obj) -> str:
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+def _messages(system_prompt: str, user_payload: Dict[str, Any], few_shots: List[Dict[str, Any]]):
+    key = (id(few_shots), system_prompt)
+    hit = _FEWSHOT_PREFIX_CACHE.get(key)
+    if hit is None or hit[0] is not few_shots:
+        prefix = [{"role":"system","content":system_prompt}]
+        for fs in (few_shots or []):
+            prefix += [{"role":"user","content":_dumps(fs["input"])},
+                       {"role":"assistant","content":_dumps(fs["output"])}]
+        hit = _FEWSHOT_PREFIX_CACHE[key] = (few_shots, prefix)
+    return hit[1] + [{"role":"user","content":_dumps(user_payload)}]
+
+def _parse_reply(txt: str):
+    try: return json.loads(txt)
+    except Exception: return []
 
 def call_llm(provider: str, system_prompt: str, user_payload: Dict[str, Any], few_shots: List[Dict[str, Any]]):
     if provider == "mock":
         return _mock_agent1(user_payload)
     if provider == "openai":
         from openai import OpenAI
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key: raise RuntimeError("OPENAI_API_KEY not set")
-        client = OpenAI(api_key=api_key)
-        messages = [{"role":"system","content":system_prompt}]
-        for fs in (few_shots or []):
-            messages += [{"role":"user","content":json.dumps(fs["input"])},
-                         {"role":"assistant","content":json.dumps(fs["output"])}]
-        messages.append({"role":"user","content":json.dumps(user_payload)})
-        resp = client.chat.completions.create(model="gpt-4o-mini", temperature=0.2, messages=messages)
-        txt = resp.choices[0].message.content
-        try: return json.loads(txt)
-        except Exception: return []
+        client = OpenAI(api_key=_openai_key())
+        resp = client.chat.completions.create(model="gpt-4o-mini", temperature=0.2, messages=_messages(system_prompt, user_payload, few_shots))
+        return _parse_reply(resp.choices[0].message.content)
     raise ValueError(f"Unknown provider: {provider}")
 
+async def call_llm_async(provider: str, system_prompt: str, user_payload: Dict[str, Any], few_shots: List[Dict[str, Any]], client=None):
+    if provider == "mock":
+        return _mock_agent1(user_payload)
+    if provider == "openai":
+        if client is None:
+            from openai import AsyncOpenAI
+            async with AsyncOpenAI(api_key=_openai_key()) as client:
+                return await call_llm_async(provider, system_prompt, user_payload, few_shots, client=client)
+        resp = await client.chat.completions.create(model="gpt-4o-mini", temperature=0.2, messages=_messages(system_prompt, user_payload, few_shots))
+        return _parse_reply(resp.choices[0].message.content)
+    raise ValueError(f"Unknown provider: {provider}")
+
+# One completion per payload, at most max_concurrency in flight; results keep payload order.
+def call_llm_many(provider: str, system_prompt: str, payloads: List[Dict[str, Any]], few_shots: List[Dict[str, Any]], max_concurrency: int = 8):
+    if provider == "mock":
+        return [_mock_agent1(p) for p in payloads]
+    if provider != "openai":
+        raise ValueError(f"Unknown provider: {provider}")
+    from openai import AsyncOpenAI
+
+    async def _run():
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+        async with AsyncOpenAI(api_key=_openai_key()) as client:
+            async def _one(p):
+                async with sem:
+                    return await call_llm_async(provider, system_prompt, p, few_shots, client=client)
+            return await asyncio.gather(*[_one(p) for p in payloads])
+    return asyncio.run(_run())
+
+_MOCK_RESPONSES = {
+    "N_te_1": {"sector":"Telecom","tickers":["BHARTIARTL.NS","RELIANCE.NS"],"sentiment_score":2.6,"confidence":0.78,"impact_horizon":"short_term(1-4w)","news_type":"regulatory","rationale":"Lower spectrum costs.","evidence_phrases":["18% cut","reserve prices"]},
+    "N_te_2": {"sector":"Telecom","tickers":["BHARTIARTL.NS"],"sentiment_score":-0.5,"confidence":0.55,"impact_horizon":"intraday","news_type":"legal","rationale":"Minor hearing.","evidence_phrases":["hearing"]},
+    "N_te_3": {"sector":"Telecom","tickers":[],"sentiment_score":-0.9,"confidence":0.6,"impact_horizon":"intraday","news_type":"company","rationale":"Temporary outage.","evidence_phrases":["outage","restored"]},
+}
+_MOCK_DEFAULT = {"sector":"Unknown","tickers":[],"sentiment_score":0.0,"confidence":0.2,"impact_horizon":"intraday","news_type":"macro","rationale":"Insufficient info.","evidence_phrases":[]}
+
 def _mock_agent1(user_payload):
-    items = user_payload.get("news_items", [])
-    out = []
-    for it in items:
-        if it["id"] == "N_te_1":
-            out.append({"news_id":it["id"],"sector":"Telecom","tickers":["BHARTIARTL.NS","RELIANCE.NS"],"sentiment_score":2.6,"confidence":0.78,"impact_horizon":"short_term(1-4w)","news_type":"regulatory","rationale":"Lower spectrum costs.","evidence_phrases":["18% cut","reserve prices"]})
-        elif it["id"] == "N_te_2":
-            out.append({"news_id":it["id"],"sector":"Telecom","tickers":["BHARTIARTL.NS"],"sentiment_score":-0.5,"confidence":0.55,"impact_horizon":"intraday","news_type":"legal","rationale":"Minor hearing.","evidence_phrases":["hearing"]})
-        elif it["id"] == "N_te_3":
-            out.append({"news_id":it["id"],"sector":"Telecom","tickers":[],"sentiment_score":-0.9,"confidence":0.6,"impact_horizon":"intraday","news_type":"company","rationale":"Temporary outage.","evidence_phrases":["outage","restored"]})
-        else:
-            out.append({"news_id":it["id"],"sector":"Unknown","tickers":[],"sentiment_score":0.0,"confidence":0.2,"impact_horizon":"intraday","news_type":"macro","rationale":"Insufficient info.","evidence_phrases":[]})
-    return out
+    # Deep copies so a caller mutating one record's lists cannot change later responses
+    return [{"news_id":it["id"], **copy.deepcopy(_MOCK_RESPONSES.get(it["id"], _MOCK_DEFAULT))} for it in user_payload.get("news_items", [])]
@@ -0,0 +1,121 @@
+"""
+Local top-k index over previously fetched RAG results.
+Documents are embedded with the same hashed character trigrams as the proximity
+cache, so a search is one matrix-vector product plus argpartition and needs no
+network round trip or embedding model.
+On disk the embeddings are int8 with a symmetric per-row scale (a quarter of the
+float32 size); they are dequantized once at load so searches stay on float32 BLAS.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .proximity_cache import EMBED_DIM, embed_query
+from .utils import read_json, write_json
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 codes and float32 scales, vectors ~= codes * scales[:, None]"""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0  # all-zero rows stay zero
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def _result_text(result: Dict[str, Any]) -> str:
+    # Same field precedence as RagApiClient._extract_candidates
+    return (result.get("full_text", "") or result.get("text", "") or result.get("summary", "")).strip()
+
+
+class LocalIndex:
+    """L2-normalized document embeddings (N x dim, float32 in memory) with the RAG result dict for each row"""
+
+    def __init__(self, vectors: np.ndarray, meta: List[Dict[str, Any]]):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    @staticmethod
+    def _meta_path(path: Path) -> Path:
+        return path.with_suffix(".json")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["LocalIndex"]:
+        """Index saved at `path` (.npz) with its .json side-car, or None if missing or inconsistent"""
+        path = Path(path)
+        try:
+            with np.load(path) as data:
+                vectors = dequantize(data["codes"], data["scales"])
+            meta = read_json(cls._meta_path(path))
+        except (OSError, KeyError, ValueError, TypeError):
+            return None
+        if vectors.ndim != 2 or vectors.shape[1] != EMBED_DIM or len(meta) != len(vectors):
+            return None
+        return cls(vectors, meta)
+
+    @classmethod
+    def build(cls, results: Iterable[Dict[str, Any]]) -> "LocalIndex":
+        """Index RAG result dicts, skipping empty texts and repeated IDs/texts"""
+        meta, seen = [], set()
+        for result in results:
+            text = _result_text(result)
+            key = result.get("id") or text
+            if not text or key in seen:
+                continue
+            seen.add(key)
+            meta.append(result)
+        vectors = np.zeros((len(meta), EMBED_DIM), dtype=np.float32)
+        for i, result in enumerate(meta):
+            vectors[i] = embed_query(_result_text(result))
+        return cls(vectors, meta)
+
+    @classmethod
+    def build_from_cache(cls, cache_dir: Union[str, Path]) -> "LocalIndex":
+        """Index every result in the RagApiClient response cache directory"""
+        def results():
+            for cache_file in sorted(Path(cache_dir).glob("*.json")):
+                try:
+                    yield from read_json(cache_file).get("results", [])
+                except (OSError, ValueError, AttributeError):
+                    continue
+        return cls.build(results())
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write int8 codes and scales to `path` (npz) and the result dicts to the .json side-car"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        codes, scales = quantize(self.vectors)
+        with open(path, "wb") as f:
+            np.savez(f, codes=codes, scales=scales)
+        write_json(self._meta_path(path), self.meta)
+
+    def search(self, query: str, k: int, min_similarity: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Top-k results by cosine similarity, in the RAG response format.
+        Results below `min_similarity` are dropped; None when nothing is left
+        (or the index is empty), so the caller can ask the API instead.
+        Each result keeps its stored fields, including the API score (which
+        measured relevance to the query it was fetched for), and gains a
+        `local_similarity` to this query.
+        """
+        n = len(self.meta)
+        if n == 0 or k <= 0:
+            return None
+        sims = self.vectors @ embed_query(query)
+        k = min(k, n)
+        idx = np.argpartition(-sims, k - 1)[:k]
+        idx = idx[np.argsort(-sims[idx], kind="stable")]
+        idx = idx[sims[idx] >= min_similarity]
+        if len(idx) == 0:
+            return None
+        return {"results": [{**self.meta[i], "local_similarity": float(sims[i])} for i in idx.tolist()]}
@@ -0,0 +1,120 @@
+"""
+Approximate (proximity) cache for RAG queries.
+A query whose embedding is within a cosine-similarity threshold of an already
+answered one reuses that response instead of hitting the API again.
+Queries are embedded locally with hashed character trigrams, so no model is needed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EMBED_DIM = 512
+
+
+def embed_query(text: str, dim: int = EMBED_DIM) -> np.ndarray:
+    """L2-normalized bag of hashed character trigrams (case and whitespace insensitive)"""
+    padded = f" {' '.join(text.lower().split())} "
+    vec = np.zeros(dim, dtype=np.float32)
+    # crc32 rather than hash(): str hashes are salted per process and the cache is persisted
+    idx = [zlib.crc32(padded[i:i + 3].encode()) % dim for i in range(len(padded) - 2)]
+    if idx:
+        np.add.at(vec, idx, 1.0)
+        vec /= np.linalg.norm(vec)
+    return vec
+
+
+class ProximityCache:
+    """Fixed-capacity LRU of (query embedding -> response) with a similarity threshold"""
+
+    def __init__(self, threshold: float = 0.97, capacity: int = 512,
+                 path: Optional[Union[str, Path]] = None, dim: int = EMBED_DIM):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.dim = dim
+        self.path = Path(path) if path else None
+        self._keys = np.zeros((capacity, dim), dtype=np.float32)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._values: List[Any] = []
+        self._clock = 0
+        self._dirty = False
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def lookup(self, query: str) -> Optional[Any]:
+        """Cached response of the most similar query, or None below the threshold"""
+        if not self._values:
+            return None
+        sims = self._keys[:len(self._values)] @ embed_query(query, self.dim)
+        i = int(sims.argmax())
+        if sims[i] < self.threshold:
+            return None
+        self._touch(i)
+        return self._values[i]
+
+    def insert(self, query: str, value: Any) -> None:
+        """Store a response, evicting the least recently used entry when full"""
+        if len(self._values) < self.capacity:
+            i = len(self._values)
+            self._values.append(value)
+        else:
+            i = int(self._last_used.argmin())
+            self._values[i] = value
+        self._keys[i] = embed_query(query, self.dim)
+        self._touch(i)
+        self._dirty = True
+
+    def _touch(self, i: int) -> None:
+        self._clock += 1
+        self._last_used[i] = self._clock
+
+    def save(self) -> None:
+        """Write the cache to `path` (npz: embeddings, LRU clock and JSON-encoded responses)"""
+        if self.path is None or not self._dirty:
+            return
+        n = len(self._values)
+        values = orjson.dumps(self._values) if orjson is not None else json.dumps(self._values).encode("utf-8")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                np.savez(f, keys=self._keys[:n], last_used=self._last_used[:n],
+                         values=np.frombuffer(values, dtype=np.uint8))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: could not save proximity cache {self.path}: {e}")
+
+    def _load(self) -> None:
+        """Warm-start from `path`; a missing, unreadable or mismatched file leaves the cache empty"""
+        try:
+            with np.load(self.path) as data:
+                keys, last_used = data["keys"], data["last_used"]
+                raw = data["values"].tobytes()
+            values = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except (OSError, KeyError, ValueError):
+            return
+        if keys.ndim != 2 or keys.shape[1] != self.dim or len(values) != len(keys):
+            return
+
+        # Keep the most recently used entries if the file holds more than capacity
+        keep = np.argsort(last_used, kind="stable")[-self.capacity:]
+        n = len(keep)
+        self._keys[:n] = keys[keep]
+        self._last_used[:n] = last_used[keep]
+        self._values = [values[i] for i in keep.tolist()]
+        self._clock = int(self._last_used[:n].max()) if n else 0
@@ -4,15 +4,23 @@ RAG API Client for fetching news data from external endpoint.
 Converts RAG API responses to news_all.json format compatible with existing pipeline.
 """
 
+import asyncio
 import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import re
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
 import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
 
 # Optional spaCy import - will use fallback if not available
 try:
@@ -22,19 +30,71 @@ except ImportError:
     HAS_SPACY = False
     print("Warning: spaCy not available. Using keyword-based region detection.")
 
+# Optional orjson import - faster (de)serialization of RAG payloads when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional pyahocorasick import - region keywords are matched in a single pass when available
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Optional aiohttp import - sector queries run concurrently when available,
+# otherwise they are issued one at a time over requests
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Optional httpx (with h2) import - async requests can share one multiplexed
+# HTTP/2 connection instead of an aiohttp HTTP/1.1 pool (RagConfig.http2)
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx's HTTP/2 support
+    HAS_HTTPX_HTTP2 = True
+except ImportError:
+    HAS_HTTPX_HTTP2 = False
+
+# Transport errors retried by the async request paths
+_ASYNC_HTTP_ERRORS: Tuple[type, ...] = (asyncio.TimeoutError,)
+if HAS_AIOHTTP:
+    _ASYNC_HTTP_ERRORS += (aiohttp.ClientError,)
+if HAS_HTTPX_HTTP2:
+    _ASYNC_HTTP_ERRORS += (httpx.HTTPError,)
+
+# Optional aiolimiter import - paces async requests to max_qpm when available
+try:
+    from aiolimiter import AsyncLimiter
+    HAS_AIOLIMITER = True
+except ImportError:
+    HAS_AIOLIMITER = False
+
 try:
     from .types import NewsItem
-    from .utils import iso_to_datekey
+    from .proximity_cache import ProximityCache
+    from .local_index import LocalIndex
+    from .settings import settings, DEFAULT_RAG_BASE_URL, DEFAULT_RAG_ENDPOINT
+    from .utils import iso_to_datekey, write_json, _json_default
+    from ._kernels import HAS_NUMBA, indicator_hits
 except ImportError:
     from news_agents.types import NewsItem
-    from news_agents.utils import iso_to_datekey
+    from news_agents.proximity_cache import ProximityCache
+    from news_agents.local_index import LocalIndex
+    from news_agents.settings import settings, DEFAULT_RAG_BASE_URL, DEFAULT_RAG_ENDPOINT
+    from news_agents.utils import iso_to_datekey, write_json, _json_default
+    from news_agents._kernels import HAS_NUMBA, indicator_hits
 
 
-@dataclass
+@dataclass(slots=True)
 class RagConfig:
     """Configuration for RAG API client"""
-    base_url: str = os.getenv("SECTOR_AGENT_RAG_BASE_URL", os.getenv("FINBERT_RAG_BASE_URL", "http://localhost:8000"))
-    endpoint: str = os.getenv("SECTOR_AGENT_RAG_ENDPOINT", "/search/cosine/embedding1155d/")
+    base_url: str = settings.rag_base_url or DEFAULT_RAG_BASE_URL
+    endpoint: str = settings.rag_endpoint or DEFAULT_RAG_ENDPOINT
     min_score: float = 0.5
     max_results_per_query: int = 25
     max_results_per_sector: int = 25  # New: limit per sector
@@ -42,8 +102,22 @@ class RagConfig:
     region: str = "IN"
     retry_attempts: int = 3  # New: retry logic
     retry_delay: float = 2.0  # New: delay between retries
-    rate_limit_delay: float = 1.0  # New: delay between requests
-
+    rate_limit_delay: float = 1.0  # New: delay between requests (sequential client)
+    max_qpm: int = 60  # Request budget per minute shared by concurrent async requests
+    cache_dir: Optional[str] = ".cache/rag_api"  # On-disk response cache (None disables)
+    cache_ttl: float = 0.0  # Seconds a cached response stays fresh; opt-in (0 disables), reruns within it reuse results
+    concurrency_limit: int = 8  # Max in-flight async requests
+    region_workers: int = 0  # Processes for async region detection (0 = in-process)
+    proximity_threshold: float = 0.0  # Reuse a near-duplicate query's response at this cosine similarity (0 disables)
+    proximity_cache_path: Optional[str] = ".cache/proximity.npz"  # Warm-start file for the proximity cache
+    local_index_path: Optional[str] = None  # Answer searches from a LocalIndex (.npz + .json) when it loads
+    local_min_similarity: float = 0.3  # Local results below this trigram cosine are dropped; none left -> API
+    batch_endpoint: Optional[str] = None  # e.g. "/search/cosine/embedding1155d/batch": a sector's queries in one POST (1155d endpoint only)
+    http2: bool = False  # Async requests over one multiplexed HTTP/2 connection (needs httpx[http2])
+
+
+# The only search endpoint with a batch counterpart (batch_endpoint)
+BATCH_SEARCH_ENDPOINT = "/search/cosine/embedding1155d/"
 
 # Predefined sector queries - configurable
 DEFAULT_SECTOR_QUERIES = {
@@ -95,20 +169,102 @@ DEFAULT_SECTOR_QUERIES = {
 }
 
 
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+# Process-wide spaCy pipeline, loaded once on first use with only NER enabled
+_SPACY_NLP = None
+_SPACY_LOADED = False
+_SPACY_LOCK = threading.Lock()
+_MATCHERS_LOCK = threading.Lock()
+
+
+def _get_spacy_nlp():
+    """Load en_core_web_sm once per process (NER only); None if unavailable"""
+    global _SPACY_NLP, _SPACY_LOADED
+    with _SPACY_LOCK:
+        if not _SPACY_LOADED:
+            try:
+                _SPACY_NLP = spacy.load("en_core_web_sm", disable=["tagger", "parser", "lemmatizer", "attribute_ruler"])
+            except OSError:
+                print("Warning: spaCy English model not found. Using keyword-based region detection.")
+                _SPACY_NLP = None
+            _SPACY_LOADED = True
+    return _SPACY_NLP
+
+
+def _indicator_tables(region_indicators: Dict[str, List[str]]) -> Tuple[List[str], np.ndarray, List[List[int]]]:
+    """
+    Unique indicators, their (indicator x region) phrase-length weight matrix
+    and each region's indicator ids, in region_indicators order
+    """
+    indicators: List[str] = []
+    index: Dict[str, int] = {}
+    members: List[List[int]] = [[] for _ in region_indicators]
+    weights = np.zeros((sum(map(len, region_indicators.values())), len(region_indicators)), dtype=np.int32)
+    for r, region_list in enumerate(region_indicators.values()):
+        for indicator in region_list:
+            j = index.setdefault(indicator, len(indicators))
+            if j == len(indicators):
+                indicators.append(indicator)
+            # Weight longer phrases higher
+            weights[j, r] += len(indicator.split())
+            members[r].append(j)
+    return indicators, weights[:len(indicators)], members
+
+
 class RegionDetector:
     """NLP-based region detection using spaCy"""
 
+    # Memoized (headline, summary) -> region entries kept per detector
+    CACHE_SIZE = 4096
+    # (automaton, region_patterns) from _shared_matchers()
+    _MATCHERS = None
+
     def __init__(self):
         self.nlp = None
         if HAS_SPACY:
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except OSError:
-                print("Warning: spaCy English model not found. Using keyword-based region detection.")
-                self.nlp = None
+            self.nlp = _get_spacy_nlp()
         else:
             print("spaCy not available. Using keyword-based region detection.")
 
+        self._automaton, self._region_patterns = self._shared_matchers()
+
+        # Overlapping sector queries return the same stories; memoize per detector
+        self._region_cache: Dict[Tuple[str, str], str] = {}
+
+    @classmethod
+    def _shared_matchers(cls) -> Tuple[Optional["ahocorasick.Automaton"], List[Tuple[re.Pattern, List[int]]]]:
+        """Keyword matchers compiled on first use and shared by every detector in the process"""
+        with _MATCHERS_LOCK:
+            if cls._MATCHERS is None:
+                automaton, region_patterns = None, []
+                if HAS_AHOCORASICK:
+                    automaton = cls._build_automaton()
+                elif not HAS_NUMBA:
+                    # One alternation per region: a single C-level scan rules out regions without any hit
+                    for member_ids in cls._REGION_MEMBERS:
+                        pattern = re.compile("|".join(re.escape(cls._INDICATORS[j]) for j in member_ids))
+                        region_patterns.append((pattern, member_ids))
+                cls._MATCHERS = (automaton, region_patterns)
+        return cls._MATCHERS
+
+    @classmethod
+    def _build_automaton(cls) -> "ahocorasick.Automaton":
+        """Aho-Corasick automaton over all lowercased indicators (value = indicator index)"""
+        automaton = ahocorasick.Automaton()
+        for j, key in enumerate(cls._INDICATORS):
+            automaton.add_word(key, j)
+        automaton.make_automaton()
+        return automaton
+
     # Regional indicators for different markets
     REGION_INDICATORS = {
         "IN": [
@@ -166,6 +322,14 @@ class RegionDetector:
         ]
     }
 
+    # Lowercased once at import; the scoring tables are shared by every detector
+    REGION_INDICATORS = {region: [i.lower() for i in inds] for region, inds in REGION_INDICATORS.items()}
+    _REGION_NAMES = list(REGION_INDICATORS)
+    _INDICATORS, _WEIGHTS, _REGION_MEMBERS = _indicator_tables(REGION_INDICATORS)
+    # Indicators packed into one UTF-8 byte buffer for the numba kernel
+    _INDICATOR_BYTES = np.frombuffer(b"".join(i.encode() for i in _INDICATORS), dtype=np.uint8)
+    _INDICATOR_OFFSETS = np.cumsum([0] + [len(i.encode()) for i in _INDICATORS], dtype=np.int64)
+
     def detect_region(self, headline: str, summary: str) -> str:
         """
         Detect region based on headline and summary content using NLP
@@ -177,47 +341,125 @@ class RegionDetector:
         Returns:
             Region code (IN, US, GB, CN, etc.) or "IN" as default
         """
-        text = f"{headline} {summary}".lower()
+        return self.detect_regions([(headline, summary)])[0]
+
+    def detect_regions(self, pairs: List[Tuple[str, str]]) -> List[str]:
+        """
+        Detect regions for a batch of (headline, summary) pairs.
+        Items without keyword hits go through spaCy together via nlp.pipe.
+
+        Returns:
+            Region codes in input order
+        """
+        regions: List[Optional[str]] = [None] * len(pairs)
+        misses: Dict[Tuple[str, str], List[int]] = {}  # uncached pairs -> positions
+
+        for i, pair in enumerate(pairs):
+            region = self._region_cache.get(pair)
+            if region is None:
+                misses.setdefault(pair, []).append(i)
+            else:
+                regions[i] = region
+
+        if not misses:
+            return regions
+
+        keyword_regions = self._keyword_regions([f"{headline} {summary}".lower() for headline, summary in misses])
+        pending = [pair for pair, region in zip(misses, keyword_regions) if region is None]
+        found = dict(zip(misses, keyword_regions))
+        if pending and self.nlp:
+            texts = [f"{headline} {summary}" for headline, summary in pending]
+            found.update(zip(pending, self._entity_regions(texts)))
+
+        for pair, positions in misses.items():
+            region = self._remember(pair, found[pair] or "IN")
+            for i in positions:
+                regions[i] = region
+
+        return regions
 
-        # Simple keyword-based detection first
-        region_scores = {}
-        for region, indicators in self.REGION_INDICATORS.items():
+    def _remember(self, pair: Tuple[str, str], region: str) -> str:
+        if len(self._region_cache) >= self.CACHE_SIZE:
+            del self._region_cache[next(iter(self._region_cache))]
+        self._region_cache[pair] = region
+        return region
+
+    def _keyword_regions(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Highest scoring region per lowercased text from keyword indicators (None without any hit).
+        Builds a (texts x indicators) presence mask and scores all regions with one matrix product;
+        each indicator present counts once, weighted by phrase length.
+        """
+        mask = np.zeros((len(texts), len(self._INDICATORS)), dtype=np.int32)
+        decided: Dict[int, int] = {}  # text index -> region id settled without scoring
+        for i, text in enumerate(texts):
+            if self._automaton is not None:
+                mask[i, [j for _, j in self._automaton.iter(text)]] = 1
+            elif HAS_NUMBA:
+                text_bytes = np.frombuffer(text.encode(), dtype=np.uint8)
+                mask[i] = indicator_hits(text_bytes, self._INDICATOR_BYTES, self._INDICATOR_OFFSETS)
+            else:
+                hit_regions = [(r, member_ids) for r, (pattern, member_ids) in enumerate(self._region_patterns)
+                               if pattern.search(text)]
+                if len(hit_regions) == 1:
+                    # Only one region has any indicator present, so it wins outright
+                    decided[i] = hit_regions[0][0]
+                    continue
+                for _, member_ids in hit_regions:
+                    mask[i, member_ids] = [self._INDICATORS[j] in text for j in member_ids]
+
+        scores = mask @ self._WEIGHTS
+        best = scores.argmax(axis=1)  # first maximum, i.e. REGION_INDICATORS order on ties
+        regions = [self._REGION_NAMES[b] if scores[i, b] > 0 else None for i, b in enumerate(best.tolist())]
+        for i, region_id in decided.items():
+            regions[i] = self._REGION_NAMES[region_id]
+        return regions
+
+    def _entity_regions(self, texts: List[str]) -> List[Optional[str]]:
+        """Region per text from spaCy GPE/ORG/MONEY entities (None when inconclusive)"""
+        try:
+            docs = list(self.nlp.pipe(texts, batch_size=64))
+        except Exception as e:
+            print(f"NLP region detection failed: {e}")
+            return [None] * len(texts)
+        return [self._entity_region(doc) for doc in docs]
+
+    def _entity_region(self, doc) -> Optional[str]:
+        # Extract named entities (countries, cities, organizations)
+        entities = [ent.text.lower() for ent in doc.ents
+                    if ent.label_ in ["GPE", "ORG", "MONEY"]]
+
+        if not entities:
+            return None
+
+        # Re-score based on entities, tracking the leading region id in the same pass
+        best_id, best_score = 0, 0
+        for region_id, indicators in enumerate(self.REGION_INDICATORS.values()):
             score = 0
-            for indicator in indicators:
-                if indicator.lower() in text:
-                    # Weight longer phrases higher
-                    weight = len(indicator.split())
-                    score += weight
-            region_scores[region] = score
-
-        # If we have clear indicators, return the highest scoring region
-        if region_scores and max(region_scores.values()) > 0:
-            return max(region_scores, key=region_scores.get)
-
-        # Enhanced NLP-based detection if spaCy is available
-        if self.nlp:
-            try:
-                doc = self.nlp(f"{headline} {summary}")
+            for entity in entities:
+                for indicator in indicators:
+                    if indicator in entity or entity in indicator:
+                        score += 2
+            if score > best_score:  # strict: ties keep the earlier region
+                best_id, best_score = region_id, score
 
-                # Extract named entities (countries, cities, organizations)
-                entities = [ent.text.lower() for ent in doc.ents
-                           if ent.label_ in ["GPE", "ORG", "MONEY"]]
+        return self._REGION_NAMES[best_id] if best_score > 0 else None
 
-                # Re-score based on entities
-                for region, indicators in self.REGION_INDICATORS.items():
-                    for entity in entities:
-                        for indicator in indicators:
-                            if indicator in entity or entity in indicator:
-                                region_scores[region] = region_scores.get(region, 0) + 2
 
-                if region_scores and max(region_scores.values()) > 0:
-                    return max(region_scores, key=region_scores.get)
+# Per-process detector used by region-detection workers (created on first task)
+_WORKER_DETECTOR: Optional[RegionDetector] = None
 
-            except Exception as e:
-                print(f"NLP region detection failed: {e}")
 
-        # Default to India if no clear indicators
-        return "IN"
+def _detect_regions_worker(pairs: List[Tuple[str, str]]) -> List[str]:
+    """ProcessPoolExecutor entry point: region codes for (headline, summary) pairs"""
+    global _WORKER_DETECTOR
+    if _WORKER_DETECTOR is None:
+        _WORKER_DETECTOR = RegionDetector()
+    return _WORKER_DETECTOR.detect_regions(pairs)
+
+
+# (news_id, headline, summary, published_dt, date_key, score, url) for one kept RAG result
+_Candidate = Tuple[str, str, str, str, str, float, str]
 
 
 class RagApiClient:
@@ -225,12 +467,119 @@ class RagApiClient:
 
     def __init__(self, config: Optional[RagConfig] = None):
         self.config = config or RagConfig()
+        # The batch endpoint only serves 1155d results; mixed with another endpoint
+        # its responses would not match what search() returns for the same query
+        if self.config.batch_endpoint and self.config.endpoint.rstrip("/") != BATCH_SEARCH_ENDPOINT.rstrip("/"):
+            raise ValueError(f"batch_endpoint requires endpoint {BATCH_SEARCH_ENDPOINT}, not {self.config.endpoint}")
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
-            'User-Agent': 'RAG-News-Agents/1.0'
+            'User-Agent': 'RAG-News-Agents/1.0',
+            'Connection': 'keep-alive'
         })
+        # Larger keep-alive pool so concurrent callers reuse connections;
+        # retries stay in search() so urllib3's own retries are disabled
+        adapter = HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=Retry(total=0))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.region_detector = RegionDetector()
+        self._limiter = None        # AsyncLimiter and Semaphore, bound to the event loop in _async_loop
+        self._semaphore = None
+        self._async_loop = None
+        self._region_pool: Optional[ProcessPoolExecutor] = None  # see region_workers
+        self._proximity: Optional[ProximityCache] = None
+        if self.config.proximity_threshold > 0:
+            self._proximity = ProximityCache(self.config.proximity_threshold, path=self.config.proximity_cache_path)
+        if self.config.http2 and not HAS_HTTPX_HTTP2:
+            print("Warning: http2 requested but httpx[http2] is not installed; using aiohttp")
+        self._local_index: Optional[LocalIndex] = None
+        if self.config.local_index_path:
+            self._local_index = LocalIndex.load(self.config.local_index_path)
+            if self._local_index is None:
+                print(f"Warning: local index {self.config.local_index_path} not loaded; using the RAG API")
+
+    def close(self) -> None:
+        """Close the HTTP session and stop any region-detection worker processes"""
+        self._save_proximity()
+        self.session.close()
+        if self._region_pool is not None:
+            self._region_pool.shutdown()
+            self._region_pool = None
+
+    def _get_region_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Lazily started worker pool when region_workers > 0"""
+        if self.config.region_workers <= 0:
+            return None
+        if self._region_pool is None:
+            self._region_pool = ProcessPoolExecutor(max_workers=self.config.region_workers)
+        return self._region_pool
+
+    def _bind_event_loop(self) -> None:
+        """(Re)create the per-event-loop limiter and semaphore (neither may be shared across loops)"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._limiter = AsyncLimiter(self.config.max_qpm, 60) if HAS_AIOLIMITER else None
+            self._semaphore = asyncio.Semaphore(self.config.concurrency_limit)
+            self._async_loop = loop
+
+    def _retry_after(self, headers, attempt: int) -> float:
+        """Seconds to wait after a 429: the server's Retry-After if given, else exponential backoff"""
+        try:
+            return max(0.0, float(headers.get("Retry-After")))
+        except (TypeError, ValueError):
+            return self.config.retry_delay * (2 ** attempt)
+
+    def _cache_file(self, url: str, query: str, size: int) -> Optional[Path]:
+        """Cache entry for (endpoint, query, size), or None when caching is disabled"""
+        if not self.config.cache_dir or self.config.cache_ttl <= 0:
+            return None
+        key = hashlib.blake2b(f"{url}|{query}|{size}".encode(), digest_size=16).hexdigest()
+        return Path(self.config.cache_dir) / f"{key}.json"
+
+    def _cache_get(self, cache_file: Optional[Path]) -> Optional[Dict[str, Any]]:
+        """Cached response if present and younger than cache_ttl"""
+        if cache_file is None:
+            return None
+        try:
+            if time.time() - cache_file.stat().st_mtime > self.config.cache_ttl:
+                return None
+            return _loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def _cache_put(self, cache_file: Optional[Path], content: bytes) -> None:
+        """Store a raw response body; written to a temp file and renamed so readers never see partial JSON"""
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, cache_file)
+        except OSError as e:
+            print(f"Warning: could not write RAG cache {cache_file}: {e}")
+
+    def _cached_response(self, cache_file: Optional[Path], query: str, size: int) -> Optional[Dict[str, Any]]:
+        """
+        Exact on-disk hit first, then the response of a near-duplicate query
+        (proximity cache), then a top-k search of the local index
+        """
+        cached = self._cache_get(cache_file)
+        if cached is None and self._proximity is not None and size == self.config.max_results_per_query:
+            cached = self._proximity.lookup(query)
+        if cached is None and self._local_index is not None:
+            cached = self._local_index.search(query, size, self.config.local_min_similarity)
+        return cached
+
+    def _store_response(self, cache_file: Optional[Path], query: str, size: int,
+                        content: bytes, result: Dict[str, Any]) -> None:
+        self._cache_put(cache_file, content)
+        if self._proximity is not None and size == self.config.max_results_per_query:
+            self._proximity.insert(query, result)
+
+    def _save_proximity(self) -> None:
+        if self._proximity is not None:
+            self._proximity.save()
 
     def search(self, query: str, size: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -252,22 +601,29 @@ class RagApiClient:
             "size": size
         }
 
+        cache_file = self._cache_file(url, query, size)
+        cached = self._cached_response(cache_file, query, size)
+        if cached is not None:
+            return cached
+
         last_exception = None
 
         for attempt in range(self.config.retry_attempts):
             try:
                 response = self.session.post(
                     url,
-                    json=payload,
+                    data=_dumps(payload),
                     timeout=self.config.timeout
                 )
                 response.raise_for_status()
-                return response.json()
+                result = _loads(response.content)
+                self._store_response(cache_file, query, size, response.content, result)
+                return result
 
             except requests.exceptions.HTTPError as e:
                 last_exception = e
                 if response.status_code == 429:  # Rate limit
-                    delay = self.config.retry_delay * (2 ** attempt)  # Exponential backoff
+                    delay = self._retry_after(response.headers, attempt)
                     print(f"Rate limited. Retrying in {delay}s (attempt {attempt + 1}/{self.config.retry_attempts})")
                     time.sleep(delay)
                     continue
@@ -275,7 +631,7 @@ class RagApiClient:
                     print(f"HTTP error {response.status_code} for query '{query}': {e}")
                     break
 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, ValueError) as e:  # ValueError: malformed JSON body
                 last_exception = e
                 if attempt < self.config.retry_attempts - 1:
                     delay = self.config.retry_delay * (2 ** attempt)
@@ -288,6 +644,186 @@ class RagApiClient:
         print(f"RAG API request failed after {self.config.retry_attempts} attempts for query '{query}': {last_exception}")
         return {"results": []}
 
+    def _batch_lookup(self, queries: List[str], size: int) -> Tuple[List[Optional[Dict[str, Any]]], List[Tuple[int, str, Optional[Path]]]]:
+        """Cached responses for a batch (None where missing) and the (index, query, cache_file) misses"""
+        url = f"{self.config.base_url}{self.config.batch_endpoint}"
+        responses, misses = [], []
+        for i, query in enumerate(queries):
+            cache_file = self._cache_file(url, query, size)
+            cached = self._cached_response(cache_file, query, size)
+            responses.append(cached)
+            if cached is None:
+                misses.append((i, query, cache_file))
+        return responses, misses
+
+    def _batch_store(self, responses: List[Optional[Dict[str, Any]]], misses: List[Tuple[int, str, Optional[Path]]],
+                     size: int, content: bytes) -> bool:
+        """Fill the misses from a batch response body ({"responses": [...]}); False if it doesn't match the request"""
+        try:
+            batch = _loads(content).get("responses")
+        except (ValueError, AttributeError):
+            return False
+        if not isinstance(batch, list) or len(batch) != len(misses):
+            return False
+        for (i, query, cache_file), result in zip(misses, batch):
+            self._store_response(cache_file, query, size, _dumps(result), result)
+            responses[i] = result
+        return True
+
+    def search_batch(self, queries: List[str], size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        search() for several queries: cached ones are reused and the rest go to
+        batch_endpoint in one POST. Falls back to one search() per query if the
+        batch request fails.
+
+        Returns:
+            One RAG API response per query, in order
+        """
+        if size is None:
+            size = self.config.max_results_per_query
+
+        responses, misses = self._batch_lookup(queries, size)
+        if not misses:
+            return responses
+
+        url = f"{self.config.base_url}{self.config.batch_endpoint}"
+        # Same fields as search(), so the server applies the same result limit
+        payload = {"queries": [query for _, query, _ in misses], "size": size}
+        try:
+            response = self.session.post(url, data=_dumps(payload), timeout=self.config.timeout)
+            response.raise_for_status()
+            ok = self._batch_store(responses, misses, size, response.content)
+            error = None if ok else "malformed response"
+        except requests.exceptions.RequestException as e:
+            ok, error = False, e
+
+        if not ok:
+            print(f"Batch request failed ({error}); sending {len(misses)} queries one at a time")
+            for i, query, _ in misses:
+                responses[i] = self.search(query, size)
+        return responses
+
+    async def search_batch_async(self, session: "aiohttp.ClientSession", queries: List[str],
+                                 size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Async variant of search_batch(); the fallback runs the queries concurrently"""
+        if size is None:
+            size = self.config.max_results_per_query
+
+        responses, misses = self._batch_lookup(queries, size)
+        if not misses:
+            return responses
+
+        url = f"{self.config.base_url}{self.config.batch_endpoint}"
+        body = _dumps({"queries": [query for _, query, _ in misses], "size": size})
+        self._bind_event_loop()
+
+        ok, error = False, None
+        try:
+            async with self._semaphore:
+                if self._limiter is not None:
+                    await self._limiter.acquire()
+                status, reason, _, content = await self._post_async(session, url, body)
+            if status >= 400:
+                error = f"HTTP {status} {reason}"
+            else:
+                ok = self._batch_store(responses, misses, size, content)
+                error = None if ok else "malformed response"
+        except _ASYNC_HTTP_ERRORS as e:
+            error = e
+
+        if not ok:
+            print(f"Batch request failed ({error}); sending {len(misses)} queries one at a time")
+            fallback = await asyncio.gather(*[self.search_async(session, query, size) for _, query, _ in misses])
+            for (i, _, _), result in zip(misses, fallback):
+                responses[i] = result
+        return responses
+
+    def _new_async_session(self) -> "aiohttp.ClientSession":
+        """
+        aiohttp session with a bounded per-host connection pool, or an HTTP/2
+        httpx client when config.http2 is set and httpx[http2] is installed
+        """
+        headers = {'User-Agent': 'RAG-News-Agents/1.0'}
+        if self.config.http2 and HAS_HTTPX_HTTP2:
+            limits = httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=60)
+            return httpx.AsyncClient(http2=True, limits=limits, headers=headers)
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300)
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+
+    async def _post_async(self, session, url: str, body: bytes) -> Tuple[int, str, Any, bytes]:
+        """POST a JSON body on either session type; returns (status, reason, headers, content)"""
+        headers = {'Content-Type': 'application/json'}
+        if HAS_HTTPX_HTTP2 and isinstance(session, httpx.AsyncClient):
+            response = await session.post(url, content=body, headers=headers, timeout=self.config.timeout)
+            return response.status_code, response.reason_phrase, response.headers, response.content
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        async with session.post(url, data=body, headers=headers, timeout=timeout) as response:
+            return response.status, response.reason, response.headers, await response.read()
+
+    async def search_async(self, session: "aiohttp.ClientSession", query: str, size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Async variant of search() sharing the caller's aiohttp session
+
+        Args:
+            session: Open aiohttp session
+            query: Search query string
+            size: Maximum number of results (defaults to config)
+
+        Returns:
+            RAG API response as dict
+        """
+        if size is None:
+            size = self.config.max_results_per_query
+
+        url = f"{self.config.base_url}{self.config.endpoint}"
+        payload = {
+            "query": query,
+            "size": size
+        }
+        cache_file = self._cache_file(url, query, size)
+        cached = self._cached_response(cache_file, query, size)
+        if cached is not None:
+            return cached
+
+        body = _dumps(payload)
+
+        last_exception = None
+        self._bind_event_loop()
+
+        for attempt in range(self.config.retry_attempts):
+            try:
+                # Bounded in-flight requests; a 429 backoff keeps its slot so the burst drains
+                async with self._semaphore:
+                    if self._limiter is not None:
+                        await self._limiter.acquire()
+                    status, reason, headers, content = await self._post_async(session, url, body)
+                    if status == 429:  # Rate limit
+                        last_exception = f"HTTP 429 {reason}"
+                        delay = self._retry_after(headers, attempt)
+                        print(f"Rate limited. Retrying in {delay}s (attempt {attempt + 1}/{self.config.retry_attempts})")
+                        await asyncio.sleep(delay)
+                        continue
+                    if status >= 400:
+                        last_exception = f"HTTP {status} {reason}"
+                        print(f"HTTP error {status} for query '{query}': {reason}")
+                        break
+                    result = _loads(content)
+                    self._store_response(cache_file, query, size, content, result)
+                    return result
+
+            except _ASYNC_HTTP_ERRORS + (ValueError,) as e:  # ValueError: malformed JSON body
+                last_exception = e
+                if attempt < self.config.retry_attempts - 1:
+                    delay = self.config.retry_delay * (2 ** attempt)
+                    print(f"Request failed. Retrying in {delay}s (attempt {attempt + 1}/{self.config.retry_attempts}): {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                else:
+                    break
+
+        print(f"RAG API request failed after {self.config.retry_attempts} attempts for query '{query}': {last_exception}")
+        return {"results": []}
+
     def _extract_rag_id(self, result: Dict[str, Any]) -> Optional[str]:
         """Extract ID from RAG API response"""
         # Try various possible ID fields from RAG response
@@ -299,17 +835,18 @@ class RagApiClient:
     def _generate_news_id(self, text: str, sector: str) -> str:
         """Generate consistent ID from content as fallback"""
         content = f"{text}_{sector}"
-        return hashlib.md5(content.encode()).hexdigest()[:8].upper()
+        # 32-bit digest straight from blake2b (faster than md5 on 64-bit CPUs, no truncation)
+        return hashlib.blake2b(content.encode(), digest_size=4).hexdigest().upper()
 
     def _extract_headline_summary(self, text: str) -> tuple[str, str]:
         """
         Extract headline and summary from RAG response text.
         Uses simple heuristics - first sentence as headline, rest as summary.
         """
-        sentences = text.split('. ')
-        if len(sentences) >= 2:
-            headline = sentences[0].strip()
-            summary = '. '.join(sentences[1:]).strip()
+        first, sep, rest = text.partition('. ')
+        if sep:
+            headline = first.strip()
+            summary = rest.strip()
         else:
             # Fallback: split at reasonable length
             if len(text) > 80:
@@ -339,9 +876,18 @@ class RagApiClient:
         Returns:
             List of NewsItem objects
         """
-        news_items = []
+        return self._build_news_items(self._extract_candidates(rag_response, sector), sector)
+
+    def _extract_candidates(self, rag_response: Dict[str, Any], sector: str) -> List[_Candidate]:
+        """
+        Cheap first pass over a RAG response: score filter, ID, headline/summary and date.
+        Region detection is left to _build_news_items so duplicates can be dropped first.
+        """
+        candidates = []
         results = rag_response.get("results", [])
-        current_time = datetime.now(timezone.utc)
+        # Fallback timestamp for results without published_dt, formatted once per response
+        current_iso = datetime.now(timezone.utc).isoformat()
+        current_datekey = iso_to_datekey(current_iso)
 
         for i, result in enumerate(results):
             # Filter by score threshold
@@ -367,13 +913,24 @@ class RagApiClient:
 
             # Extract datetime from RAG API response
             published_dt = result.get("published_dt", "").strip()
-            if not published_dt:
+            if published_dt:
+                date_key = iso_to_datekey(published_dt)
+            else:
                 # Fallback to current time if published_dt is missing
-                published_dt = current_time.isoformat()
+                published_dt, date_key = current_iso, current_datekey
 
-            # Detect region using NLP
-            detected_region = self.region_detector.detect_region(headline, summary)
+            candidates.append((news_id, headline, summary, published_dt, date_key, score, result.get("url") or ""))
 
+        return candidates
+
+    def _build_news_items(self, candidates: List[_Candidate], sector: str,
+                          regions: Optional[List[str]] = None) -> List[NewsItem]:
+        """Detect regions for all candidates at once (spaCy runs batched) unless given, and build NewsItems"""
+        if regions is None:
+            regions = self.region_detector.detect_regions([(headline, summary) for _, headline, summary, _, _, _, _ in candidates])
+
+        news_items = []
+        for (news_id, headline, summary, published_dt, date_key, score, url), detected_region in zip(candidates, regions):
             # Create NewsItem using RAG API's published_dt and detected region
             news_item = NewsItem(
                 id=news_id,
@@ -383,65 +940,178 @@ class RagApiClient:
                 source=f"RAG-API (score: {score:.3f})",
                 region=detected_region,
                 sector=sector,
-                date_key=iso_to_datekey(published_dt)
+                date_key=date_key,
+                source_url=url
             )
 
             news_items.append(news_item)
 
         return news_items
 
-    def fetch_news_for_sector(self, sector: str, queries: List[str]) -> List[NewsItem]:
+    def _merge_unique(self, batches) -> List[_Candidate]:
         """
-        Fetch news for a specific sector using multiple queries
-
-        Args:
-            sector: Target sector name
-            queries: List of search queries for this sector
-
-        Returns:
-            Combined list of NewsItem objects (limited to max_results_per_sector)
+        Combine per-query candidate lists in query order, dropping duplicate IDs
+        and near-identical headlines, up to max_results_per_sector.
+        Runs before region detection, so duplicates never reach the NLP step.
+        `batches` may be a lazy iterable; it is not advanced once the limit is hit.
         """
-        all_news = []
+        unique = []
         seen_texts = set()  # Deduplicate similar results
         seen_ids = set()    # Deduplicate by ID
 
-        for query in queries:
-            # Stop if we've reached the sector limit
-            if len(all_news) >= self.config.max_results_per_sector:
-                break
-
-            print(f"Fetching {sector} news with query: {query}")
-
-            # Execute search
-            response = self.search(query)
-
-            # Convert to news items
-            news_items = self.convert_to_news_items(response, sector, query)
-
-            # Deduplicate by ID and text similarity
-            for item in news_items:
-                if len(all_news) >= self.config.max_results_per_sector:
+        for candidates in batches:
+            for candidate in candidates:
+                if len(unique) >= self.config.max_results_per_sector:
                     break
 
+                news_id, headline = candidate[0], candidate[1]
+
                 # Check for duplicate IDs
-                if item.id in seen_ids:
+                if news_id in seen_ids:
                     continue
 
                 # Check for similar headlines
-                text_key = item.headline.lower()[:50]
+                text_key = headline.lower()[:50]
                 if text_key in seen_texts:
                     continue
 
-                seen_ids.add(item.id)
+                seen_ids.add(news_id)
                 seen_texts.add(text_key)
-                all_news.append(item)
+                unique.append(candidate)
+
+            # Stop if we've reached the sector limit
+            if len(unique) >= self.config.max_results_per_sector:
+                break
+
+        return unique
+
+    def _iter_sector_batches(self, sector: str, queries: List[str]):
+        """Run the sector's queries one at a time (or as one batch), yielding candidate results"""
+        if self.config.batch_endpoint:
+            print(f"Fetching {sector} news with {len(queries)} batched queries")
+            for response in self.search_batch(queries):
+                yield self._extract_candidates(response, sector)
+            time.sleep(self.config.rate_limit_delay)
+            return
+
+        for query in queries:
+            print(f"Fetching {sector} news with query: {query}")
+            response = self.search(query)
+            yield self._extract_candidates(response, sector)
 
             # Rate limiting between requests
             time.sleep(self.config.rate_limit_delay)
 
+    async def _build_news_items_async(self, candidates: List[_Candidate], sector: str) -> List[NewsItem]:
+        """_build_news_items(), with region detection run on the worker pool when configured"""
+        pool = self._get_region_pool()
+        if pool is None or not candidates:
+            return self._build_news_items(candidates, sector)
+        pairs = [(headline, summary) for _, headline, summary, _, _, _, _ in candidates]
+        regions = await asyncio.get_running_loop().run_in_executor(pool, _detect_regions_worker, pairs)
+        return self._build_news_items(candidates, sector, regions)
+
+    async def fetch_news_for_sector_async(self, session: "aiohttp.ClientSession", sector: str, queries: List[str]) -> List[NewsItem]:
+        """Async variant of fetch_news_for_sector(): the sector's queries run concurrently"""
+        if self.config.batch_endpoint:
+            print(f"Fetching {sector} news with {len(queries)} batched queries")
+            responses = await self.search_batch_async(session, queries)
+        else:
+            for query in queries:
+                print(f"Fetching {sector} news with query: {query}")
+            responses = await asyncio.gather(*[self.search_async(session, query) for query in queries])
+
+        all_news = await self._build_news_items_async(
+            self._merge_unique(self._extract_candidates(response, sector) for response in responses),
+            sector,
+        )
         print(f"Collected {len(all_news)} unique news items for {sector}")
         return all_news
 
+    async def fetch_all_sectors_async(self, sector_queries: Optional[Dict[str, List[str]]] = None) -> List[NewsItem]:
+        """Async variant of fetch_all_sectors(): every sector's queries run concurrently on one session"""
+        if sector_queries is None:
+            sector_queries = DEFAULT_SECTOR_QUERIES
+
+        all_news = []
+
+        print(f"Starting RAG API data collection for {len(sector_queries)} sectors...")
+
+        async with self._new_async_session() as session:
+            results = await asyncio.gather(
+                *[self.fetch_news_for_sector_async(session, sector, queries) for sector, queries in sector_queries.items()],
+                return_exceptions=True,
+            )
+
+        for sector, sector_news in zip(sector_queries, results):
+            if isinstance(sector_news, Exception):
+                print(f"✗ {sector}: Failed - {sector_news}")
+                continue
+            all_news.extend(sector_news)
+            print(f"✓ {sector}: {len(sector_news)} items")
+
+        self._save_proximity()
+        print(f"Total collected: {len(all_news)} news items")
+        return all_news
+
+    async def stream_all_sectors_async(self, queue: asyncio.Queue, sector_queries: Optional[Dict[str, List[str]]] = None) -> int:
+        """
+        Like fetch_all_sectors_async(), but each sector's items are put on `queue`
+        as soon as that sector completes instead of being collected.
+
+        Returns:
+            Number of items queued
+        """
+        if sector_queries is None:
+            sector_queries = DEFAULT_SECTOR_QUERIES
+
+        print(f"Starting RAG API data collection for {len(sector_queries)} sectors...")
+
+        async def fetch_and_queue(session: "aiohttp.ClientSession", sector: str, queries: List[str]) -> int:
+            try:
+                sector_news = await self.fetch_news_for_sector_async(session, sector, queries)
+            except Exception as e:
+                print(f"✗ {sector}: Failed - {e}")
+                return 0
+            for item in sector_news:
+                await queue.put(item)
+            print(f"✓ {sector}: {len(sector_news)} items")
+            return len(sector_news)
+
+        async with self._new_async_session() as session:
+            counts = await asyncio.gather(
+                *[fetch_and_queue(session, sector, queries) for sector, queries in sector_queries.items()]
+            )
+
+        self._save_proximity()
+        total = sum(counts)
+        print(f"Total collected: {total} news items")
+        return total
+
+    async def _fetch_news_for_sector_session(self, sector: str, queries: List[str]) -> List[NewsItem]:
+        async with self._new_async_session() as session:
+            return await self.fetch_news_for_sector_async(session, sector, queries)
+
+    def fetch_news_for_sector(self, sector: str, queries: List[str]) -> List[NewsItem]:
+        """
+        Fetch news for a specific sector using multiple queries
+
+        Args:
+            sector: Target sector name
+            queries: List of search queries for this sector
+
+        Returns:
+            Combined list of NewsItem objects (limited to max_results_per_sector)
+        """
+        if _can_run_async():
+            all_news = asyncio.run(self._fetch_news_for_sector_session(sector, queries))
+        else:
+            all_news = self._build_news_items(self._merge_unique(self._iter_sector_batches(sector, queries)), sector)
+            print(f"Collected {len(all_news)} unique news items for {sector}")
+
+        self._save_proximity()
+        return all_news
+
     def fetch_all_sectors(self, sector_queries: Optional[Dict[str, List[str]]] = None) -> List[NewsItem]:
         """
         Fetch news for all configured sectors
@@ -452,6 +1122,9 @@ class RagApiClient:
         Returns:
             Combined list of all NewsItem objects
         """
+        if _can_run_async():
+            return asyncio.run(self.fetch_all_sectors_async(sector_queries))
+
         if sector_queries is None:
             sector_queries = DEFAULT_SECTOR_QUERIES
 
@@ -473,16 +1146,64 @@ class RagApiClient:
         return all_news
 
 
+def _can_run_async() -> bool:
+    """True when aiohttp is installed and no event loop is already running in this thread"""
+    if not HAS_AIOHTTP:
+        return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return True
+    return False
+
+
 def save_news_to_json(news_items: List[NewsItem], output_path: str) -> None:
     """Save news items to JSON file in news_all.json format"""
-    news_dicts = [asdict(item) for item in news_items]
+    # Dataclasses are serialized directly (orjson natively, stdlib via a default hook)
+    write_json(output_path, news_items)
+
+    print(f"Saved {len(news_items)} news items to {output_path}")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(news_dicts, f, indent=2, ensure_ascii=False)
+
+def save_news_to_jsonl(news_items: List[NewsItem], output_path: str) -> None:
+    """Save news items as JSON Lines (one compact object per line)"""
+    with open(output_path, "wb") as f:
+        for item in news_items:
+            f.write(_dumps(item) + b"\n")
 
     print(f"Saved {len(news_items)} news items to {output_path}")
 
 
+async def _jsonl_writer(queue: asyncio.Queue, output_path: str) -> None:
+    """Single consumer: write queued NewsItems as JSON lines until the None sentinel"""
+    with open(output_path, "wb") as f:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            f.write(_dumps(item) + b"\n")
+
+
+async def stream_news_to_jsonl(client: RagApiClient, sector_queries: Dict[str, List[str]], output_path: str) -> int:
+    """
+    Fetch all sectors concurrently and stream items to a JSONL file as each
+    sector completes (lines follow sector completion order).
+
+    Returns:
+        Number of items written
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+    writer = asyncio.create_task(_jsonl_writer(queue, output_path))
+    try:
+        total = await client.stream_all_sectors_async(queue, sector_queries)
+    finally:
+        await queue.put(None)
+        await writer
+
+    print(f"Saved {total} news items to {output_path}")
+    return total
+
+
 def main():
     """CLI entry point for RAG data collection"""
     import argparse
@@ -496,16 +1217,46 @@ def main():
                        help="Maximum results per query")
     parser.add_argument("--sectors", nargs="+",
                        help="Specific sectors to fetch (default: all)")
+    parser.add_argument("--cache-ttl", type=float, default=0.0,
+                       help="Reuse on-disk RAG responses younger than this many seconds (default 0: no cache)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Bypass the on-disk RAG response cache (overrides --cache-ttl)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json",
+                       help="Output format: JSON array or JSON Lines streamed per sector")
+    parser.add_argument("--region-workers", type=int, default=0,
+                       help="Worker processes for region detection (default: in-process)")
+    parser.add_argument("--batch-endpoint",
+                       help="Send each sector's queries in one POST to this endpoint (e.g. /search/cosine/embedding1155d/batch)")
+    parser.add_argument("--http2", action="store_true",
+                       help="Send async requests over HTTP/2 (requires httpx[http2])")
+    parser.add_argument("--local-index",
+                       help="Serve searches from this local index (.npz) instead of the API")
+    parser.add_argument("--build-local-index", metavar="PATH",
+                       help="Build a local index at PATH from the cached RAG responses and exit")
 
     args = parser.parse_args()
 
+    if args.build_local_index:
+        index = LocalIndex.build_from_cache(RagConfig().cache_dir)
+        index.save(args.build_local_index)
+        print(f"✅ Local index: {args.build_local_index} ({len(index)} documents)")
+        return
+
     # Configure client
     config = RagConfig(
         min_score=args.min_score,
-        max_results_per_query=args.max_per_query
+        max_results_per_query=args.max_per_query,
+        region_workers=args.region_workers,
+        local_index_path=args.local_index,
+        batch_endpoint=args.batch_endpoint,
+        http2=args.http2,
+        cache_ttl=0.0 if args.no_cache else args.cache_ttl
     )
 
-    client = RagApiClient(config)
+    try:
+        client = RagApiClient(config)
+    except ValueError as e:
+        parser.error(str(e))
 
     # Filter sectors if specified
     sector_queries = DEFAULT_SECTOR_QUERIES
@@ -515,15 +1266,24 @@ def main():
             if sector in args.sectors
         }
 
-    # Fetch data
-    news_items = client.fetch_all_sectors(sector_queries)
-
-    # Save results
-    save_news_to_json(news_items, args.output)
+    # Fetch and save data
+    try:
+        if args.format == "jsonl" and _can_run_async():
+            # Sector tasks feed a single writer as they finish
+            total = asyncio.run(stream_news_to_jsonl(client, sector_queries, args.output))
+        else:
+            news_items = client.fetch_all_sectors(sector_queries)
+            if args.format == "jsonl":
+                save_news_to_jsonl(news_items, args.output)
+            else:
+                save_news_to_json(news_items, args.output)
+            total = len(news_items)
+    finally:
+        client.close()
 
     print("\n✅ RAG data collection complete!")
     print(f"   Output: {args.output}")
-    print(f"   Items: {len(news_items)}")
+    print(f"   Items: {total}")
 
 
 if __name__ == "__main__":
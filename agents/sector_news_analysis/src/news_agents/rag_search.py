@@ -4,16 +4,149 @@ RAG Search Module for News Retrieval
 Connects to RAG API endpoint to search for sector-specific news articles
 """
 
-import json
+import asyncio
 import csv
+import dataclasses
+import logging
 import os
+import re
 import sys
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from pathlib import Path
 
 # Import the RAG API client
-from .rag_api_client import RagApiClient, RagConfig
+from .rag_api_client import RagApiClient, RagConfig, HAS_AIOHTTP, HAS_AHOCORASICK
+from .settings import settings, DEFAULT_RAG_BASE_URL, DEFAULT_RAG_ENDPOINT
+from .types import NewsItem
+from .utils import read_json, write_json
+
+logger = logging.getLogger(__name__)
+
+# CSV columns, in order
+CSV_FIELDS = ("id", "headline", "summary", "datetime", "source", "region",
+              "sector", "url", "similarity_score", "search_keyword")
+# NewsItem attributes behind the leading CSV columns
+_CSV_ATTRS = attrgetter("id", "headline", "summary", "datetime", "source", "region", "sector", "source_url")
+SIMILARITY_SCORE = 0.8  # Default score since API doesn't provide this
+SEARCH_KEYWORD = "sector_query"
+
+
+def _csv_row(item: NewsItem) -> tuple:
+    return _CSV_ATTRS(item) + (SIMILARITY_SCORE, SEARCH_KEYWORD)
+
+
+def _news_dict(item: NewsItem) -> Dict[str, Any]:
+    """NewsItem -> news JSON object in the format expected by the agents"""
+    return {
+        "id": item.id,
+        "headline": item.headline,
+        "summary": item.summary,
+        "datetime": item.datetime,
+        "source": item.source,
+        "region": item.region,
+        "sector": item.sector,
+        "source_url": item.source_url,
+        "date_key": item.date_key
+    }
+
+
+@lru_cache(maxsize=8)
+def _read_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # mtime_ns is part of the cache key so an edited file is re-read
+    return read_json(path)
+
+
+_is_word_char = re.compile(r"\w").match
+
+# Defaults used when the config file is missing; built once and read-only.
+# Environment settings are applied over the api section in _setup_api_client.
+_DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType({
+    "api": MappingProxyType({
+        "base_url": DEFAULT_RAG_BASE_URL,
+        "endpoint": DEFAULT_RAG_ENDPOINT,
+        "min_score": 0.5,
+        "max_results_per_query": 25,
+        "max_results_per_sector": 15,
+        "timeout": 30,
+        "retry_attempts": 3,
+        "retry_delay": 2.0,
+        "rate_limit_delay": 1.0,
+        "max_qpm": 60,
+        "cache_ttl": 0,
+        "concurrency_limit": 8,
+        "region_workers": 0,
+        "proximity_threshold": 0.0,
+        "batch_endpoint": None,
+        "http2": False,
+        "local_news_file": ""
+    }),
+    "sectors": MappingProxyType({
+        "Energy": ("oil", "gas", "petroleum", "crude", "energy sector", "refinery", "fuel"),
+        "Banks": ("banking", "banks", "financial", "lending", "credit", "NPA", "RBI"),
+        "Auto": ("automotive", "cars", "vehicles", "EV", "electric vehicle", "automobile"),
+        "Cement": ("cement", "construction", "building materials", "infrastructure"),
+        "IT": ("information technology", "software", "IT services", "tech", "digital"),
+        "Pharma": ("pharmaceutical", "drugs", "medicine", "healthcare", "biotech"),
+        "Telecom": ("telecommunication", "mobile", "wireless", "broadband", "5G"),
+        "FMCG": ("consumer goods", "FMCG", "retail", "consumer", "household"),
+        "Infrastructure": ("infrastructure", "construction", "roads", "highways", "railways")
+    }),
+    "output": MappingProxyType({
+        "csv_file": "data/news_rag_results.csv",
+        "json_file": ".cache/news_rag.json",
+        "include_metadata": True,
+        "max_news_per_sector": 15
+    })
+})
+
+
+class SectorMatcher:
+    """
+    Inverted keyword -> sectors index over the configured sector queries.
+    Classifies a text against every sector in one pass (Aho-Corasick when
+    pyahocorasick is installed, otherwise one regex alternation).
+    Keywords match case-insensitively on word boundaries, so "EV" does not hit "revenue".
+    """
+
+    def __init__(self, sectors: Dict[str, List[str]]):
+        self.sectors = list(sectors)
+        self._keyword_sectors: Dict[str, List[int]] = {}
+        for i, keywords in enumerate(sectors.values()):
+            for keyword in keywords:
+                ids = self._keyword_sectors.setdefault(keyword.lower(), [])
+                if i not in ids:
+                    ids.append(i)
+
+        self._automaton, self._pattern = None, None
+        if HAS_AHOCORASICK:
+            import ahocorasick
+            self._automaton = ahocorasick.Automaton()
+            for keyword, ids in self._keyword_sectors.items():
+                self._automaton.add_word(keyword, (len(keyword), ids))
+            self._automaton.make_automaton()
+        elif self._keyword_sectors:
+            # Lookahead so keywords starting inside another match are still found
+            alternation = "|".join(re.escape(k) for k in sorted(self._keyword_sectors, key=len, reverse=True))
+            self._pattern = re.compile(rf"(?=(?<!\w)({alternation})(?!\w))")
+
+    def classify(self, text: str) -> List[str]:
+        """Sectors with at least one keyword in `text`, in config order"""
+        text = text.lower()
+        hit = set()
+        if self._automaton is not None:
+            n = len(text)
+            for end, (length, ids) in self._automaton.iter(text):
+                start = end - length + 1
+                if (start == 0 or not _is_word_char(text[start - 1])) and (end + 1 == n or not _is_word_char(text[end + 1])):
+                    hit.update(ids)
+        elif self._pattern is not None:
+            for m in self._pattern.finditer(text):
+                hit.update(self._keyword_sectors[m.group(1)])
+        return [self.sectors[i] for i in sorted(hit)]
 
 
 class RAGNewsSearch:
@@ -23,59 +156,30 @@ class RAGNewsSearch:
         """Initialize RAG search with configuration"""
         self.config = self._load_config(config_path)
         self.api_client = None
+        self.local_results: Optional[Dict[str, List[NewsItem]]] = None
         self._setup_api_client()
+        self._setup_local_results()
 
     def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load RAG configuration"""
+        """Load RAG configuration (parsed once per file version; the dict is shared, treat as read-only)"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            path = Path(config_path).resolve()
+            return _read_config(str(path), path.stat().st_mtime_ns)
         except FileNotFoundError:
-            print(f"Config file not found: {config_path}")
+            logger.warning(f"Config file not found: {config_path}")
             return self._get_default_config()
 
-    def _get_default_config(self) -> Dict[str, Any]:
-        """Default configuration if file not found"""
-        env_base_url = os.getenv("SECTOR_AGENT_RAG_BASE_URL", os.getenv("FINBERT_RAG_BASE_URL", "http://localhost:8000"))
-        env_endpoint = os.getenv("SECTOR_AGENT_RAG_ENDPOINT", "/search/cosine/embedding1155d/")
-
-        return {
-            "api": {
-                "base_url": env_base_url,
-                "endpoint": env_endpoint,
-                "min_score": 0.5,
-                "max_results_per_query": 25,
-                "max_results_per_sector": 15,
-                "timeout": 30,
-                "retry_attempts": 3,
-                "retry_delay": 2.0,
-                "rate_limit_delay": 1.0
-            },
-            "sectors": {
-                "Energy": ["oil", "gas", "petroleum", "crude", "energy sector", "refinery", "fuel"],
-                "Banks": ["banking", "banks", "financial", "lending", "credit", "NPA", "RBI"],
-                "Auto": ["automotive", "cars", "vehicles", "EV", "electric vehicle", "automobile"],
-                "Cement": ["cement", "construction", "building materials", "infrastructure"],
-                "IT": ["information technology", "software", "IT services", "tech", "digital"],
-                "Pharma": ["pharmaceutical", "drugs", "medicine", "healthcare", "biotech"],
-                "Telecom": ["telecommunication", "mobile", "wireless", "broadband", "5G"],
-                "FMCG": ["consumer goods", "FMCG", "retail", "consumer", "household"],
-                "Infrastructure": ["infrastructure", "construction", "roads", "highways", "railways"]
-            },
-            "output": {
-                "csv_file": "data/news_rag_results.csv",
-                "json_file": ".cache/news_rag.json",
-                "include_metadata": True,
-                "max_news_per_sector": 15
-            }
-        }
+    def _get_default_config(self) -> Mapping[str, Any]:
+        """Default configuration if file not found (shared, read-only)"""
+        return _DEFAULT_CONFIG
 
     def _setup_api_client(self):
         """Setup RAG API client connection"""
         try:
             api_config = self.config.get("api", {})
-            base_url = os.getenv("SECTOR_AGENT_RAG_BASE_URL", os.getenv("FINBERT_RAG_BASE_URL", api_config.get("base_url", "http://localhost:8000")))
-            endpoint = os.getenv("SECTOR_AGENT_RAG_ENDPOINT", api_config.get("endpoint", "/search/cosine/embedding1155d/"))
+            # Environment overrides the config file
+            base_url = settings.rag_base_url or api_config.get("base_url", DEFAULT_RAG_BASE_URL)
+            endpoint = settings.rag_endpoint or api_config.get("endpoint", DEFAULT_RAG_ENDPOINT)
 
             rag_config = RagConfig(
                 base_url=base_url,
@@ -86,181 +190,235 @@ class RAGNewsSearch:
                 timeout=api_config.get("timeout", 30),
                 retry_attempts=api_config.get("retry_attempts", 3),
                 retry_delay=api_config.get("retry_delay", 2.0),
-                rate_limit_delay=api_config.get("rate_limit_delay", 1.0)
+                rate_limit_delay=api_config.get("rate_limit_delay", 1.0),
+                max_qpm=api_config.get("max_qpm", 60),
+                cache_ttl=api_config.get("cache_ttl", 0),
+                concurrency_limit=api_config.get("concurrency_limit", 8),
+                region_workers=api_config.get("region_workers", 0),
+                proximity_threshold=api_config.get("proximity_threshold", 0.0),
+                batch_endpoint=api_config.get("batch_endpoint"),
+                http2=api_config.get("http2", False)
             )
 
             # Initialize API client
             self.api_client = RagApiClient(rag_config)
 
-            print(f"✅ Connected to RAG API: {rag_config.base_url}")
-            print(f"✅ Endpoint: {rag_config.endpoint}")
-            print(f"✅ Min score threshold: {rag_config.min_score}")
+            logger.info(f"✅ Connected to RAG API: {rag_config.base_url}")
+            logger.info(f"✅ Endpoint: {rag_config.endpoint}")
+            logger.info(f"✅ Min score threshold: {rag_config.min_score}")
 
         except Exception as e:
-            print(f"❌ Error setting up RAG API client: {e}")
+            logger.error(f"❌ Error setting up RAG API client: {e}")
             self.api_client = None
 
-    def search_by_sector(self, sector: str, limit: int = None) -> List[Dict[str, Any]]:
+    def _setup_local_results(self):
+        """
+        When api.local_news_file points at an existing news JSON (e.g. a previous
+        run's output), classify it into sectors once and serve searches from it
+        instead of querying the RAG API.
+        """
+        api_config = self.config.get("api", {})
+        local_file = api_config.get("local_news_file")
+        if not local_file or not os.path.exists(local_file):
+            return
+
+        limit = api_config.get("max_results_per_sector", 15)
+        matcher = SectorMatcher(self.config["sectors"])
+        buckets: Dict[str, List[NewsItem]] = {sector: [] for sector in matcher.sectors}
+        seen = {sector: set() for sector in matcher.sectors}
+        for d in read_json(local_file):
+            item = NewsItem(**d)
+            for sector in matcher.classify(f"{item.headline} {item.summary}"):
+                if len(buckets[sector]) < limit and item.id not in seen[sector]:
+                    seen[sector].add(item.id)
+                    buckets[sector].append(item if item.sector == sector else dataclasses.replace(item, sector=sector))
+
+        self.local_results = buckets
+        logger.info(f"✅ Using local news file: {local_file} ({sum(map(len, buckets.values()))} sector matches)")
+
+    def _local_all_sectors(self) -> Dict[str, List[NewsItem]]:
+        return {sector: items for sector, items in self.local_results.items() if items}
+
+    @staticmethod
+    def _group_by_sector(news_items: List[NewsItem]) -> Dict[str, List[NewsItem]]:
+        """NewsItems grouped by sector, in first-seen sector order"""
+        all_sector_results: Dict[str, List[NewsItem]] = {}
+        for item in news_items:
+            all_sector_results.setdefault(item.sector, []).append(item)
+        return all_sector_results
+
+    def search_by_sector(self, sector: str, limit: int = None) -> List[NewsItem]:
         """Search for news articles by sector using RAG API"""
+        if self.local_results is not None:
+            return self.local_results.get(sector, [])[:limit]
+
         if not self.api_client:
-            print("❌ RAG API client not available")
+            logger.warning("❌ RAG API client not available")
             return []
 
         # Get sector queries from config
         sector_queries = self.config["sectors"].get(sector, [])
         if not sector_queries:
-            print(f"❌ No queries found for sector: {sector}")
+            logger.warning(f"❌ No queries found for sector: {sector}")
             return []
 
-        print(f"🔍 Searching RAG API for sector: {sector}")
+        logger.info(f"🔍 Searching RAG API for sector: {sector}")
 
         try:
             # Use the API client to fetch news for this sector
-            news_items = self.api_client.fetch_news_for_sector(sector, sector_queries)
-
-            # Convert NewsItem objects to dict format for compatibility
-            results = []
-            for item in news_items:
-                result_dict = {
-                    "id": item.id,
-                    "headline": item.headline,
-                    "summary": item.summary,
-                    "datetime": item.datetime,
-                    "source": item.source,
-                    "region": item.region,
-                    "sector": item.sector,
-                    "url": item.source_url if hasattr(item, 'source_url') else "",
-                    "similarity_score": 0.8,  # Default score since API doesn't provide this
-                    "search_keyword": "sector_query",
-                    "date_key": item.date_key
-                }
-                results.append(result_dict)
-
-            print(f"✅ Found {len(results)} relevant articles for {sector}")
+            # NewsItems are kept as-is; they are only converted when written out
+            results = self.api_client.fetch_news_for_sector(sector, sector_queries)
+
+            logger.info(f"✅ Found {len(results)} relevant articles for {sector}")
             return results
 
         except Exception as e:
-            print(f"❌ Error searching RAG API for sector '{sector}': {e}")
+            logger.error(f"❌ Error searching RAG API for sector '{sector}': {e}")
             return []
 
-    def search_all_sectors(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Search for news across all sectors using RAG API"""
+    def search_all_sectors(self) -> Dict[str, List[NewsItem]]:
+        """
+        Search for news across all sectors using RAG API.
+        Sector queries run concurrently (the client drives its own event loop);
+        from inside a running loop, await asearch_all_sectors() instead.
+        """
+        if self.local_results is not None:
+            return self._local_all_sectors()
+
         if not self.api_client:
-            print("❌ RAG API client not available")
+            logger.warning("❌ RAG API client not available")
             return {}
 
-        print("🔍 Searching RAG API for all sectors...")
+        logger.info("🔍 Searching RAG API for all sectors...")
 
         try:
             # Use the API client to fetch news for all sectors
-            all_news_items = self.api_client.fetch_all_sectors()
-
-            # Group by sector
-            all_sector_results = {}
-            for item in all_news_items:
-                sector = item.sector
-                if sector not in all_sector_results:
-                    all_sector_results[sector] = []
-
-                # Convert NewsItem to dict format
-                result_dict = {
-                    "id": item.id,
-                    "headline": item.headline,
-                    "summary": item.summary,
-                    "datetime": item.datetime,
-                    "source": item.source,
-                    "region": item.region,
-                    "sector": item.sector,
-                    "url": item.source_url if hasattr(item, 'source_url') else "",
-                    "similarity_score": 0.8,
-                    "search_keyword": "sector_query",
-                    "date_key": item.date_key
-                }
-                all_sector_results[sector].append(result_dict)
-
-            print(f"✅ RAG API search completed for {len(all_sector_results)} sectors")
+            all_sector_results = self._group_by_sector(self.api_client.fetch_all_sectors())
+
+            logger.info(f"✅ RAG API search completed for {len(all_sector_results)} sectors")
             return all_sector_results
 
         except Exception as e:
-            print(f"❌ Error in RAG API search: {e}")
+            logger.error(f"❌ Error in RAG API search: {e}")
             return {}
 
-    def create_csv_output(self, all_results: Dict[str, List[Dict[str, Any]]]) -> str:
-        """Create CSV file from search results"""
-        csv_file = self.config["output"]["csv_file"]
+    async def asearch_all_sectors(self) -> Dict[str, List[NewsItem]]:
+        """search_all_sectors() for callers already running an event loop (e.g. async web handlers)"""
+        if self.local_results is not None:
+            return self._local_all_sectors()
+
+        if not self.api_client:
+            logger.warning("❌ RAG API client not available")
+            return {}
+
+        logger.info("🔍 Searching RAG API for all sectors...")
+
+        try:
+            if HAS_AIOHTTP:
+                # All sector queries are gathered on the caller's loop
+                all_news_items = await self.api_client.fetch_all_sectors_async()
+            else:
+                all_news_items = await asyncio.to_thread(self.api_client.fetch_all_sectors)
+            all_sector_results = self._group_by_sector(all_news_items)
+
+            logger.info(f"✅ RAG API search completed for {len(all_sector_results)} sectors")
+            return all_sector_results
+
+        except Exception as e:
+            logger.error(f"❌ Error in RAG API search: {e}")
+            return {}
 
-        # Flatten results for CSV
-        csv_rows = []
-        for sector, results in all_results.items():
-            for result in results:
-                csv_rows.append({
-                    "id": result["id"],
-                    "headline": result["headline"],
-                    "summary": result["summary"],
-                    "datetime": result["datetime"],
-                    "source": result["source"],
-                    "region": result["region"],
-                    "sector": result["sector"],
-                    "url": result["url"],
-                    "similarity_score": result["similarity_score"],
-                    "search_keyword": result["search_keyword"]
-                })
-
-        # Create CSV
+    @staticmethod
+    def _write_csv(csv_file: str, n_rows: int, rows) -> None:
+        # Rows are streamed as tuples (no intermediate row list); no header for an empty result
         os.makedirs(os.path.dirname(csv_file), exist_ok=True)
 
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            if csv_rows:
-                writer = csv.DictWriter(f, fieldnames=csv_rows[0].keys())
-                writer.writeheader()
-                writer.writerows(csv_rows)
+        with open(csv_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            if n_rows:
+                writer = csv.writer(f)
+                writer.writerow(CSV_FIELDS)
+                writer.writerows(rows)
 
-        print(f"✅ Created CSV file: {csv_file} ({len(csv_rows)} articles)")
-        return csv_file
+    def create_csv_output(self, all_results: Dict[str, List[NewsItem]]) -> Tuple[str, int]:
+        """Create CSV file from search results; returns (csv_file, rows written)"""
+        csv_file = self.config["output"]["csv_file"]
+        n_rows = sum(len(results) for results in all_results.values())
+
+        self._write_csv(csv_file, n_rows, (_csv_row(item) for results in all_results.values() for item in results))
+
+        logger.info(f"✅ Created CSV file: {csv_file} ({n_rows} articles)")
+        return csv_file, n_rows
 
-    def create_json_output(self, all_results: Dict[str, List[Dict[str, Any]]]) -> str:
-        """Create JSON file from search results"""
+    def create_json_output(self, all_results: Dict[str, List[NewsItem]]) -> Tuple[str, int]:
+        """Create JSON file from search results; returns (json_file, articles written)"""
         json_file = self.config["output"]["json_file"]
 
         # Convert to news format expected by agents
-        news_articles = []
-        for sector, results in all_results.items():
-            for result in results:
-                news_articles.append({
-                    "id": result["id"],
-                    "headline": result["headline"],
-                    "summary": result["summary"],
-                    "datetime": result["datetime"],
-                    "source": result["source"],
-                    "region": result["region"],
-                    "sector": result["sector"],
-                    "source_url": result["url"],
-                    "date_key": result["date_key"]
-                })
-
-        # Create JSON
+        news_articles = [_news_dict(item) for results in all_results.values() for item in results]
+
+        # Create JSON (orjson when installed)
+        os.makedirs(os.path.dirname(json_file), exist_ok=True)
+        write_json(json_file, news_articles)
+
+        logger.info(f"✅ Created JSON file: {json_file} ({len(news_articles)} articles)")
+        return json_file, len(news_articles)
+
+    def create_outputs(self, all_results: Dict[str, List[NewsItem]]) -> Tuple[str, str, int]:
+        """
+        Create both the CSV and the JSON file in a single pass over the results;
+        returns (csv_file, json_file, n_rows)
+        """
+        csv_file = self.config["output"]["csv_file"]
+        json_file = self.config["output"]["json_file"]
+        n_rows = sum(len(results) for results in all_results.values())
+
+        news_articles: List[Dict[str, Any]] = []
+        append = news_articles.append
+
+        def rows():
+            # Each item is visited once: its JSON object is collected while its CSV row is written
+            for results in all_results.values():
+                for item in results:
+                    append(_news_dict(item))
+                    yield _csv_row(item)
+
+        self._write_csv(csv_file, n_rows, rows())
         os.makedirs(os.path.dirname(json_file), exist_ok=True)
+        write_json(json_file, news_articles)
 
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(news_articles, f, indent=2, ensure_ascii=False)
+        logger.info(f"✅ Created CSV file: {csv_file} ({n_rows} articles)")
+        logger.info(f"✅ Created JSON file: {json_file} ({n_rows} articles)")
+        return csv_file, json_file, n_rows
 
-        print(f"✅ Created JSON file: {json_file} ({len(news_articles)} articles)")
-        return json_file
+    async def acreate_outputs(self, all_results: Dict[str, List[NewsItem]]) -> Tuple[str, str, int]:
+        """create_outputs() off the event loop; returns (csv_file, json_file, n_rows)"""
+        return await asyncio.to_thread(self.create_outputs, all_results)
 
     def run_full_search(self) -> Dict[str, Any]:
         """Run complete RAG search pipeline"""
-        print("🚀 Starting RAG news search pipeline...")
+        logger.info("🚀 Starting RAG news search pipeline...")
 
         # Search all sectors
         all_results = self.search_all_sectors()
 
-        # Create output files
-        csv_file = self.create_csv_output(all_results)
-        json_file = self.create_json_output(all_results)
+        # Create output files (the writer reports the article count)
+        csv_file, json_file, n_rows = self.create_outputs(all_results)
+
+        return self._summary(all_results, csv_file, json_file, n_rows)
+
+    async def arun_full_search(self) -> Dict[str, Any]:
+        """run_full_search() for callers already running an event loop"""
+        logger.info("🚀 Starting RAG news search pipeline...")
 
-        # Summary
-        total_articles = sum(len(results) for results in all_results.values())
+        all_results = await self.asearch_all_sectors()
+        csv_file, json_file, n_rows = await self.acreate_outputs(all_results)
 
+        return self._summary(all_results, csv_file, json_file, n_rows)
+
+    @staticmethod
+    def _summary(all_results: Dict[str, List[NewsItem]], csv_file: str, json_file: str,
+                 total_articles: int) -> Dict[str, Any]:
+        # total_articles comes from the writers; per-sector counts are one len() per sector
         return {
             "total_articles": total_articles,
             "sectors_covered": len(all_results),
@@ -270,6 +428,21 @@ class RAGNewsSearch:
         }
 
 
+def configure_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
+    """Plain-message console logging for the CLI, plus an optional size-capped log file"""
+    from logging.handlers import RotatingFileHandler
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers: List[logging.Handler] = [console]
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        file_handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handlers.append(file_handler)
+    logging.basicConfig(level=level.upper(), handlers=handlers)
+
+
 def main():
     """Main function for RAG search"""
     import argparse
@@ -279,13 +452,16 @@ def main():
     parser.add_argument("--sector", help="Search specific sector only")
     parser.add_argument("--output-csv", help="Output CSV file path")
     parser.add_argument("--output-json", help="Output JSON file path")
+    parser.add_argument("--log-level", default="INFO", help="Log level for search progress (e.g. WARNING to silence it)")
+    parser.add_argument("--log-file", help="Also write the log to this file (rotated at 10 MB)")
 
     args = parser.parse_args()
+    configure_logging(args.log_level, args.log_file)
 
     # Initialize RAG search
     rag_search = RAGNewsSearch(args.config)
 
-    if not rag_search.api_client:
+    if not rag_search.api_client and rag_search.local_results is None:
         print("❌ Cannot proceed without RAG API connection")
         return
 
@@ -302,15 +478,13 @@ def main():
         all_results = rag_search.search_all_sectors()
 
     # Create output files
-    csv_file = rag_search.create_csv_output(all_results)
-    json_file = rag_search.create_json_output(all_results)
+    csv_file, json_file, total_articles = rag_search.create_outputs(all_results)
 
     print("\n🎉 RAG search completed!")
     print(f"📄 CSV: {csv_file}")
     print(f"📋 JSON: {json_file}")
 
     # Summary
-    total_articles = sum(len(results) for results in all_results.values())
     print(f"\n📊 Summary: {total_articles} articles across {len(all_results)} sectors")
 
 
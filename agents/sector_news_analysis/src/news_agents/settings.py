@@ -0,0 +1,23 @@
+"""
+Environment settings, read once at import.
+A field is None when its variable is unset, so callers can fall back to config files.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_RAG_BASE_URL = "http://localhost:8000"
+DEFAULT_RAG_ENDPOINT = "/search/cosine/embedding1155d/"
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    # SECTOR_AGENT_RAG_BASE_URL wins over the legacy FINBERT_RAG_BASE_URL
+    rag_base_url: Optional[str] = os.getenv("SECTOR_AGENT_RAG_BASE_URL", os.getenv("FINBERT_RAG_BASE_URL"))
+    rag_endpoint: Optional[str] = os.getenv("SECTOR_AGENT_RAG_ENDPOINT")
+
+
+settings = Settings()
@@ -1,10 +1,14 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional
 from datetime import datetime, timezone
 import math
+import sys
 
-@dataclass
+NEWS_TYPE_MULTIPLIER = {"regulatory":1.2,"earnings":1.1,"legal":1.1,"geopolitical":1.0,"company":1.0,"supplychain":1.0,"M&A":1.0,"sector":0.95,"macro":0.9,"ESG":0.9}
+
+@dataclass(slots=True)
 class NewsItem:
     id: str
     headline: str
@@ -14,8 +18,9 @@ class NewsItem:
     region: str
     sector: Optional[str] = None
     date_key: Optional[str] = None
+    source_url: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class Agent1Record:
     news_id: str
     sector: str
@@ -30,9 +35,26 @@ class Agent1Record:
     attribution_weight: Optional[float] = None
     adjusted_sentiment: Optional[float] = None
     calibration_note: Optional[str] = None
+    # Derived from news_type/sentiment_score in __post_init__; not serialized
+    _type_mult: float = field(init=False, repr=False, compare=False)
+    _mag: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if isinstance(self.news_type, str): self.news_type = sys.intern(self.news_type)
+        self._type_mult = NEWS_TYPE_MULTIPLIER.get(self.news_type, 1.0)
+        self._mag = 0.5 + 0.5 * min(1.0, abs(self.sentiment_score or 0.0)/4.0)
 
+@lru_cache(maxsize=4096)
 def iso_to_datekey(ts: str) -> str:
+    if (len(ts) >= 10 and ts[4] == "-" and ts[7] == "-"
+            and ts[:4].isdigit() and ts[5:7].isdigit() and ts[8:10].isdigit()):
+        return ts[:10]
     return datetime.fromisoformat(ts.replace("Z","+00:00")).date().isoformat()
 
+# exp(-i/7) for whole-day ages 0..3649, keyed so 3 and 3.0 both hit; same expression
+# as the fallback, so values are identical
+_DECAY_7D = {i: math.exp(-i / 7.0) for i in range(3650)}
+
 def recency_decay(age_days: float) -> float:
-    return math.exp(-age_days / 7.0)
+    decay = _DECAY_7D.get(age_days)
+    return math.exp(-age_days / 7.0) if decay is None else decay
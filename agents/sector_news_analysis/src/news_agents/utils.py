@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+from dataclasses import fields, is_dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from pathlib import Path
+from typing import Any, Optional, Union
+import json
 import math
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATE_FMT = "%Y-%m-%d"
 
 
@@ -14,11 +24,11 @@ def iso_to_datekey(iso_str: str) -> str:
     """
     if not iso_str:
         return ""
-    # Common fast-path
+    # Common fast-path (plain index checks beat a compiled regex match here)
     if len(iso_str) >= 10 and iso_str[4] == "-" and iso_str[7] == "-":
         return iso_str[:10]
-    # Fallback split
-    return iso_str.split("T", 1)[0]
+    # Fallback: date part before 'T', without building a split list
+    return iso_str.partition("T")[0]
 
 
 def recency_decay(date_key: str, today: Optional[str] = None, half_life_days: float = 7.0) -> float:
@@ -33,16 +43,75 @@ def recency_decay(date_key: str, today: Optional[str] = None, half_life_days: fl
     except Exception:
         return 1.0  # if bad date, don't penalize
 
+    t = _today(today)
+
+    days = (t - d).days
+    if days <= 0:
+        return 1.0
+    return math.pow(0.5, days / float(half_life_days or 7.0))
+
+
+def recency_decay_vec(date_keys, today: Optional[str] = None, half_life_days: float = 7.0) -> np.ndarray:
+    """
+    recency_decay over many date keys at once: one datetime64 conversion and a
+    vectorized power instead of strptime + pow per key. Same rules as the scalar
+    version (unparseable or future dates weigh 1.0); values agree to the last ulp.
+    """
+    keys = [(k or "")[:10] for k in date_keys]
+    days = np.full(len(keys), np.datetime64("NaT"), dtype="datetime64[D]")
+
+    # Well-formed 'YYYY-MM-DD' keys convert in one call; anything else goes through strptime
+    strict = [i for i, k in enumerate(keys) if len(k) == 10 and k[4] == "-" and k[7] == "-"]
     try:
-        t = (
+        days[strict] = np.array([keys[i] for i in strict], dtype="datetime64[D]")
+        loose = set(range(len(keys))).difference(strict)
+    except ValueError:
+        loose = range(len(keys))
+    for i in loose:
+        try:
+            days[i] = datetime.strptime(keys[i], DATE_FMT).date()
+        except Exception:
+            pass  # stays NaT -> weight 1.0
+
+    delta = (np.datetime64(_today(today), "D") - days).astype("int64")
+    out = np.power(0.5, np.maximum(delta, 0) / float(half_life_days or 7.0))
+    out[np.isnat(days) | (delta <= 0)] = 1.0
+    return out
+
+
+def _today(today: Optional[str]):
+    """Parsed 'YYYY-MM-DD' reference date, or the current UTC date"""
+    try:
+        return (
             datetime.strptime((today or "")[:10], DATE_FMT).date()
             if today
             else datetime.now(timezone.utc).date()
         )
     except Exception:
-        t = datetime.now(timezone.utc).date()
+        return datetime.now(timezone.utc).date()
 
-    days = (t - d).days
-    if days <= 0:
-        return 1.0
-    return math.pow(0.5, days / float(half_life_days or 7.0))
+
+def _json_default(obj: Any) -> Any:
+    # Mirror orjson's dataclass handling: public fields only
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj) if not f.name.startswith("_")}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Parse the JSON file at `path` (orjson when installed)."""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_json(path: Union[str, Path], obj: Any) -> None:
+    """
+    Write `obj` as 2-space indented UTF-8 JSON in a single write.
+    Dataclasses are written as their public fields.
+    Uses orjson when installed, otherwise the stdlib encoder.
+    """
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False, default=_json_default)
@@ -2,6 +2,6 @@
 Configuration package initialization
 """
 
-from .settings import elasticsearch_config, api_config, embedding_config, rag_config
+from .settings import elasticsearch_config, api_config, embedding_config, rag_config, semantic_cache_config
 
-__all__ = ['elasticsearch_config', 'api_config', 'embedding_config', 'rag_config']
+__all__ = ['elasticsearch_config', 'api_config', 'embedding_config', 'rag_config', 'semantic_cache_config']
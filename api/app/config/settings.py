@@ -23,6 +23,9 @@ class ElasticsearchConfig:
         readonly_key_env = os.getenv('ES_READONLY_KEY') or os.getenv('ES_CLOUD_KEY')
         self.readonly_key = readonly_key_env or 'ZzlOZ21aa0JBUXZGb3RVb01rLUY6blBPOVphYmE2MjVTZ1o2eGZWOUpxQQ=='
         self.search_config_index = os.getenv('SEARCH_CONFIG_INDEX', 'finbert-search-configs')
+        # Seconds a worker serves sector configs from memory before re-reading them
+        # (bounds staleness of writes made through other workers)
+        self.search_config_cache_ttl = float(os.getenv('SEARCH_CONFIG_CACHE_TTL', 30))
         
         # Determine if we're connecting to local Docker Elasticsearch
         self.is_local_docker = 'host.docker.internal' in self.host or 'localhost' in self.host
@@ -66,6 +69,12 @@ class EmbeddingConfig:
         self.dim_768d = 768
         self.dim_1155d = 1155  # 384 + 768 + 3 (sentiment)
 
+        # Query embedding cache: in-process LRU size and optional SQLite file
+        # (unset or 'none': memory only); the file keeps at most cache_db_max_rows embeddings
+        self.cache_size = int(os.getenv('EMBEDDING_CACHE_SIZE', 4096))
+        self.cache_db = os.getenv('EMBEDDING_CACHE_DB')
+        self.cache_db_max_rows = int(os.getenv('EMBEDDING_CACHE_DB_MAX_ROWS', 100000))
+
 class RAGConfig:
     """Quality and gating settings for RAG retrieval"""
 
@@ -80,8 +89,22 @@ class RAGConfig:
         self.doc_type_field = os.getenv("DOC_TYPE_FIELD", "doc_type.keyword")
         self.quality_score_field = os.getenv("QUALITY_SCORE_FIELD", "quality_score")
 
+class SemanticCacheConfig:
+    """Redis semantic cache in front of the cosine search endpoints"""
+
+    def __init__(self):
+        # Unset: cache disabled. Needs Redis Stack (RediSearch) for the vector index.
+        self.redis_url = os.getenv("SEMANTIC_CACHE_REDIS_URL")
+        # Minimum cosine similarity between query embeddings for a cached response to be reused
+        self.similarity_threshold = float(os.getenv("CACHE_SIM_THRESHOLD", 0.95))
+        self.ttl_seconds = int(os.getenv("SEMANTIC_CACHE_TTL", 3600))
+        self.key_prefix = os.getenv("SEMANTIC_CACHE_PREFIX", "semcache")
+        # Store cached query embeddings as int8 (4x smaller; needs Redis 8 / RediSearch INT8 vectors)
+        self.quantize = os.getenv("QUANTIZE_CACHE", "0").lower() in ("1", "true", "yes")
+
 # Global configuration instances
 elasticsearch_config = ElasticsearchConfig()
 api_config = APIConfig()
 embedding_config = EmbeddingConfig()
 rag_config = RAGConfig()
+semantic_cache_config = SemanticCacheConfig()
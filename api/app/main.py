@@ -99,6 +99,7 @@ async def startup_event():
 async def shutdown_event():
     """Clean up resources on application shutdown"""
     logger.info("🛑 Shutting down FinBERT News RAG API...")
+    await elasticsearch_service.close()
     logger.info("✅ Shutdown completed")
 
 # Health check for container/load balancer
@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, Field, TypeAdapter
 
+from ..models import SectorNewsResult
 from ..services import search_service as semantic_service
 from ..services.sector_news_service import (
-    _bm25_query, _blend_results, _coerce_base_info, _extract_base_from_hit,
+    _HitTable, _bm25_query, _blend_results, _coerce_base_info, _extract_base_from_hit,
 )
 from ..services.elasticsearch_service import elasticsearch_service
 
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Serializes blended results straight to JSON bytes (no intermediate dicts)
+_RESULTS_JSON = TypeAdapter(List[SectorNewsResult])
+
 
 class SimilarityRequest(BaseModel):
     query: str
@@ -65,11 +70,11 @@ async def similarity_search(payload: SimilarityRequest):
 @router.post("/tags")
 async def tags_search(payload: TagsRequest):
     """BM25-only over provided tags using same ES query helper as sector search."""
-    client = elasticsearch_service.get_client()
+    client = await elasticsearch_service.ensure_async_client()
     try:
         index = payload.source_index or "news_finbert_embeddings*"
         body = _bm25_query(payload.tags_field, payload.tags, size=min(payload.limit * 3, 100))
-        es_resp = client.search(index=index, body=body)
+        es_resp = await client.search(index=index, body=body)
 
         hits = es_resp.get("hits", {}).get("hits", [])
         # Convert to SectorNewsResult-like dicts using the same helpers
@@ -100,37 +105,90 @@ async def tags_search(payload: TagsRequest):
         raise HTTPException(status_code=500, detail=f"Search failed: {exc}") from exc
 
 
+async def _hybrid_sides(payload: HybridRequest) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Semantic results and raw BM25 hits for a hybrid request. The k-NN and BM25
+    searches travel in one _msearch round trip; the semantic side stays
+    best-effort (empty on failure) while a BM25 failure is raised.
+    """
+    searches: List[Tuple[str, Dict[str, Any]]] = []
+    sem_results: List[Dict[str, Any]] = []
+    cache = semantic_service.semantic_cache
+    query_vector = cache_params = None
+    if payload.query:
+        # The query is embedded once; the vector keys the semantic cache
+        # (shared with /search/similarity) and, on a miss, goes into the k-NN body
+        try:
+            query_vector = await asyncio.to_thread(semantic_service.get_query_embedding, payload.query, "768d")
+            indices = payload.source_index or "news_finbert_embeddings*,*processed*,*news*"
+            semantic_limit = min(max(payload.limit * 3, 20), 100)
+            cache_params = semantic_service.semantic_cache_params(
+                semantic_service.embedding_service.get_embedding_field("768d"), semantic_limit, 0.0, indices
+            )
+            cached = await cache.get(payload.query, query_vector, cache_params)
+            if cached is not None:
+                sem_results = cached
+            else:
+                searches.append(
+                    semantic_service.build_knn_body(
+                        payload.query,
+                        "768d",
+                        limit=semantic_limit,
+                        min_score=0.0,
+                        indices=indices,
+                        query_vector=query_vector,
+                    )
+                )
+        except Exception:
+            pass
+    has_semantic = bool(searches)
+    if payload.tags:
+        index = payload.source_index or "news_finbert_embeddings*"
+        searches.append((index, _bm25_query(payload.tags_field, payload.tags, size=min(payload.limit * 3, 100))))
+
+    try:
+        responses = await elasticsearch_service.msearch_async(searches)
+    except Exception:
+        if payload.tags:
+            raise
+        return [], []
+
+    if has_semantic:
+        sem_resp = responses.pop(0)
+        try:
+            sem_results = elasticsearch_service.format_knn_hits(sem_resp)
+            await cache.put(payload.query, query_vector, cache_params, sem_results)
+        except Exception:
+            pass
+
+    bm25_hits: List[Dict[str, Any]] = []
+    if payload.tags:
+        bm25_resp = responses[0]
+        if "error" in bm25_resp:
+            raise RuntimeError(f"BM25 search failed: {bm25_resp['error']}")
+        bm25_hits = bm25_resp.get("hits", {}).get("hits", [])
+    return sem_results, bm25_hits
+
+
 @router.post("/hybrid")
 async def hybrid_search(payload: HybridRequest):
     """Blend semantic + BM25 using the exact blender from sector_news_service."""
     try:
+        sem_results, bm25_hits = await _hybrid_sides(payload)
+
         # Semantic side
-        semantic_hits: Dict[str, Dict[str, Any]] = {}
+        hits = _HitTable()
         semantic_max = 0.0
         if payload.query:
-            try:
-                sem_results = await (
-                    semantic_service.search_with_embedding_768d(
-                        payload.query,
-                        limit=min(max(payload.limit * 3, 20), 100),
-                        min_score=0.0,
-                        indices=payload.source_index or "news_finbert_embeddings*,*processed*,*news*",
-                    )
-                )
-            except Exception:
-                sem_results = []
             for r in sem_results:
                 doc_id = r.get("id")
                 if not doc_id:
                     continue
                 score = r.get("score", 0.0)
-                entry = semantic_hits.setdefault(
-                    doc_id,
-                    {"semantic_score": 0.0, "bm25_score": 0.0, "source": {}, "phrase_matches": set(), "tags_matched": set()},
-                )
-                if score > entry["semantic_score"]:
-                    entry["semantic_score"] = score
-                    entry["source"] = {
+                i = hits.row(doc_id)
+                if score > hits.semantic[i]:
+                    hits.semantic[i] = score
+                    hits.sources[i] = {
                         "title": r.get("title"),
                         "summary": r.get("summary"),
                         "full_text": r.get("full_text"),
@@ -144,28 +202,21 @@ async def hybrid_search(payload: HybridRequest):
         # BM25 side
         bm25_max = 0.0
         if payload.tags:
-            client = elasticsearch_service.get_client()
-            index = payload.source_index or "news_finbert_embeddings*"
-            resp = client.search(index=index, body=_bm25_query(payload.tags_field, payload.tags, size=min(payload.limit * 3, 100)))
-            for hit in resp.get("hits", {}).get("hits", []):
+            for hit in bm25_hits:
                 doc_id = hit.get("_id")
                 if not doc_id:
                     continue
                 score = hit.get("_score", 0.0)
                 base = _extract_base_from_hit(hit)
-                entry = semantic_hits.setdefault(
-                    doc_id,
-                    {"semantic_score": 0.0, "bm25_score": 0.0, "source": base, "phrase_matches": set(), "tags_matched": set()},
-                )
-                entry["bm25_score"] = max(entry["bm25_score"], score)
-                if not entry["source"]:
-                    entry["source"] = base
+                i = hits.row(doc_id, base)
+                hits.bm25[i] = max(hits.bm25[i], score)
+                if not hits.sources[i]:
+                    hits.sources[i] = base
                 bm25_max = max(bm25_max, score)
 
-        # Blend using shared blender
-        blended = _blend_results(semantic_hits, semantic_max, bm25_max, payload.limit, payload.min_score)
-        # Convert pydantic model list to plain dicts if needed
-        return [r.dict() for r in blended]
+        # Blend using shared blender (no sector for ad-hoc queries)
+        blended = _blend_results(hits, semantic_max, bm25_max, payload.limit, payload.min_score, sector="")
+        return Response(content=_RESULTS_JSON.dump_json(blended), media_type="application/json")
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Search failed: {exc}") from exc
 
@@ -34,7 +34,7 @@ async def root():
     }
 
 @router.get("/health", response_model=HealthResponse, summary="Health Check")
-async def health_check():
+def health_check():
     """
     Comprehensive health check for the API and its dependencies
     """
@@ -53,7 +53,7 @@ async def health_check():
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
 @router.get("/stats", response_model=StatsResponse, summary="Cluster Statistics")
-async def get_stats():
+def get_stats():
     """
     Get comprehensive Elasticsearch cluster statistics
     """
@@ -65,7 +65,7 @@ async def get_stats():
         raise HTTPException(status_code=500, detail=f"Failed to retrieve stats: {str(e)}")
 
 @router.post("/search", summary="Legacy Search Endpoint")
-async def legacy_search(query: SearchQuery):
+def legacy_search(query: SearchQuery):
     """
     Legacy search endpoint for backward compatibility.
     Defaults to 384d embedding search.
@@ -82,17 +82,13 @@ async def legacy_search(query: SearchQuery):
         result = search_service.search_with_cosine_similarity(query, "384d")
         
         # Convert to legacy format (list of dictionaries)
-        legacy_results = []
-        for item in result.results:
-            legacy_results.append(item.dict())
-        
-        return legacy_results
+        return [item.model_dump() for item in result.results]
     except Exception as e:
         logger.error(f"Legacy search failed: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 @router.post("/generate_embedding", summary="Legacy Embedding Generation")
-async def legacy_generate_embedding(
+def legacy_generate_embedding(
     text: str = Query(..., description="Text to generate embedding for")
 ):
     """
@@ -117,7 +113,7 @@ async def legacy_generate_embedding(
         raise HTTPException(status_code=500, detail=f"Embedding generation failed: {str(e)}")
 
 @router.get("/debug_search", summary="Debug Search Information")
-async def debug_search():
+def debug_search():
     """
     Debug endpoint to show available search capabilities
     """
@@ -5,6 +5,7 @@ Implements the new API endpoints for different embedding dimensions
 
 import logging
 from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import List
 
 from ..models.schemas import SearchQuery, SearchResponse, EmbeddingResponse
@@ -18,6 +19,16 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+class BatchSearchQuery(BaseModel):
+    """Several queries sharing limit and min_score"""
+    queries: List[str] = Field(..., min_length=1, max_length=100)
+    limit: int = 10
+    min_score: float = 0.5
+
+class BatchSearchResponse(BaseModel):
+    """One SearchResponse per query, in request order"""
+    responses: List[SearchResponse]
+
 @router.post("/cosine/embedding384d/", 
             response_model=SearchResponse,
             summary="Search using 384-dimensional embeddings with cosine similarity")
@@ -110,6 +121,40 @@ async def search_cosine_1155d(query: SearchQuery):
         logger.error(f"1155d enhanced search failed: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+@router.post("/cosine/embedding1155d/batch",
+            response_model=BatchSearchResponse,
+            summary="Search several queries using 1155-dimensional enhanced embeddings in one request")
+async def search_cosine_1155d_batch(batch: BatchSearchQuery):
+    """
+    Batch variant of /cosine/embedding1155d/.
+    
+    All queries are embedded and sent to Elasticsearch as a single _msearch,
+    saving a round trip per query for clients with many keywords.
+    """
+    try:
+        logger.info(f"Processing 1155d enhanced cosine batch search: {len(batch.queries)} queries")
+        
+        results_per_query = await search_service.search_batch_with_embedding_enhanced(
+            queries=batch.queries,
+            limit=batch.limit,
+            min_score=batch.min_score
+        )
+        
+        return BatchSearchResponse(responses=[
+            SearchResponse(
+                results=results,
+                total_hits=len(results),
+                query=query,
+                embedding_field="embedding_enhanced",
+                search_time_ms=0.0  # Will be calculated properly later
+            )
+            for query, results in zip(batch.queries, results_per_query)
+        ])
+        
+    except Exception as e:
+        logger.error(f"1155d enhanced batch search failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
 @router.get("/embedding-compatibility/",
            summary="Get embedding compatibility information")
 async def embedding_compatibility():
@@ -136,6 +181,7 @@ async def embedding_compatibility():
                 },
                 "1155d": {
                     "endpoint": "/search/cosine/embedding1155d/",
+                    "batch_endpoint": "/search/cosine/embedding1155d/batch",
                     "model": "enhanced (384d + 768d + 3d sentiment)",
                     "dimensions": 1155,
                     "description": "Financial-enhanced search with sentiment",
@@ -160,7 +206,8 @@ async def get_model_cache_info():
         cache_info = preloader.get_model_cache_info()
         return {
             "status": "success",
-            "cache_info": cache_info
+            "cache_info": cache_info,
+            "semantic_cache": search_service.semantic_cache.info()
         }
     except Exception as e:
         logger.error(f"Failed to get cache info: {e}")
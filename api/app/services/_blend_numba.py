@@ -0,0 +1,30 @@
+"""
+Hybrid score blend kernel
+Compiled with numba when it is installed, plain numpy otherwise.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# blend_scores(semantic, bm25, semantic_max, bm25_max, semantic_weight, bm25_weight)
+#   -> semantic_weight * semantic / semantic_max + bm25_weight * bm25 / bm25_max
+# Both versions do the same float64 operations in the same order (no fastmath),
+# so scores are bit-identical either way. The numba version is compiled eagerly
+# (and cached on disk) at import, so no request pays the JIT warm-up.
+if HAS_NUMBA:
+    @njit("f8[:](f8[::1], f8[::1], f8, f8, f8, f8)", cache=True)
+    def blend_scores(semantic, bm25, semantic_max, bm25_max, semantic_weight, bm25_weight):
+        out = np.empty_like(semantic)
+        for i in range(semantic.shape[0]):
+            out[i] = semantic_weight * (semantic[i] / semantic_max) + bm25_weight * (bm25[i] / bm25_max)
+        return out
+else:
+    def blend_scores(semantic, bm25, semantic_max, bm25_max, semantic_weight, bm25_weight):
+        return semantic_weight * (semantic / semantic_max) + bm25_weight * (bm25 / bm25_max)
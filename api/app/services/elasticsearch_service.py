@@ -3,10 +3,11 @@ Elasticsearch service layer
 Handles all Elasticsearch operations following Single Responsibility Principle
 """
 
+import asyncio
 import logging
 import base64
 from typing import Optional, List, Dict, Any, Tuple
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
 from elasticsearch.exceptions import ConnectionError, NotFoundError
 
 from ..config import elasticsearch_config, rag_config
@@ -22,6 +23,9 @@ class ElasticsearchService:
     
     def __init__(self):
         self._client: Optional[Elasticsearch] = None
+        self._async_client: Optional[AsyncElasticsearch] = None
+        # Credentials of the authentication method that connected, reused for the async client
+        self._auth_kwargs: Dict[str, Any] = {}
         self._connection_verified = False
         self._mapping_cache: Dict[str, Dict[str, Any]] = {}
     
@@ -40,30 +44,30 @@ class ElasticsearchService:
         
         logger.info(f"🔗 Connecting to Elasticsearch: {config.host}")
         
-        # Try multiple authentication methods
+        # Try multiple authentication methods (each yields client credentials)
         auth_methods = [
-            ("api_key", lambda: Elasticsearch(config.host, api_key=config.api_key, **config.ssl_config)),
+            ("api_key", lambda: {"api_key": config.api_key}),
         ]
         
         # Add basic auth for local Docker if applicable
         if config.is_local_docker:
-            auth_methods.append(("basic_auth", lambda: self._try_basic_auth(config)))
+            auth_methods.append(("basic_auth", lambda: {"basic_auth": ("elastic", "elastic")}))
         
         # Add decoded API key as fallback
-        auth_methods.append(("decoded_api_key", 
-                           lambda: Elasticsearch(config.host, 
-                                               api_key=base64.b64decode(config.api_key).decode('utf-8'), 
-                                               **config.ssl_config)))
+        auth_methods.append(("decoded_api_key",
+                           lambda: {"api_key": base64.b64decode(config.api_key).decode('utf-8')}))
         
-        for method_name, method_func in auth_methods:
+        for method_name, auth_kwargs in auth_methods:
             try:
-                client = method_func()
+                credentials = auth_kwargs()
+                client = Elasticsearch(config.host, **credentials, **config.ssl_config)
                 # Test the connection
                 cluster_info = client.info()
                 logger.info(f"✅ Elasticsearch connected via {method_name}")
                 logger.info(f"   Cluster: {cluster_info.get('cluster_name', 'unknown')}")
                 logger.info(f"   Version: {cluster_info.get('version', {}).get('number', 'unknown')}")
                 self._connection_verified = True
+                self._auth_kwargs = credentials
                 return client
             except Exception as e:
                 logger.warning(f"❌ {method_name} failed: {e}")
@@ -71,24 +75,31 @@ class ElasticsearchService:
         
         raise ConnectionError("Failed to connect to Elasticsearch with any authentication method")
     
-    def _try_basic_auth(self, config) -> Elasticsearch:
-        """Try basic authentication for local Docker setup"""
-        basic_auth_configs = [
-            ("elastic", "elastic"),
-            ("elastic", "changeme"),
-        ]
-        
-        for username, password in basic_auth_configs:
-            try:
-                return Elasticsearch(
-                    config.host,
-                    basic_auth=(username, password),
-                    **config.ssl_config
-                )
-            except:
-                continue
-        
-        raise ConnectionError("Basic auth failed for local Docker")
+    def get_async_client(self) -> AsyncElasticsearch:
+        """
+        AsyncElasticsearch client for the async search paths, created lazily
+        with the credentials the sync client connected with
+        """
+        if self._async_client is None:
+            self.get_client()
+            config = elasticsearch_config
+            self._async_client = AsyncElasticsearch(config.host, **self._auth_kwargs, **config.ssl_config)
+        return self._async_client
+    
+    async def ensure_async_client(self) -> AsyncElasticsearch:
+        """
+        get_async_client() for coroutines: the first call connects the sync
+        client (including its blocking info() probe) in a worker thread
+        """
+        if self._async_client is None:
+            await asyncio.to_thread(self.get_async_client)
+        return self._async_client
+    
+    async def close(self) -> None:
+        """Close the async client's HTTP session"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
     
     def health_check(self) -> Dict[str, Any]:
         """Check Elasticsearch cluster health"""
@@ -253,64 +264,139 @@ class ElasticsearchService:
             List of search results with scores and metadata
         """
         try:
-            client = self.get_client()
-            rag_filters = self.build_rag_filters(indices)
-            
-            # Construct k-NN search body for Elasticsearch 8.x
-            search_body = {
-                "knn": {
-                    "field": field_name,
-                    "query_vector": query_vector,
-                    "k": size,
-                    "num_candidates": size * 5,
-                    **({"filter": {"bool": {"filter": rag_filters}}} if rag_filters else {}),
-                },
-                "size": size,
-                "_source": True
-            }
-            
-            if min_score > 0:
-                search_body["min_score"] = min_score
+            search_body = self.knn_search_body(query_vector, field_name, size, min_score, indices)
             
             # Execute search
-            response = client.search(
+            client = await self.ensure_async_client()
+            response = await client.search(
                 index=indices,
                 body=search_body
             )
             
-            # Parse results
-            results = []
-            for hit in response['hits']['hits']:
-                source = hit['_source']
-                
-                # Convert result to consistent format
-                result = {
-                    "id": hit.get('_id', 'unknown'),
-                    "score": hit.get('_score', 0.0),
-                    "title": source.get('news_title') or source.get('title', 'No title'),
-                    "summary": source.get('news_summary') or source.get('summary', 'No summary available'),
-                    "full_text": source.get('news_body') or source.get('full_text', source.get('content', '')),
-                    "url": source.get('url', ''),
-                    "date": source.get('date') or source.get('published_date', ''),
-                    "published_dt": source.get('published_dt', ''),
-                    "rag_doc_url": f"https://my-elasticsearch-project-a901ed.kb.asia-south1.gcp.elastic.cloud/app/discover#/doc/news_finbert_embeddings/news_finbert_embeddings?id={hit.get('_id', '')}",
-                    "sentiment": source.get('sentiment', {"label": "neutral", "score": 0.0}),
-                    "themes": self._safe_list_conversion(source.get('v2_themes') or source.get('themes', [])),
-                    "organizations": self._safe_list_conversion(source.get('organizations', [])),
-                    "source_index": hit.get('_index', ''),
-                    "companies": source.get('companies'),
-                    "all_tags": source.get('all_tags'),
-                    "fb_sector": source.get('fb_sector'),
-                    "keywords": source.get('keywords'),
-                }
-                results.append(result)
+            return self.format_knn_hits(response)
+            
+        except Exception as e:
+            logger.error(f"k-NN search failed: {e}")
+            raise
+    
+    async def msearch_async(self, searches: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Run several searches in a single _msearch request
+        
+        Args:
+            searches: (indices, search body) pairs
+            
+        Returns:
+            One raw search response per pair, in order; a failed search is an item with an 'error' key
+        """
+        if not searches:
+            return []
+        
+        # ndjson-style header/body pairs
+        body = []
+        for indices, search_body in searches:
+            body.append({"index": indices})
+            body.append(search_body)
+        
+        client = await self.ensure_async_client()
+        response = await client.msearch(searches=body)
+        return response['responses']
+    
+    async def msearch_by_embeddings_async(self,
+                                          query_vectors: List[List[float]],
+                                          field_name: str,
+                                          size: int = 10,
+                                          min_score: float = 0.5,
+                                          indices: str = "news_finbert_embeddings*,*processed*,*news*") -> List[List[Dict[str, Any]]]:
+        """
+        Run one k-NN search per vector in a single _msearch request
+        
+        Args:
+            query_vectors: Embedding vectors to search with
+            field_name: The field containing embeddings (e.g., embedding_384d)
+            size: Number of results per vector
+            min_score: Minimum similarity score
+            indices: Comma-separated list of indices to search
+            
+        Returns:
+            One result list per vector, in order (same format as search_by_embedding_async)
+        """
+        if not query_vectors:
+            return []
+        try:
+            rag_filters = self.build_rag_filters(indices)
+            responses = await self.msearch_async([
+                (indices, self._knn_body(query_vector, field_name, size, min_score, rag_filters))
+                for query_vector in query_vectors
+            ])
             
+            results = []
+            for item in responses:
+                if 'error' in item:
+                    raise RuntimeError(f"msearch item failed: {item['error']}")
+                results.append(self.format_knn_hits(item))
             return results
             
         except Exception as e:
-            logger.error(f"k-NN search failed: {e}")
+            logger.error(f"k-NN multi-search failed: {e}")
             raise
     
+    def knn_search_body(self,
+                        query_vector: List[float],
+                        field_name: str,
+                        size: int = 10,
+                        min_score: float = 0.5,
+                        indices: str = "news_finbert_embeddings*,*processed*,*news*") -> Dict[str, Any]:
+        """k-NN search body (with RAG filters) as sent by search_by_embedding_async, for batching with msearch_async"""
+        return self._knn_body(query_vector, field_name, size, min_score, self.build_rag_filters(indices))
+    
+    @staticmethod
+    def _knn_body(query_vector: List[float], field_name: str, size: int, min_score: float,
+                  rag_filters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """k-NN search body for Elasticsearch 8.x"""
+        search_body = {
+            "knn": {
+                "field": field_name,
+                "query_vector": query_vector,
+                "k": size,
+                "num_candidates": size * 5,
+                **({"filter": {"bool": {"filter": rag_filters}}} if rag_filters else {}),
+            },
+            "size": size,
+            "_source": True
+        }
+        
+        if min_score > 0:
+            search_body["min_score"] = min_score
+        return search_body
+    
+    def format_knn_hits(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a k-NN search response to the consistent result format"""
+        return [self._format_knn_hit(hit) for hit in response['hits']['hits']]
+    
+    def _format_knn_hit(self, hit: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a k-NN hit to the consistent result format"""
+        source = hit['_source']
+        return {
+            "id": hit.get('_id', 'unknown'),
+            "score": hit.get('_score', 0.0),
+            "title": source.get('news_title') or source.get('title', 'No title'),
+            "summary": source.get('news_summary') or source.get('summary', 'No summary available'),
+            "full_text": source.get('news_body') or source.get('full_text', source.get('content', '')),
+            "url": source.get('url', ''),
+            "date": source.get('date') or source.get('published_date', ''),
+            "published_dt": source.get('published_dt', ''),
+            "rag_doc_url": f"https://my-elasticsearch-project-a901ed.kb.asia-south1.gcp.elastic.cloud/app/discover#/doc/news_finbert_embeddings/news_finbert_embeddings?id={hit.get('_id', '')}",
+            "sentiment": source.get('sentiment', {"label": "neutral", "score": 0.0}),
+            "themes": self._safe_list_conversion(source.get('v2_themes') or source.get('themes', [])),
+            "organizations": self._safe_list_conversion(source.get('organizations', [])),
+            "source_index": hit.get('_index', ''),
+            "companies": source.get('companies'),
+            "all_tags": source.get('all_tags'),
+            "fb_sector": source.get('fb_sector'),
+            "keywords": source.get('keywords'),
+        }
+    
     def _safe_list_conversion(self, value) -> List[str]:
         """Convert various types to list of strings safely"""
         if isinstance(value, str):
@@ -0,0 +1,108 @@
+"""
+Content-addressed embedding cache
+In-process LRU in front of an optional SQLite store, keyed by SHA-256 of (model type, text)
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    Cache of float32 embedding vectors
+    Identical texts (e.g. the same sector keyword queried for several sectors)
+    are encoded once; the optional SQLite tier keeps them across restarts and
+    workers, pruned to the db_max_rows most recently stored.
+    """
+
+    def __init__(self, maxsize: int = 4096, db_path: Optional[Union[str, Path]] = None,
+                 db_max_rows: int = 100000):
+        self.maxsize = maxsize
+        self.db_max_rows = db_max_rows
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._open_db(Path(db_path))
+
+    def _open_db(self, db_path: Path) -> None:
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+            logger.info(f"📁 Embedding cache database: {db_path}")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Embedding cache database unavailable ({db_path}): {e}")
+            self._db = None
+
+    @staticmethod
+    def key(model_type: str, text: str) -> bytes:
+        """SHA-256 digest of model type and text"""
+        return hashlib.sha256(f"{model_type}\0{text}".encode("utf-8")).digest()
+
+    def get(self, model_type: str, text: str) -> Optional[np.ndarray]:
+        """
+        Cached embedding or None
+
+        Args:
+            model_type: Type of model (384d, 768d)
+            text: Input text
+
+        Returns:
+            Read-only float32 vector, or None on a miss
+        """
+        key = self.key(model_type, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                return None
+            if row is None:
+                return None
+            vector = np.frombuffer(row[0], dtype=np.float32)
+            self._remember(key, vector)
+            return vector
+
+    def put(self, model_type: str, text: str, vector: np.ndarray) -> np.ndarray:
+        """Store an embedding; returns the cached read-only float32 copy"""
+        key = self.key(model_type, text)
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                                     (key, vector.tobytes()))
+                    # Rowids grow with each insert, so this keeps the newest db_max_rows rows
+                    self._db.execute("DELETE FROM embeddings WHERE rowid <= (SELECT MAX(rowid) FROM embeddings) - ?",
+                                     (self.db_max_rows,))
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+        return vector
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        # Caller holds self._lock
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._memory)
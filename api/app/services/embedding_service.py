@@ -12,6 +12,7 @@ import numpy as np
 from pathlib import Path
 
 from ..config import embedding_config
+from .embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,13 @@ class EmbeddingService:
         os.environ['HF_HOME'] = str(self.cache_dir / "huggingface")
         
         logger.info(f"📁 Model cache directory set to: {self.cache_dir}")
+
+        # Content-addressed cache so repeated texts skip the model forward pass
+        cache_db = embedding_config.cache_db
+        if cache_db is not None and cache_db.lower() in ("", "none"):
+            cache_db = None
+        self._embedding_cache = EmbeddingCache(embedding_config.cache_size, cache_db,
+                                               db_max_rows=embedding_config.cache_db_max_rows)
     
     def _get_model(self, model_type: str) -> SentenceTransformer:
         """
@@ -84,6 +92,25 @@ class EmbeddingService:
             raise ValueError(f"Unsupported model type: {model_type}. Supported: {list(model_map.keys())}")
         
         return model_map[model_type]
+
+    def _encode(self, model_type: str, text: str) -> np.ndarray:
+        """Embedding from the cache, encoding and storing it on a miss"""
+        embedding = self._embedding_cache.get(model_type, text)
+        if embedding is None:
+            model = self._get_model(model_type)
+            embedding = self._embedding_cache.put(model_type, text, model.encode(text, convert_to_numpy=True))
+        return embedding
+    
+    def _encode_batch(self, model_type: str, texts: List[str]) -> List[np.ndarray]:
+        """Embeddings for several texts; cache misses are encoded in one batched model call"""
+        embeddings = [self._embedding_cache.get(model_type, text) for text in texts]
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        if missing:
+            model = self._get_model(model_type)
+            encoded = model.encode(missing, batch_size=64, convert_to_numpy=True)
+            fresh = {text: self._embedding_cache.put(model_type, text, vector) for text, vector in zip(missing, encoded)}
+            embeddings = [fresh[text] if embedding is None else embedding for text, embedding in zip(texts, embeddings)]
+        return embeddings
     
     def generate_embedding_384d(self, text: str) -> List[float]:
         """
@@ -95,9 +122,7 @@ class EmbeddingService:
         Returns:
             384-dimensional embedding vector
         """
-        model = self._get_model('384d')
-        embedding = model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return self._encode('384d', text).tolist()
     
     def generate_embedding_768d(self, text: str) -> List[float]:
         """
@@ -109,9 +134,7 @@ class EmbeddingService:
         Returns:
             768-dimensional embedding vector
         """
-        model = self._get_model('768d')
-        embedding = model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return self._encode('768d', text).tolist()
     
     def generate_embedding_1155d(self, text: str) -> List[float]:
         """
@@ -165,6 +188,29 @@ class EmbeddingService:
         else:
             return [0.33, 0.33, 0.34]  # Default neutral
     
+    def generate_embeddings(self, texts: List[str], model_type: str = "384d") -> List[List[float]]:
+        """
+        Generate embeddings for several texts with one batched forward pass per model
+        
+        Args:
+            texts: Input texts
+            model_type: Type of embedding (384d, 768d, 1155d)
+            
+        Returns:
+            One embedding vector per text, in order
+        """
+        if model_type in ("384d", "768d"):
+            return [embedding.tolist() for embedding in self._encode_batch(model_type, texts)]
+        elif model_type == "1155d":
+            embeddings_384d = self._encode_batch("384d", texts)
+            embeddings_768d = self._encode_batch("768d", texts)
+            return [
+                e384.tolist() + e768.tolist() + self._generate_mock_sentiment(text)
+                for text, e384, e768 in zip(texts, embeddings_384d, embeddings_768d)
+            ]
+        else:
+            raise ValueError(f"Unsupported model type: {model_type}")
+    
     def generate_embedding(self, text: str, model_type: str = "384d") -> Dict[str, Any]:
         """
         Generate embedding for given text and model type
@@ -0,0 +1,32 @@
+"""
+Symmetric int8 quantization of embedding vectors
+Each vector is scaled by 127 / max(|x|), so cosine similarity between
+quantized vectors stays close to that of the float32 originals.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def to_i8(vector: Sequence[float]) -> Tuple[np.ndarray, float]:
+    """
+    Quantize a vector to int8
+
+    Args:
+        vector: Float embedding
+
+    Returns:
+        (int8 vector, scale) where vector ≈ int8 vector * scale
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+    if max_abs == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8), 1.0
+    scale = max_abs / 127.0
+    return np.clip(np.rint(vector / scale), -127, 127).astype(np.int8), scale
+
+
+def from_i8(quantized: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Float32 approximation of a vector quantized with to_i8"""
+    return quantized.astype(np.float32) * np.float32(scale)
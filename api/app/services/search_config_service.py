@@ -4,14 +4,18 @@ Service for managing sector search configurations in Elasticsearch
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from elastic_transport import ObjectApiResponse
 from elasticsearch import NotFoundError
 
 from .elasticsearch_service import elasticsearch_service
+from .embedding_service import embedding_service
 from ..config import elasticsearch_config
 from ..models import (
     SectorConfigCreate,
@@ -21,19 +25,57 @@ from ..models import (
     PhraseRepresentation,
 )
 
+logger = logging.getLogger(__name__)
+
 CONFIG_INDEX = getattr(elasticsearch_config, "search_config_index", "finbert-search-configs")
 MAX_SECTORS = 20
 # Allow larger curated phrase lists per sector (banking/IT datasets exceed 100 entries)
 MAX_PHRASES_PER_SECTOR = 250
+CACHE_TTL_SECONDS = getattr(elasticsearch_config, "search_config_cache_ttl", 30.0)
+
+# Read cache: sector -> (expiry, config) and the sector list. Writes made by this
+# worker replace or drop entries immediately; other workers' writes show up
+# once an entry expires. Writes bump the generation counters so a read that
+# raced a write does not store the config it loaded before the write.
+_config_cache: Dict[str, Tuple[float, SectorConfigResponse]] = {}
+_summaries_cache: Optional[Tuple[float, List[SectorConfigSummary]]] = None
+_config_generation: Dict[str, int] = {}
+_summaries_generation = 0
+# Serializes read-modify-write updates so concurrent edits of a sector are not lost
+_write_lock = threading.RLock()
+_index_ready = False
 
 
 def _get_es_client():
     return elasticsearch_service.get_client()
 
 
+def _bump_generation(sector: str) -> None:
+    global _summaries_cache, _summaries_generation
+    _config_generation[sector] = _config_generation.get(sector, 0) + 1
+    _summaries_generation += 1
+    _summaries_cache = None
+
+
+def _cache_config(config: SectorConfigResponse) -> SectorConfigResponse:
+    """Store a config this worker just wrote; call with ``_write_lock`` held"""
+    _bump_generation(config.sector)
+    _config_cache[config.sector] = (time.monotonic() + CACHE_TTL_SECONDS, config)
+    return config
+
+
+def _evict_config(sector: str) -> None:
+    _bump_generation(sector)
+    _config_cache.pop(sector, None)
+
+
 def _ensure_index() -> None:
+    global _index_ready
+    if _index_ready:
+        return
     client = _get_es_client()
     if client.indices.exists(index=CONFIG_INDEX):
+        _index_ready = True
         return
     mapping = {
         "mappings": {
@@ -61,9 +103,16 @@ def _ensure_index() -> None:
         }
     }
     client.indices.create(index=CONFIG_INDEX, body=mapping)
+    _index_ready = True
 
 
 def list_configs() -> List[SectorConfigSummary]:
+    global _summaries_cache
+    cached = _summaries_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return list(cached[1])
+
+    generation = _summaries_generation
     _ensure_index()
     client = _get_es_client()
     response = client.search(
@@ -89,7 +138,10 @@ def list_configs() -> List[SectorConfigSummary]:
                 updated_at=datetime.fromisoformat(source["updated_at"]),
             )
         )
-    return summaries
+    with _write_lock:
+        if _summaries_generation == generation:
+            _summaries_cache = (time.monotonic() + CACHE_TTL_SECONDS, summaries)
+    return list(summaries)
 
 
 def _load_config(sector: str) -> Dict[str, Any]:
@@ -103,128 +155,152 @@ def _load_config(sector: str) -> Dict[str, Any]:
 
 
 def get_config(sector: str) -> SectorConfigResponse:
-    source = _load_config(sector)
-    return _deserialize_config(source)
+    cached = _config_cache.get(sector)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    generation = _config_generation.get(sector, 0)
+    config = _deserialize_config(_load_config(sector))
+    with _write_lock:
+        if _config_generation.get(sector, 0) == generation:
+            _config_cache[sector] = (time.monotonic() + CACHE_TTL_SECONDS, config)
+    return config
 
 
 def create_config(payload: SectorConfigCreate) -> SectorConfigResponse:
-    _ensure_index()
-    client = _get_es_client()
+    with _write_lock:
+        _ensure_index()
+        client = _get_es_client()
 
-    existing = client.count(index=CONFIG_INDEX)["count"]
-    if existing >= MAX_SECTORS:
-        raise ValueError(f"Cannot create more than {MAX_SECTORS} sector configurations")
-
-    now = datetime.now(timezone.utc)
-    document = {
-        "sector": payload.sector,
-        "index_pattern": payload.index_pattern,
-        "semantic_field": payload.semantic_field,
-        "tags_field": payload.tags_field,
-        "phrases": [],
-        "tags": [],
-        "created_at": now.isoformat(),
-        "updated_at": now.isoformat(),
-    }
-
-    client.index(index=CONFIG_INDEX, id=payload.sector, body=document, refresh="wait_for")
-    return _deserialize_config(document)
+        existing = client.count(index=CONFIG_INDEX)["count"]
+        if existing >= MAX_SECTORS:
+            raise ValueError(f"Cannot create more than {MAX_SECTORS} sector configurations")
 
-
-def update_config(sector: str, payload: SectorConfigUpdate) -> SectorConfigResponse:
-    config = _load_config(sector)
-    config.update(
-        {
+        now = datetime.now(timezone.utc)
+        document = {
+            "sector": payload.sector,
             "index_pattern": payload.index_pattern,
             "semantic_field": payload.semantic_field,
             "tags_field": payload.tags_field,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "phrases": [],
+            "tags": [],
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
         }
-    )
-    _save_config(sector, config)
-    return _deserialize_config(config)
+
+        client.index(index=CONFIG_INDEX, id=payload.sector, body=document, refresh="wait_for")
+        return _cache_config(_deserialize_config(document))
+
+
+def update_config(sector: str, payload: SectorConfigUpdate) -> SectorConfigResponse:
+    with _write_lock:
+        config = _load_config(sector)
+        config.update(
+            {
+                "index_pattern": payload.index_pattern,
+                "semantic_field": payload.semantic_field,
+                "tags_field": payload.tags_field,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        _save_config(sector, config)
+        return _cache_config(_deserialize_config(config))
 
 
 def add_tags(sector: str, tags: List[str]) -> SectorConfigResponse:
-    config = _load_config(sector)
-    existing_tags = set(config.get("tags") or [])
-    updated = existing_tags.union(tags)
-    config["tags"] = sorted(updated)
-    config["updated_at"] = datetime.now(timezone.utc).isoformat()
-    _save_config(sector, config)
-    return _deserialize_config(config)
+    with _write_lock:
+        config = _load_config(sector)
+        existing_tags = set(config.get("tags") or [])
+        updated = existing_tags.union(tags)
+        config["tags"] = sorted(updated)
+        config["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _save_config(sector, config)
+        return _cache_config(_deserialize_config(config))
 
 
 def remove_tag(sector: str, tag: str) -> SectorConfigResponse:
-    config = _load_config(sector)
-    config["tags"] = [t for t in (config.get("tags") or []) if t != tag]
-    config["updated_at"] = datetime.now(timezone.utc).isoformat()
-    _save_config(sector, config)
-    return _deserialize_config(config)
+    with _write_lock:
+        config = _load_config(sector)
+        config["tags"] = [t for t in (config.get("tags") or []) if t != tag]
+        config["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _save_config(sector, config)
+        return _cache_config(_deserialize_config(config))
 
 
 def add_phrases(sector: str, phrases: List[str]) -> SectorConfigResponse:
-    config = _load_config(sector)
-    existing = config.get("phrases") or []
+    with _write_lock:
+        config = _load_config(sector)
+        existing = config.get("phrases") or []
+
+        if len(existing) + len(phrases) > MAX_PHRASES_PER_SECTOR:
+            raise ValueError(f"Cannot store more than {MAX_PHRASES_PER_SECTOR} phrases per sector")
 
-    if len(existing) + len(phrases) > MAX_PHRASES_PER_SECTOR:
-        raise ValueError(f"Cannot store more than {MAX_PHRASES_PER_SECTOR} phrases per sector")
+        for text in phrases:
+            phrase_id = str(uuid.uuid4())
+            phrase_record = _generate_phrase_record(text, config["semantic_field"])
+            phrase_record["id"] = phrase_id
+            phrase_record.setdefault("min_semantic_score", 0.0)
+            existing.append(phrase_record)
 
-    for text in phrases:
-        phrase_id = str(uuid.uuid4())
-        phrase_record = _generate_phrase_record(text, config["semantic_field"])
-        phrase_record["id"] = phrase_id
-        phrase_record.setdefault("min_semantic_score", 0.0)
-        existing.append(phrase_record)
+        config["phrases"] = existing
+        config["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _save_config(sector, config)
+        result = _cache_config(_deserialize_config(config))
 
-    config["phrases"] = existing
-    config["updated_at"] = datetime.now(timezone.utc).isoformat()
-    _save_config(sector, config)
-    return _deserialize_config(config)
+    # Warm the embedding cache outside the lock so other writes are not held up
+    _embed_phrases(phrases, result.semantic_field)
+    return result
 
 
 def update_phrase(sector: str, phrase_id: str, text: str, min_semantic_score: Optional[float] = None) -> SectorConfigResponse:
-    config = _load_config(sector)
-    found = False
-    new_phrases: List[Dict[str, Any]] = []
-    for phrase in config.get("phrases") or []:
-        if phrase["id"] == phrase_id:
-            found = True
-            updated_phrase = _generate_phrase_record(text, config["semantic_field"])
-            updated_phrase["id"] = phrase_id
-            if min_semantic_score is not None:
-                updated_phrase["min_semantic_score"] = float(min_semantic_score)
-            new_phrases.append(updated_phrase)
-        else:
-            new_phrases.append(phrase)
-
-    if not found:
-        raise ValueError(f"Phrase {phrase_id} not found for sector {sector}")
-
-    config["phrases"] = new_phrases
-    config["updated_at"] = datetime.now(timezone.utc).isoformat()
-    _save_config(sector, config)
-    return _deserialize_config(config)
+    with _write_lock:
+        config = _load_config(sector)
+        found = False
+        new_phrases: List[Dict[str, Any]] = []
+        for phrase in config.get("phrases") or []:
+            if phrase["id"] == phrase_id:
+                found = True
+                updated_phrase = _generate_phrase_record(text, config["semantic_field"])
+                updated_phrase["id"] = phrase_id
+                if min_semantic_score is not None:
+                    updated_phrase["min_semantic_score"] = float(min_semantic_score)
+                new_phrases.append(updated_phrase)
+            else:
+                new_phrases.append(phrase)
+
+        if not found:
+            raise ValueError(f"Phrase {phrase_id} not found for sector {sector}")
+
+        config["phrases"] = new_phrases
+        config["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _save_config(sector, config)
+        result = _cache_config(_deserialize_config(config))
+
+    _embed_phrases([text], result.semantic_field)
+    return result
 
 
 def remove_phrase(sector: str, phrase_id: str) -> SectorConfigResponse:
-    config = _load_config(sector)
-    original_count = len(config.get("phrases") or [])
-    config["phrases"] = [p for p in (config.get("phrases") or []) if p["id"] != phrase_id]
-    if len(config["phrases"]) == original_count:
-        raise ValueError(f"Phrase {phrase_id} not found for sector {sector}")
-    config["updated_at"] = datetime.now(timezone.utc).isoformat()
-    _save_config(sector, config)
-    return _deserialize_config(config)
+    with _write_lock:
+        config = _load_config(sector)
+        original_count = len(config.get("phrases") or [])
+        config["phrases"] = [p for p in (config.get("phrases") or []) if p["id"] != phrase_id]
+        if len(config["phrases"]) == original_count:
+            raise ValueError(f"Phrase {phrase_id} not found for sector {sector}")
+        config["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _save_config(sector, config)
+        return _cache_config(_deserialize_config(config))
 
 
 def delete_config(sector: str) -> None:
-    _ensure_index()
-    client = _get_es_client()
-    try:
-        client.delete(index=CONFIG_INDEX, id=sector, refresh="wait_for")
-    except NotFoundError as exc:
-        raise ValueError(f"Sector '{sector}' not found") from exc
+    with _write_lock:
+        _ensure_index()
+        client = _get_es_client()
+        try:
+            client.delete(index=CONFIG_INDEX, id=sector, refresh="wait_for")
+        except NotFoundError as exc:
+            raise ValueError(f"Sector '{sector}' not found") from exc
+        finally:
+            _evict_config(sector)
 
 
 def _generate_phrase_record(text: str, semantic_field: str) -> Dict[str, Any]:
@@ -237,6 +313,14 @@ def _generate_phrase_record(text: str, semantic_field: str) -> Dict[str, Any]:
     }
 
 
+def _embed_phrases(texts: List[str], semantic_field: str) -> None:
+    """Embed phrase texts in one batch so sector searches find them in the embedding cache"""
+    try:
+        embedding_service.generate_embeddings(texts, _resolve_model_type(semantic_field))
+    except Exception as exc:
+        logger.warning(f"Embedding {len(texts)} phrase(s) failed, they will be embedded at search time: {exc}")
+
+
 def _resolve_model_type(semantic_field: str) -> str:
     field_to_model = {
         "embedding_384d": "384d",
@@ -3,13 +3,15 @@ Search service layer
 Orchestrates embedding generation and vector search operations
 """
 
+import asyncio
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from .elasticsearch_service import elasticsearch_service
 from .embedding_service import embedding_service
+from .semantic_cache import semantic_cache
 from ..models.schemas import SearchQuery, SearchResult, SearchResponse
 from ..config import embedding_config
 
@@ -24,6 +26,7 @@ class SearchService:
     def __init__(self):
         self.es_service = elasticsearch_service
         self.embedding_service = embedding_service
+        self.semantic_cache = semantic_cache
     
     async def search_with_embedding_384d(
         self,
@@ -31,6 +34,7 @@ class SearchService:
         limit: int = 10,
         min_score: float = 0.5,
         indices: Optional[str] = None,
+        query_vector: Optional[List[float]] = None,
     ):
         """Search using 384-dimensional embeddings"""
         return await self._search_with_embedding(
@@ -40,6 +44,7 @@ class SearchService:
             limit,
             min_score,
             indices=indices,
+            query_vector=query_vector,
         )
     
     async def search_with_embedding_768d(
@@ -48,6 +53,7 @@ class SearchService:
         limit: int = 10,
         min_score: float = 0.5,
         indices: Optional[str] = None,
+        query_vector: Optional[List[float]] = None,
     ):
         """Search using 768-dimensional embeddings"""
         return await self._search_with_embedding(
@@ -57,6 +63,7 @@ class SearchService:
             limit,
             min_score,
             indices=indices,
+            query_vector=query_vector,
         )
     
     async def search_with_embedding_enhanced(
@@ -65,6 +72,7 @@ class SearchService:
         limit: int = 10,
         min_score: float = 0.5,
         indices: Optional[str] = None,
+        query_vector: Optional[List[float]] = None,
     ):
         """Search using enhanced 1155-dimensional embeddings"""
         return await self._search_with_embedding(
@@ -74,8 +82,68 @@ class SearchService:
             limit,
             min_score,
             indices=indices,
+            query_vector=query_vector,
         )
     
+    async def search_batch_with_embedding_enhanced(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        min_score: float = 0.5,
+        indices: Optional[str] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several queries with enhanced 1155-dimensional embeddings in one multi-search"""
+        try:
+            embeddings = await asyncio.to_thread(self.embedding_service.generate_embeddings, queries, "1155d")
+            return await self.es_service.msearch_by_embeddings_async(
+                query_vectors=embeddings,
+                field_name="embedding_enhanced",
+                size=limit,
+                min_score=min_score,
+                indices=indices or "news_finbert_embeddings*,*processed*,*news*",
+            )
+        except Exception as e:
+            logger.error(f"Batch search failed for 1155d: {e}")
+            raise
+    
+    def build_knn_body(
+        self,
+        query: str,
+        model_type: str = "768d",
+        limit: int = 10,
+        min_score: float = 0.5,
+        indices: Optional[str] = None,
+        query_vector: Optional[List[float]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Indices and k-NN search body that search_with_embedding_<model_type> would send,
+        without running it, so callers can batch it with other searches (msearch_async)
+        """
+        indices = indices or "news_finbert_embeddings*,*processed*,*news*"
+        embedding = query_vector if query_vector is not None else self.get_query_embedding(query, model_type)
+        field_name = self.embedding_service.get_embedding_field(model_type)
+        return indices, self.es_service.knn_search_body(embedding, field_name, limit, min_score, indices)
+    
+    @staticmethod
+    def semantic_cache_params(field_name: str, limit: int, min_score: float, indices: str) -> Dict[str, Any]:
+        """Search parameters a semantic cache entry is keyed on"""
+        return {"field": field_name, "limit": limit, "min_score": min_score, "indices": indices}
+    
+    def get_query_embedding(self, query: str, model_type: str) -> List[float]:
+        """
+        Query embedding for a model type
+        Compute it once per request and pass it on as query_vector; repeated
+        texts are served by the embedding service's cache.
+        """
+        if model_type == "384d":
+            return self.embedding_service.generate_embedding_384d(query)
+        elif model_type == "768d":
+            return self.embedding_service.generate_embedding_768d(query)
+        elif model_type == "1155d":
+            return self.embedding_service.generate_embedding_1155d(query)
+        else:
+            raise ValueError(f"Unsupported model type: {model_type}")
+    
     async def _search_with_embedding(
         self,
         query: str,
@@ -85,18 +153,22 @@ class SearchService:
         min_score: float,
         *,
         indices: Optional[str] = None,
+        query_vector: Optional[List[float]] = None,
     ):
         """Internal method to perform embedding-based search"""
         try:
-            # Generate embedding for query
-            if model_type == "384d":
-                embedding = self.embedding_service.generate_embedding_384d(query)
-            elif model_type == "768d":
-                embedding = self.embedding_service.generate_embedding_768d(query)
-            elif model_type == "1155d":
-                embedding = self.embedding_service.generate_embedding_1155d(query)
-            else:
-                raise ValueError(f"Unsupported model type: {model_type}")
+            # Generate embedding for query unless the caller already has it;
+            # model inference runs in a worker thread to keep the event loop free
+            embedding = query_vector
+            if embedding is None:
+                embedding = await asyncio.to_thread(self.get_query_embedding, query, model_type)
+            indices = indices or "news_finbert_embeddings*,*processed*,*news*"
+            
+            # Reuse the results of the same or a near-identical earlier query
+            cache_params = self.semantic_cache_params(field_name, limit, min_score, indices)
+            cached = await self.semantic_cache.get(query, embedding, cache_params)
+            if cached is not None:
+                return cached
             
             # Perform Elasticsearch k-NN search
             results = await self.es_service.search_by_embedding_async(
@@ -104,9 +176,10 @@ class SearchService:
                 field_name=field_name,
                 size=limit,
                 min_score=min_score,
-                indices=indices or "news_finbert_embeddings*,*processed*,*news*",
+                indices=indices,
             )
             
+            await self.semantic_cache.put(query, embedding, cache_params, results)
             return results
             
         except Exception as e:
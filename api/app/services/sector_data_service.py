@@ -126,7 +126,7 @@ async def search_sector_data(
     news_elapsed = news_resp.search_duration_ms
 
     # Query Elasticsearch for market data
-    client = elasticsearch_service.get_client()
+    client = await elasticsearch_service.ensure_async_client()
     es_index = "sector_market_data"
     # Build ES query: match sector. Don't require a top-level `date` field
     # because many documents store time-series inside `last_window_data`.
@@ -149,12 +149,12 @@ async def search_sector_data(
     # Use a flexible index pattern in case the index is suffixed or aliased
     index_pattern = "sector_market_data*"
     try:
-        resp = client.search(index=index_pattern, body=body)
+        resp = await client.search(index=index_pattern, body=body)
     except Exception:
         # As a last resort try a simple match query without keyword/term
         try:
             fallback = {"query": {"match": {"sector": market_sector}}, "size": 20}
-            resp = client.search(index=index_pattern, body=fallback)
+            resp = await client.search(index=index_pattern, body=fallback)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=f"Market data query failed: {exc}")
 
@@ -218,8 +218,8 @@ async def search_sector_data(
 
     result = {
         "sector": sector_name_clean,
-        "config_summary": news_resp.config_summary.dict() if hasattr(news_resp, "config_summary") else {},
-        "news_results": [r.dict() for r in getattr(news_resp, "results", [])],
+        "config_summary": news_resp.config_summary.model_dump() if hasattr(news_resp, "config_summary") else {},
+        "news_results": [r.model_dump() for r in getattr(news_resp, "results", [])],
         "market_data": market_data,
         "total_hits": getattr(news_resp, "total_hits", len(getattr(news_resp, "results", []))),
         "market_data_days": len(price_history),
@@ -4,18 +4,26 @@ Sector news retrieval service leveraging hybrid search
 
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Set
 
+import numpy as np
 from elasticsearch import NotFoundError
 
+from ._blend_numba import blend_scores
 from .elasticsearch_service import elasticsearch_service, build_rag_filters
 from .search_service import search_service
 from .search_config_service import get_config
 from ..models import SectorNewsResult, SectorNewsResponse, SectorNewsQueryInfo
 
 
+# Blend weights for the max-normalized semantic and BM25 scores
+SEMANTIC_WEIGHT = 0.7
+BM25_WEIGHT = 0.3
+
+
 async def search_sector_news(
     sector: str,
     *,
@@ -29,24 +37,33 @@ async def search_sector_news(
     if limit <= 0:
         raise ValueError("limit must be positive")
 
-    config = get_config(sector)
-    client = elasticsearch_service.get_client()
+    config = await asyncio.to_thread(get_config, sector)
+    client = await elasticsearch_service.ensure_async_client()
     date_from_dt = _parse_datetime(date_from) if date_from else None
     date_to_dt = _parse_datetime(date_to) if date_to else None
 
     start_time = time.perf_counter()
 
-    semantic_hits: Dict[str, Dict] = {}
+    hits = _HitTable()
     semantic_max = 0.0
     phrase_texts: List[str] = []
 
-    semantic_search_fn = _resolve_semantic_search_fn(config.semantic_field)
+    semantic_search_fn, model_type = _resolve_semantic_search_fn(config.semantic_field)
     semantic_search_limit = min(max(limit * 3, 20), 100)
 
+    # Embed all ready phrases in one batched model call (None: embed per phrase)
+    ready_phrases = [phrase for phrase in config.phrases if phrase.status == "ready"]
+    try:
+        phrase_vectors = await asyncio.to_thread(
+            search_service.embedding_service.generate_embeddings,
+            [phrase.text for phrase in ready_phrases],
+            model_type,
+        )
+    except Exception:
+        phrase_vectors = [None] * len(ready_phrases)
+
     # Semantic search per phrase
-    for phrase in config.phrases:
-        if phrase.status != "ready":
-            continue
+    for phrase, phrase_vector in zip(ready_phrases, phrase_vectors):
         phrase_texts.append(phrase.text)
         try:
             results = await semantic_search_fn(
@@ -54,6 +71,7 @@ async def search_sector_news(
                 limit=semantic_search_limit,
                 min_score=0.0,
                 indices=config.index_pattern,
+                query_vector=phrase_vector,
             )
         except Exception:
             continue
@@ -72,27 +90,18 @@ async def search_sector_news(
                 min_thr = None
             if min_thr is not None and score < float(min_thr):
                 continue
-            entry = semantic_hits.setdefault(
-                doc_id,
-                {
-                    "semantic_score": 0.0,
-                    "bm25_score": 0.0,
-                    "source": {},
-                    "phrase_matches": set(),
-                    "tags_matched": set(),
-                },
-            )
-            if score > entry["semantic_score"]:
-                entry["semantic_score"] = score
-                entry["source"] = _extract_base_from_result(result)
-            entry["phrase_matches"].add(phrase.text)
+            i = hits.row(doc_id)
+            if score > hits.semantic[i]:
+                hits.semantic[i] = score
+                hits.sources[i] = _extract_base_from_result(result)
+            hits.add_phrase(i, phrase.text)
             semantic_max = max(semantic_max, score)
 
     # Keyword search using tags
     bm25_max = 0.0
     if config.tags:
         try:
-            response = client.search(
+            response = await client.search(
                 index=config.index_pattern,
                 body=_bm25_query(
                     config.tags_field,
@@ -112,24 +121,15 @@ async def search_sector_news(
             base_info = _extract_base_from_hit(hit)
             if not _within_date_range(base_info, date_from_dt, date_to_dt):
                 continue
-            entry = semantic_hits.setdefault(
-                doc_id,
-                {
-                    "semantic_score": 0.0,
-                    "bm25_score": 0.0,
-                    "source": base_info,
-                    "phrase_matches": set(),
-                    "tags_matched": set(),
-                },
-            )
-            entry["bm25_score"] = max(entry["bm25_score"], score)
-            entry["tags_matched"].update(_infer_tags(hit, config.tags_field, config.tags))
-            if not entry["source"]:
-                entry["source"] = base_info
+            i = hits.row(doc_id, base_info)
+            hits.bm25[i] = max(hits.bm25[i], score)
+            hits.add_tags(i, _infer_tags(hit, config.tags_field, config.tags))
+            if not hits.sources[i]:
+                hits.sources[i] = base_info
             bm25_max = max(bm25_max, score)
 
     results = _blend_results(
-        semantic_hits,
+        hits,
         semantic_max,
         bm25_max,
         limit,
@@ -189,8 +189,61 @@ def _infer_tags(hit: Dict, field: str, candidate_tags: List[str]) -> Set[str]:
     return tags_present
 
 
+class _HitTable:
+    """
+    Hybrid search candidates as parallel columns with a doc id -> row index.
+    Scores are plain float lists (cheap single-element updates while merging)
+    that the blend turns into contiguous arrays once. Phrase/tag sets are only
+    created for rows that get one.
+    """
+
+    __slots__ = ("ids", "index", "semantic", "bm25", "sources", "phrase_matches", "tags_matched")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.semantic: List[float] = []
+        self.bm25: List[float] = []
+        self.sources: List[Dict] = []
+        self.phrase_matches: List[Optional[Set[str]]] = []
+        self.tags_matched: List[Optional[Set[str]]] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, doc_id: str, source: Optional[Dict] = None) -> int:
+        """Row of `doc_id`, appended with zero scores (and `source`, or {}) on first sight"""
+        i = self.index.get(doc_id)
+        if i is None:
+            i = len(self.ids)
+            self.index[doc_id] = i
+            self.ids.append(doc_id)
+            self.semantic.append(0.0)
+            self.bm25.append(0.0)
+            self.sources.append(source if source is not None else {})
+            self.phrase_matches.append(None)
+            self.tags_matched.append(None)
+        return i
+
+    def add_phrase(self, i: int, phrase: str) -> None:
+        matches = self.phrase_matches[i]
+        if matches is None:
+            self.phrase_matches[i] = {phrase}
+        else:
+            matches.add(phrase)
+
+    def add_tags(self, i: int, tags: Set[str]) -> None:
+        if not tags:
+            return
+        matched = self.tags_matched[i]
+        if matched is None:
+            self.tags_matched[i] = set(tags)
+        else:
+            matched.update(tags)
+
+
 def _blend_results(
-    doc_hits: Dict[str, Dict],
+    hits: _HitTable,
     semantic_max: float,
     bm25_max: float,
     limit: int,
@@ -198,29 +251,40 @@ def _blend_results(
     *,
     sector: str,
 ) -> List[SectorNewsResult]:
-    results: List[SectorNewsResult] = []
-
     semantic_max = semantic_max or 1.0
     bm25_max = bm25_max or 1.0
 
-    for doc_id, data in doc_hits.items():
-        base = _coerce_base_info(data.get("source"))
-        semantic_score = data.get("semantic_score", 0.0)
-        bm25_score = data.get("bm25_score", 0.0)
+    # Blend, threshold and rank on the score columns; result models are only
+    # built for the hits that are returned
+    semantic_scores = np.array(hits.semantic, dtype=np.float64)
+    bm25_scores = np.array(hits.bm25, dtype=np.float64)
+
+    final_scores = blend_scores(semantic_scores, bm25_scores, float(semantic_max), float(bm25_max),
+                                SEMANTIC_WEIGHT, BM25_WEIGHT)
+
+    if min_score is not None:
+        candidates = np.flatnonzero(final_scores >= min_score)
+    else:
+        candidates = np.arange(len(hits))
+    scores = final_scores[candidates]
+    if limit < len(candidates):
+        # Only the top `limit` need ordering: keep the hits scoring at least the
+        # limit-th best (all ties included, so the ranking below is unchanged)
+        kth = len(scores) - limit
+        keep = scores >= np.partition(scores, kth)[kth]
+        candidates, scores = candidates[keep], scores[keep]
+    # Stable, so equal scores keep their hit order
+    ranked = candidates[np.argsort(-scores, kind="stable")][:limit]
 
-        semantic_norm = semantic_score / semantic_max if semantic_max else 0.0
-        bm25_norm = bm25_score / bm25_max if bm25_max else 0.0
-
-        final_score = 0.7 * semantic_norm + 0.3 * bm25_norm
-
-        if min_score is not None and final_score < min_score:
-            continue
+    results: List[SectorNewsResult] = []
+    for i in ranked.tolist():
+        base = _coerce_base_info(hits.sources[i])
 
         result = SectorNewsResult(
-            news_id=doc_id,
-            score=final_score,
-            semantic_score=semantic_score,
-            bm25_score=bm25_score,
+            news_id=hits.ids[i],
+            score=float(final_scores[i]),
+            semantic_score=hits.semantic[i],
+            bm25_score=hits.bm25[i],
             headline=base.get("title"),
             summary=base.get("summary"),
             body=base.get("full_text"),
@@ -229,8 +293,8 @@ def _blend_results(
             published_dt=base.get("published_dt"),
             sector=sector,
             source_index=base.get("source_index"),
-            tags_matched=sorted(data.get("tags_matched") or []),
-            phrase_matches=sorted(data.get("phrase_matches") or []),
+            tags_matched=sorted(hits.tags_matched[i] or []),
+            phrase_matches=sorted(hits.phrase_matches[i] or []),
             companies=base.get("companies"),
             all_tags=base.get("all_tags"),
             fb_sector=base.get("fb_sector"),
@@ -238,8 +302,7 @@ def _blend_results(
         )
         results.append(result)
 
-    results.sort(key=lambda r: r.score, reverse=True)
-    return results[:limit]
+    return results
 
 
 def _extract_base_from_result(result: Dict) -> Dict:
@@ -327,9 +390,10 @@ def _within_date_range(entry: Dict, date_from: Optional[datetime], date_to: Opti
 
 
 def _resolve_semantic_search_fn(semantic_field: str):
+    """Search function and embedding model type for a semantic field"""
     mapping = {
-        "embedding_384d": search_service.search_with_embedding_384d,
-        "embedding_768d": search_service.search_with_embedding_768d,
-        "embedding_enhanced": search_service.search_with_embedding_enhanced,
+        "embedding_384d": (search_service.search_with_embedding_384d, "384d"),
+        "embedding_768d": (search_service.search_with_embedding_768d, "768d"),
+        "embedding_enhanced": (search_service.search_with_embedding_enhanced, "1155d"),
     }
-    return mapping.get(semantic_field, search_service.search_with_embedding_768d)
+    return mapping.get(semantic_field, (search_service.search_with_embedding_768d, "768d"))
@@ -0,0 +1,185 @@
+"""
+Redis semantic cache for vector search results
+A query whose embedding is close enough to an already answered one reuses that
+answer instead of running another Elasticsearch k-NN search.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..config import semantic_cache_config
+from .quantize import to_i8
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    redis = aioredis = None
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+# Seconds without Redis calls after an error, so an outage costs one timeout, not one per request
+RETRY_AFTER_SECONDS = 30.0
+
+
+class SemanticCache:
+    """
+    Search results stored as Redis hashes with a RediSearch HNSW (cosine) index per embedding dimension
+    A lookup tries the exact prompt first, then the nearest cached query embedding
+    with identical search parameters. Redis is reached through redis.asyncio, so
+    lookups never block the event loop; errors are logged and count as misses.
+    With config.quantize the embeddings are stored and searched as int8 in their
+    own key space and index, so float32 and int8 entries never share an index.
+    """
+
+    def __init__(self, config=semantic_cache_config):
+        self.config = config
+        self.enabled = bool(config.redis_url) and HAS_REDIS
+        self._vector_type = "INT8" if config.quantize else "FLOAT32"
+        if config.redis_url and not HAS_REDIS:
+            logger.warning("SEMANTIC_CACHE_REDIS_URL is set but redis is not installed; semantic cache disabled")
+        self._client = None
+        self._indexed_dims = set()
+        self._retry_at = 0.0
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "errors": 0}
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(self.config.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            logger.info("🧠 Semantic cache enabled (Redis)")
+        return self._client
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._retry_at
+
+    def _failed(self, error: Exception) -> None:
+        self.stats["errors"] += 1
+        self._retry_at = time.monotonic() + RETRY_AFTER_SECONDS
+        logger.warning(f"Semantic cache unavailable for {RETRY_AFTER_SECONDS:.0f}s: {error}")
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+    def _space(self, dim: int) -> str:
+        return f"{dim}i8" if self.config.quantize else str(dim)
+
+    def _index_name(self, dim: int) -> str:
+        return f"{self.config.key_prefix}:idx:{self._space(dim)}"
+
+    def _key(self, dim: int, params_hash: str, prompt_hash: str) -> str:
+        return f"{self.config.key_prefix}:{self._space(dim)}:{params_hash}:{prompt_hash}"
+
+    async def _ensure_index(self, client, dim: int) -> None:
+        if dim in self._indexed_dims:
+            return
+        try:
+            await client.execute_command(
+                "FT.CREATE", self._index_name(dim), "ON", "HASH",
+                "PREFIX", "1", f"{self.config.key_prefix}:{self._space(dim)}:",
+                "SCHEMA",
+                "params", "TAG",
+                "embedding", "VECTOR", "HNSW", "6", "TYPE", self._vector_type, "DIM", str(dim), "DISTANCE_METRIC", "COSINE",
+            )
+        except redis.ResponseError as e:
+            if "already exists" not in str(e).lower():
+                raise
+        self._indexed_dims.add(dim)
+
+    def _prepare(self, query: str, embedding: Sequence[float], params: Dict[str, Any]):
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self.config.quantize:
+            vector = to_i8(vector)[0]
+        params_hash = self._digest(json.dumps(params, sort_keys=True))
+        return vector, len(vector), params_hash, self._digest(query)
+
+    async def get(self, query: str, embedding: Sequence[float], params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Cached response for a query or None
+
+        Args:
+            query: Query text (exact-match fast path)
+            embedding: Query embedding
+            params: Search parameters the response depends on (field, limit, min_score, indices)
+
+        Returns:
+            The stored response, or None on a miss
+        """
+        if not self._available():
+            return None
+        vector, dim, params_hash, prompt_hash = self._prepare(query, embedding, params)
+        try:
+            client = self._get_client()
+            cached = await client.hget(self._key(dim, params_hash, prompt_hash), "response")
+            if cached is not None:
+                self.stats["exact_hits"] += 1
+                return json.loads(cached)
+
+            await self._ensure_index(client, dim)
+            reply = await client.execute_command(
+                "FT.SEARCH", self._index_name(dim),
+                f"(@params:{{{params_hash}}})=>[KNN 1 @embedding $vec AS distance]",
+                "PARAMS", "2", "vec", vector.tobytes(),
+                "RETURN", "2", "distance", "response",
+                "DIALECT", "2",
+            )
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+
+        # [total, key, [field, value, ...]]; distance is 1 - cosine similarity
+        if len(reply) >= 3:
+            fields = dict(zip(reply[2][::2], reply[2][1::2]))
+            response = fields.get(b"response")
+            if response is not None and 1.0 - float(fields.get(b"distance", 2.0)) >= self.config.similarity_threshold:
+                self.stats["semantic_hits"] += 1
+                return json.loads(response)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, query: str, embedding: Sequence[float], params: Dict[str, Any], response: Any) -> None:
+        """Store a JSON-serializable response for a query (expires after the configured TTL)"""
+        if not self._available():
+            return
+        vector, dim, params_hash, prompt_hash = self._prepare(query, embedding, params)
+        key = self._key(dim, params_hash, prompt_hash)
+        try:
+            client = self._get_client()
+            await self._ensure_index(client, dim)
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(key, mapping={
+                "embedding": vector.tobytes(),
+                "params": params_hash,
+                "prompt_hash": prompt_hash,
+                "response": json.dumps(response, default=str),
+            })
+            if self.config.ttl_seconds > 0:
+                pipe.expire(key, self.config.ttl_seconds)
+            await pipe.execute()
+        except redis.RedisError as e:
+            self._failed(e)
+
+    def info(self) -> Dict[str, Any]:
+        """Configuration and hit/miss counters"""
+        lookups = self.stats["exact_hits"] + self.stats["semantic_hits"] + self.stats["misses"]
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        return {
+            "enabled": self.enabled,
+            "vector_type": self._vector_type,
+            "similarity_threshold": self.config.similarity_threshold,
+            "ttl_seconds": self.config.ttl_seconds,
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+# Global cache instance
+semantic_cache = SemanticCache()
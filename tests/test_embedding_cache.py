@@ -0,0 +1,59 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from api.app.services.embedding_cache import EmbeddingCache
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    def test_get_returns_stored_read_only_float32_vector(self):
+        cache = EmbeddingCache(maxsize=4)
+        cache.put("384d", "bank credit", [0.5, 0.25])
+
+        vector = cache.get("384d", "bank credit")
+        self.assertEqual(vector.dtype, np.float32)
+        np.testing.assert_array_equal(vector, [0.5, 0.25])
+        self.assertFalse(vector.flags.writeable)
+        self.assertIsNone(cache.get("768d", "bank credit"))
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = EmbeddingCache(maxsize=2)
+        cache.put("384d", "a", [1.0])
+        cache.put("384d", "b", [2.0])
+        cache.get("384d", "a")  # b is now least recently used
+        cache.put("384d", "c", [3.0])
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("384d", "b"))
+        self.assertIsNotNone(cache.get("384d", "a"))
+
+    def test_sqlite_tier_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "embeddings.sqlite"
+            EmbeddingCache(maxsize=1, db_path=db_path).put("768d", "oil prices", [1.0, 2.0])
+
+            reopened = EmbeddingCache(maxsize=1, db_path=db_path)
+            np.testing.assert_array_equal(reopened.get("768d", "oil prices"), [1.0, 2.0])
+            reopened._db.close()
+
+    def test_sqlite_tier_keeps_only_newest_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "embeddings.sqlite"
+            cache = EmbeddingCache(maxsize=1, db_path=db_path, db_max_rows=3)
+            for i in range(5):
+                cache.put("384d", f"text {i}", [float(i)])
+            cache._db.close()
+
+            with sqlite3.connect(str(db_path)) as db:
+                self.assertEqual(db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0], 3)
+            reopened = EmbeddingCache(maxsize=1, db_path=db_path, db_max_rows=3)
+            self.assertIsNone(reopened.get("384d", "text 0"))
+            np.testing.assert_array_equal(reopened.get("384d", "text 4"), [4.0])
+            reopened._db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
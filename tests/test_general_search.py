@@ -0,0 +1,158 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from api.app.routers import general_search
+from api.app.services.elasticsearch_service import ElasticsearchService
+from api.app.services.search_service import SearchService
+
+
+class _FakeCache:
+    def __init__(self, cached=None):
+        self.cached = cached
+        self.puts = []
+
+    async def get(self, query, vector, params):
+        return self.cached
+
+    async def put(self, query, vector, params, results):
+        self.puts.append((query, vector, params, results))
+
+
+class _FakeES:
+    """msearch_async answered from canned responses; hit formatting is the real one"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+        self.format_knn_hits = ElasticsearchService().format_knn_hits
+
+    async def msearch_async(self, searches):
+        self.calls.append(searches)
+        return [self.responses[body.get("_kind", "bm25")] for _, body in searches]
+
+
+def _semantic_service(cache, embedded):
+    def get_query_embedding(query, model_type):
+        embedded.append((query, model_type))
+        return [0.1, 0.2, 0.3]
+
+    return SimpleNamespace(
+        semantic_cache=cache,
+        semantic_cache_params=SearchService.semantic_cache_params,
+        embedding_service=SimpleNamespace(get_embedding_field=lambda model_type: f"embedding_{model_type}"),
+        get_query_embedding=get_query_embedding,
+        build_knn_body=lambda query, model_type, **kwargs: (kwargs["indices"], {"_kind": "knn", **kwargs}),
+    )
+
+
+def _hit(doc_id, score, title):
+    return {"_id": doc_id, "_score": score, "_index": "news", "_source": {"title": title}}
+
+
+SEMANTIC_RESPONSE = {"hits": {"hits": [_hit("doc1", 0.9, "Doc 1"), _hit("doc2", 0.6, "Doc 2")]}}
+BM25_RESPONSE = {"hits": {"hits": [_hit("doc2", 4.0, "Doc 2"), _hit("doc3", 2.0, "Doc 3")]}}
+
+
+class HybridSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.embedded = []
+
+    def run_search(self, es, cache=None, **payload):
+        cache = cache or _FakeCache()
+        with mock.patch.object(general_search, "elasticsearch_service", es), \
+                mock.patch.object(general_search, "semantic_service", _semantic_service(cache, self.embedded)):
+            return asyncio.run(general_search.hybrid_search(general_search.HybridRequest(**payload)))
+
+    def test_blends_semantic_and_bm25_hits(self):
+        es = _FakeES({"knn": SEMANTIC_RESPONSE, "bm25": BM25_RESPONSE})
+
+        response = self.run_search(es, query="bank credit", tags=["banking"], limit=3)
+
+        results = json.loads(response.body)
+        # doc2: 0.7 * 0.6/0.9 + 0.3 * 4/4, doc1: 0.7 * 1, doc3: 0.3 * 2/4
+        self.assertEqual([r["news_id"] for r in results], ["doc2", "doc1", "doc3"])
+        self.assertAlmostEqual(results[0]["score"], 0.7 * 0.6 / 0.9 + 0.3)
+        self.assertEqual(results[1]["headline"], "Doc 1")
+        self.assertEqual(results[2]["semantic_score"], 0.0)
+        self.assertEqual(results[2]["bm25_score"], 2.0)
+
+    def test_limit_and_min_score(self):
+        es = _FakeES({"knn": SEMANTIC_RESPONSE, "bm25": BM25_RESPONSE})
+
+        response = self.run_search(es, query="bank credit", tags=["banking"], limit=3, min_score=0.5)
+
+        self.assertEqual([r["news_id"] for r in json.loads(response.body)], ["doc2", "doc1"])
+
+    def test_response_is_serialized_result_models(self):
+        es = _FakeES({"knn": SEMANTIC_RESPONSE, "bm25": BM25_RESPONSE})
+
+        response = self.run_search(es, query="bank credit", tags=["banking"])
+
+        self.assertEqual(response.media_type, "application/json")
+        self.assertIsInstance(response.body, bytes)
+        models = general_search._RESULTS_JSON.validate_json(response.body)
+        self.assertEqual(general_search._RESULTS_JSON.dump_json(models), response.body)
+        self.assertEqual(json.loads(response.body)[0]["tags_matched"], [])
+        self.assertEqual(json.loads(response.body)[0]["sector"], "")
+
+    def test_no_hits_returns_empty_json_list(self):
+        es = _FakeES({"bm25": {"hits": {"hits": []}}})
+
+        response = self.run_search(es, tags=["banking"])
+
+        self.assertEqual(response.body, b"[]")
+
+    def test_knn_and_bm25_share_one_msearch(self):
+        es = _FakeES({"knn": SEMANTIC_RESPONSE, "bm25": BM25_RESPONSE})
+
+        self.run_search(es, query="bank credit", tags=["banking"], source_index="news")
+
+        (searches,) = es.calls
+        self.assertEqual([index for index, _ in searches], ["news", "news"])
+        self.assertEqual(searches[0][1]["_kind"], "knn")
+        self.assertNotIn("_kind", searches[1][1])
+
+    def test_failed_knn_search_falls_back_to_bm25(self):
+        es = _FakeES({"knn": {"error": {"type": "search_phase_execution_exception"}}, "bm25": BM25_RESPONSE})
+
+        response = self.run_search(es, query="bank credit", tags=["banking"])
+
+        self.assertEqual([r["news_id"] for r in json.loads(response.body)], ["doc2", "doc3"])
+
+    def test_failed_bm25_search_is_an_error(self):
+        es = _FakeES({"knn": SEMANTIC_RESPONSE, "bm25": {"error": {"type": "index_not_found_exception"}}})
+
+        with self.assertRaises(general_search.HTTPException) as ctx:
+            self.run_search(es, query="bank credit", tags=["banking"])
+        self.assertEqual(ctx.exception.status_code, 500)
+
+    def test_cache_miss_embeds_once_and_stores_knn_results(self):
+        es = _FakeES({"knn": SEMANTIC_RESPONSE, "bm25": BM25_RESPONSE})
+        cache = _FakeCache()
+
+        self.run_search(es, cache, query="bank credit", tags=["banking"])
+
+        self.assertEqual(self.embedded, [("bank credit", "768d")])
+        self.assertEqual(es.calls[0][0][1]["query_vector"], [0.1, 0.2, 0.3])
+        ((query, vector, params, results),) = cache.puts
+        self.assertEqual((query, vector), ("bank credit", [0.1, 0.2, 0.3]))
+        self.assertEqual(params["field"], "embedding_768d")
+        self.assertEqual([r["id"] for r in results], ["doc1", "doc2"])
+
+    def test_cache_hit_skips_the_knn_search(self):
+        es = _FakeES({"bm25": BM25_RESPONSE})
+        cache = _FakeCache(cached=[{"id": "doc9", "score": 0.8, "title": "Cached"}])
+
+        response = self.run_search(es, cache, query="bank credit", tags=["banking"])
+
+        (searches,) = es.calls
+        self.assertEqual(len(searches), 1)
+        self.assertEqual(cache.puts, [])
+        self.assertEqual([r["news_id"] for r in json.loads(response.body)], ["doc9", "doc2", "doc3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
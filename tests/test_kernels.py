@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from agents.sector_news_analysis.src.news_agents._kernels import _decide_python, decide_kernel
+
+
+class DecideKernelTest(unittest.TestCase):
+    def assertMatchesFallback(self, s, conf, decay=1.0):
+        # Exact: labels hinge on these sums, so numba must not change a single bit
+        self.assertEqual(tuple(decide_kernel(s, conf, decay)), _decide_python(s, conf, decay))
+
+    def test_matches_fallback_on_random_records(self):
+        rng = np.random.default_rng(0)
+        for n in (1, 2, 7, 100, 1000):
+            s = rng.uniform(-1.0, 1.0, n)
+            conf = rng.uniform(0.0, 1.0, n)
+            self.assertMatchesFallback(s, conf, decay=0.9)
+
+    def test_consensus_weights_follow_the_weighted_mean(self):
+        s = np.array([0.9, 0.5, -0.2])
+        conf = np.array([1.0, 0.5, 0.5])
+
+        weighted_sum, total_w, pos_w, neg_w = decide_kernel(s, conf, 1.0)
+
+        self.assertAlmostEqual(weighted_sum, 1.05)
+        self.assertAlmostEqual(total_w, 2.0)
+        self.assertAlmostEqual(pos_w, 1.5)
+        self.assertEqual(neg_w, 0.0)
+        self.assertMatchesFallback(s, conf)
+        self.assertMatchesFallback(-s, conf)
+
+    def test_zero_weight_returns_zeros(self):
+        s = np.array([0.5, -0.5])
+        conf = np.zeros(2)
+
+        self.assertEqual(tuple(decide_kernel(s, conf, 1.0)), (0.0, 0.0, 0.0, 0.0))
+        self.assertMatchesFallback(s, conf)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from agents.sector_news_analysis.src.news_agents.local_index import LocalIndex
+
+
+def _result(doc_id, text, score=0.9):
+    return {"id": doc_id, "full_text": text, "score": score}
+
+
+class LocalIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = LocalIndex.build(
+            [
+                _result("rbi", "RBI keeps interest rates unchanged in its monetary policy review"),
+                _result("banks", "Banks report rising NPAs as loan growth slows"),
+                _result("cement", "Cement makers raise prices as construction demand picks up"),
+                _result("oil", "Oil companies cut petrol prices after crude falls"),
+                _result("rbi", "duplicate id is skipped"),
+                _result("empty", "   "),
+            ]
+        )
+
+    def test_build_skips_duplicates_and_empty_texts(self):
+        self.assertEqual([m["id"] for m in self.index.meta], ["rbi", "banks", "cement", "oil"])
+
+    def test_search_returns_top_k_in_similarity_order(self):
+        response = self.index.search("RBI monetary policy interest rates", k=3)
+
+        results = response["results"]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]["id"], "rbi")
+        similarities = [r["local_similarity"] for r in results]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+        # Stored fields (including the API score) are kept
+        self.assertEqual(results[0]["score"], 0.9)
+
+    def test_search_drops_results_below_min_similarity(self):
+        response = self.index.search("RBI monetary policy interest rates", k=4, min_similarity=0.3)
+
+        self.assertEqual([r["id"] for r in response["results"]], ["rbi"])
+
+    def test_search_without_similar_documents_returns_none(self):
+        self.assertIsNone(self.index.search("monsoon kharif sowing fertiliser", k=4, min_similarity=0.3))
+        self.assertIsNone(LocalIndex.build([]).search("anything", k=4))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "index.npz"
+            self.index.save(path)
+            loaded = LocalIndex.load(path)
+
+        self.assertEqual(loaded.meta, self.index.meta)
+        query = "cement construction demand"
+        self.assertEqual(
+            [r["id"] for r in loaded.search(query, k=2)["results"]],
+            [r["id"] for r in self.index.search(query, k=2)["results"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
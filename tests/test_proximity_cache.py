@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from agents.sector_news_analysis.src.news_agents.proximity_cache import ProximityCache, embed_query
+
+
+class EmbedQueryTest(unittest.TestCase):
+    def test_embedding_is_normalized_and_case_insensitive(self):
+        vec = embed_query("Cement  Demand")
+        self.assertAlmostEqual(float(np.linalg.norm(vec)), 1.0, places=5)
+        np.testing.assert_array_equal(vec, embed_query("cement demand"))
+
+    def test_empty_text_embeds_to_zeros(self):
+        self.assertFalse(embed_query("").any())
+
+
+class ProximityCacheTest(unittest.TestCase):
+    def test_lookup_hits_above_threshold_and_misses_below(self):
+        cache = ProximityCache(threshold=0.9, capacity=4)
+        cache.insert("construction cement demand", {"results": ["cement"]})
+
+        self.assertEqual(cache.lookup("Construction cement demand"), {"results": ["cement"]})
+        self.assertIsNone(cache.lookup("crude oil prices"))
+
+    def test_lookup_on_empty_cache_misses(self):
+        self.assertIsNone(ProximityCache(threshold=0.5).lookup("anything"))
+
+    def test_full_cache_evicts_least_recently_used(self):
+        cache = ProximityCache(threshold=0.99, capacity=2)
+        cache.insert("banking interest rates", "banks")
+        cache.insert("crude oil prices", "oil")
+        cache.lookup("banking interest rates")  # oil is now least recently used
+        cache.insert("monsoon rainfall sowing", "monsoon")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.lookup("banking interest rates"), "banks")
+        self.assertIsNone(cache.lookup("crude oil prices"))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "proximity.npz"
+            cache = ProximityCache(threshold=0.9, capacity=4, path=path)
+            cache.insert("construction cement demand", {"results": [1, 2]})
+            cache.save()
+
+            warm = ProximityCache(threshold=0.9, capacity=4, path=path)
+
+        self.assertEqual(len(warm), 1)
+        self.assertEqual(warm.lookup("construction cement demand"), {"results": [1, 2]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from api.app.services.quantize import from_i8, to_i8
+
+
+class QuantizeTest(unittest.TestCase):
+    def test_round_trip_error_is_within_half_a_step(self):
+        vector = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+
+        quantized, scale = to_i8(vector)
+
+        self.assertEqual(quantized.dtype, np.int8)
+        self.assertEqual(quantized.shape, vector.shape)
+        self.assertEqual(int(np.max(np.abs(quantized))), 127)
+        restored = from_i8(quantized, scale)
+        self.assertEqual(restored.dtype, np.float32)
+        self.assertLessEqual(float(np.max(np.abs(restored - vector))), scale / 2 + 1e-6)
+
+    def test_cosine_similarity_is_preserved(self):
+        rng = np.random.default_rng(1)
+        a, b = rng.standard_normal((2, 768)).astype(np.float32)
+
+        def cosine(x, y):
+            x, y = x.astype(np.float64), y.astype(np.float64)
+            return x @ y / (np.linalg.norm(x) * np.linalg.norm(y))
+
+        self.assertAlmostEqual(cosine(to_i8(a)[0], to_i8(b)[0]), cosine(a, b), places=2)
+
+    def test_zero_and_empty_vectors(self):
+        quantized, scale = to_i8([0.0, 0.0, 0.0])
+        self.assertEqual(scale, 1.0)
+        np.testing.assert_array_equal(quantized, np.zeros(3, dtype=np.int8))
+        np.testing.assert_array_equal(from_i8(quantized, scale), np.zeros(3, dtype=np.float32))
+
+        quantized, scale = to_i8([])
+        self.assertEqual(quantized.size, 0)
+        self.assertEqual(scale, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,49 +3,57 @@ import unittest
 from api.app.services import sector_news_service
 
 
+def _hit_table(*rows):
+    """_HitTable from (doc_id, semantic, bm25, title, phrases, tags) rows"""
+    hits = sector_news_service._HitTable()
+    for doc_id, semantic, bm25, title, phrases, tags in rows:
+        i = hits.row(doc_id, {"_source": {"title": title}, "_index": "idx"})
+        hits.semantic[i] = semantic
+        hits.bm25[i] = bm25
+        for phrase in phrases:
+            hits.add_phrase(i, phrase)
+        hits.add_tags(i, set(tags))
+    return hits
+
+
 class BlendResultsTest(unittest.TestCase):
     def test_blend_results_orders_and_limits(self):
-        doc_hits = {
-            "doc1": {
-                "semantic_score": 0.8,
-                "bm25_score": 5.0,
-                "source": {"_source": {"title": "Doc 1"}, "_index": "idx"},
-                "phrase_matches": {"p1"},
-                "tags_matched": {"tag1"},
-            },
-            "doc2": {
-                "semantic_score": 0.4,
-                "bm25_score": 10.0,
-                "source": {"_source": {"title": "Doc 2"}, "_index": "idx"},
-                "phrase_matches": {"p2"},
-                "tags_matched": set(),
-            },
-        }
+        hits = _hit_table(
+            ("doc1", 0.8, 5.0, "Doc 1", ["p1"], ["tag1"]),
+            ("doc2", 0.4, 10.0, "Doc 2", ["p2"], []),
+        )
 
         results = sector_news_service._blend_results(
-            doc_hits, 0.8, 10.0, limit=1, min_score=None, sector="banking"
+            hits, 0.8, 10.0, limit=1, min_score=None, sector="banking"
         )
 
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].news_id, "doc1")
         self.assertGreater(results[0].score, 0)
+        self.assertEqual(results[0].phrase_matches, ["p1"])
+        self.assertEqual(results[0].tags_matched, ["tag1"])
 
     def test_blend_results_respects_min_score(self):
-        doc_hits = {
-            "doc1": {
-                "semantic_score": 0.1,
-                "bm25_score": 1.0,
-                "source": {"_source": {"title": "Doc 1"}, "_index": "idx"},
-                "phrase_matches": set(),
-                "tags_matched": set(),
-            }
-        }
+        hits = _hit_table(("doc1", 0.1, 1.0, "Doc 1", [], []))
 
         results = sector_news_service._blend_results(
-            doc_hits, 0.1, 1.0, limit=5, min_score=1.1, sector="it"
+            hits, 0.1, 1.0, limit=5, min_score=1.1, sector="it"
         )
         self.assertEqual(len(results), 0)
 
+    def test_blend_results_top_k_keeps_full_sort_order_with_ties(self):
+        # Many equal scores straddle the limit-th place, where the partition
+        # shortcut cuts; ties must keep hit order exactly like a full stable sort
+        rows = [(f"doc{n}", [0.2, 0.5, 0.5, 0.9][n % 4], 1.0, f"Doc {n}", [], []) for n in range(40)]
+        hits = _hit_table(*rows)
+
+        top = sector_news_service._blend_results(hits, 0.9, 1.0, limit=15, min_score=None, sector="it")
+        full = sector_news_service._blend_results(hits, 0.9, 1.0, limit=len(rows), min_score=None, sector="it")
+
+        self.assertEqual([r.news_id for r in top], [r.news_id for r in full][:15])
+        self.assertEqual([r.news_id for r in top[:10]], [f"doc{n}" for n in range(3, 40, 4)])
+        self.assertEqual([r.news_id for r in top[10:]], ["doc1", "doc2", "doc5", "doc6", "doc9"])
+
     def test_within_date_range_handles_compact_dates(self):
         entry = {"date": "20251031000000"}
         date_from = sector_news_service._parse_datetime("2025-11-01")
@@ -0,0 +1,155 @@
+import asyncio
+import re
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from api.app.services import semantic_cache as semantic_cache_module
+from api.app.services.semantic_cache import SemanticCache
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def hset(self, key, mapping):
+        self._ops.append(lambda: self._client.hashes.setdefault(key, {}).update(mapping))
+
+    def expire(self, key, seconds):
+        self._ops.append(lambda: self._client.expiries.__setitem__(key, seconds))
+
+    async def execute(self):
+        for op in self._ops:
+            op()
+
+
+class _FakeRedis:
+    """Hashes plus the FT.CREATE/FT.SEARCH subset SemanticCache uses, answered like RediSearch"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expiries = {}
+        self.indexes = {}
+        self.error = None
+
+    async def hget(self, key, field):
+        if self.error:
+            raise self.error
+        value = self.hashes.get(key, {}).get(field)
+        return value.encode() if isinstance(value, str) else value
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def execute_command(self, command, name, *args):
+        if self.error:
+            raise self.error
+        if command == "FT.CREATE":
+            schema = list(args)
+            self.indexes[name] = (schema[schema.index("PREFIX") + 2], schema[schema.index("TYPE") + 1])
+            return b"OK"
+
+        prefix, vector_type = self.indexes[name]
+        dtype = np.int8 if vector_type == "INT8" else np.float32
+        params_hash = re.match(r"\(@params:\{(\w+)\}\)", args[0]).group(1)
+        query = np.frombuffer(args[4], dtype=dtype).astype(np.float64)
+        best = None
+        for key, fields in self.hashes.items():
+            if not key.startswith(prefix) or fields["params"] != params_hash:
+                continue
+            stored = np.frombuffer(fields["embedding"], dtype=dtype).astype(np.float64)
+            distance = 1.0 - query @ stored / (np.linalg.norm(query) * np.linalg.norm(stored))
+            if best is None or distance < best[0]:
+                best = (distance, key, fields)
+        if best is None:
+            return [0]
+        distance, key, fields = best
+        return [1, key.encode(), [b"distance", str(distance).encode(), b"response", fields["response"].encode()]]
+
+
+def _config(**overrides):
+    values = dict(
+        redis_url="redis://fake",
+        similarity_threshold=0.95,
+        ttl_seconds=60,
+        key_prefix="test",
+        quantize=False,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+PARAMS = {"field": "embedding", "limit": 5, "min_score": 0.0, "indices": "news"}
+
+
+class SemanticCacheTest(unittest.TestCase):
+    def make_cache(self, **overrides):
+        cache = SemanticCache(_config(**overrides))
+        cache._client = _FakeRedis()
+        return cache
+
+    def test_exact_prompt_hit(self):
+        cache = self.make_cache()
+
+        async def scenario():
+            await cache.put("bank credit growth", [1.0, 0.0, 0.0], PARAMS, {"results": ["a"]})
+            return await cache.get("bank credit growth", [1.0, 0.0, 0.0], PARAMS)
+
+        self.assertEqual(asyncio.run(scenario()), {"results": ["a"]})
+        self.assertEqual(cache.stats["exact_hits"], 1)
+        self.assertEqual(next(iter(cache._client.expiries.values())), 60)
+
+    def test_similar_embedding_hits_above_threshold_and_misses_below(self):
+        cache = self.make_cache()
+
+        async def scenario():
+            await cache.put("bank credit growth", [1.0, 0.0, 0.0], PARAMS, {"results": ["a"]})
+            close = await cache.get("credit growth at banks", [0.99, 0.1, 0.0], PARAMS)
+            far = await cache.get("crude oil prices", [0.0, 1.0, 0.0], PARAMS)
+            other_params = await cache.get("credit growth at banks", [0.99, 0.1, 0.0], {**PARAMS, "limit": 10})
+            return close, far, other_params
+
+        close, far, other_params = asyncio.run(scenario())
+        self.assertEqual(close, {"results": ["a"]})
+        self.assertIsNone(far)
+        self.assertIsNone(other_params)
+        self.assertEqual(cache.stats["semantic_hits"], 1)
+        self.assertEqual(cache.stats["misses"], 2)
+
+    def test_quantized_entries_use_their_own_int8_space(self):
+        cache = self.make_cache(quantize=True)
+
+        async def scenario():
+            await cache.put("bank credit growth", [0.5, -0.25, 0.0], PARAMS, {"results": ["a"]})
+            return await cache.get("credit growth at banks", [0.5, -0.24, 0.01], PARAMS)
+
+        self.assertEqual(asyncio.run(scenario()), {"results": ["a"]})
+        (key, fields), = cache._client.hashes.items()
+        self.assertTrue(key.startswith("test:3i8:"))
+        self.assertEqual(len(fields["embedding"]), 3)
+        self.assertEqual(cache._client.indexes["test:idx:3i8"][1], "INT8")
+        self.assertEqual(cache.info()["vector_type"], "INT8")
+
+    def test_redis_error_counts_as_miss_and_backs_off(self):
+        cache = self.make_cache()
+        cache._client.error = semantic_cache_module.redis.ConnectionError("down")
+
+        self.assertIsNone(asyncio.run(cache.get("bank credit growth", [1.0, 0.0], PARAMS)))
+        self.assertEqual(cache.stats["errors"], 1)
+
+        # While backing off the client is not called at all
+        cache._client.error = None
+        asyncio.run(cache.put("bank credit growth", [1.0, 0.0], PARAMS, {"results": []}))
+        self.assertEqual(cache._client.hashes, {})
+
+    def test_disabled_without_redis_url(self):
+        cache = SemanticCache(_config(redis_url=None))
+
+        self.assertIsNone(asyncio.run(cache.get("bank credit growth", [1.0, 0.0], PARAMS)))
+        self.assertFalse(cache.info()["enabled"])
+
+
+if __name__ == "__main__":
+    unittest.main()